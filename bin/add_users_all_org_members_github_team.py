@@ -40,8 +40,11 @@ def main():
     github_token, github_organization_name = get_environment_variables()
     organization_name, organization_team_name = get_config_for_organization(
         github_organization_name)
-    GithubService(github_token, organization_name).add_all_users_to_team(
-        organization_team_name)
+    dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
+    github_service = GithubService(
+        github_token, organization_name, http_cache_directory=os.getenv("GITHUB_HTTP_CACHE_DIRECTORY"))
+    github_service.add_all_users_to_team(
+        organization_team_name, dry_run=dry_run)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 
 from services.github_service import GithubService
+from clients.circleci_context_cache import CircleciContextCache
 from services.circleci_service import CircleciService
 from services.slack_service import SlackService
 
@@ -33,13 +34,17 @@ def get_environment_variables() -> tuple:
 def main():
     slack_token, github_token, circleci_token, circleci_owner_id = get_environment_variables()
     github_service = GithubService(github_token, GITHUB_ORG)
-    circle_ci_service = CircleciService(circleci_token, circleci_owner_id, GITHUB_ORG)
+    circle_ci_service = CircleciService(circleci_token, circleci_owner_id, GITHUB_ORG, CircleciContextCache(
+        os.getenv("CIRCLECI_CONTEXT_CACHE_DIRECTORY")))
     slack_service = SlackService(slack_token)
 
     full_circle_ci_repository_list = github_service.check_circleci_config_in_repos()
-    full_pipeline_id_list = circle_ci_service.get_all_pipeline_ids_for_all_repositories(full_circle_ci_repository_list)
 
-    used_contexts = circle_ci_service.get_all_used_contexts(full_pipeline_id_list)
+    max_revisions_per_repository = os.getenv("CIRCLECI_MAX_REVISIONS_PER_REPOSITORY")
+    used_contexts = circle_ci_service.get_all_used_contexts_for_repositories(
+        full_circle_ci_repository_list,
+        state_path=os.getenv("CIRCLECI_PIPELINE_SCAN_STATE_PATH"),
+        max_revisions_per_repository=int(max_revisions_per_repository) if max_revisions_per_repository else None)
 
     all_contexts = circle_ci_service.list_all_contexts()
 
@@ -23,12 +23,17 @@ def check_for_new_organisation_owners(in_last_days: int):
 
     gh = GithubService(str(admin_token), MINISTRY_OF_JUSTICE)
     slack = SlackService(str(slack_token))
-    changes = gh.flag_owner_permission_changes(_calculate_date(in_last_days))
+    # When set, only the audit log entries created since the previous run are read
+    checkpoint_path = os.getenv("AUDIT_LOG_CHECKPOINT_PATH")
+    changes = gh.flag_owner_permission_changes(_calculate_date(in_last_days), checkpoint_path)
 
     if changes:
         for change in changes:
             slack.send_new_github_owners_alert(change["userLogin"], change["createdAt"], change["actorLogin"], MINISTRY_OF_JUSTICE, audit_log_url)
 
+    # Saved only once every alert has been sent, so that a failed send is retried on the next run
+    gh.commit_audit_log_checkpoints()
+
 
 if __name__ == "__main__":
     check_for_new_organisation_owners(7)
@@ -17,11 +17,7 @@ def main():
     github_token = get_environment_variables()
     github = GithubService(github_token, "ministryofjustice")
 
-    data = github.get_paginated_list_of_repositories_per_topic(
-        topic="standards-compliant", after_cursor=None
-    )
-
-    current_repos = [repo_dict["repo"]["name"] for repo_dict in data["search"]["repos"]]
+    current_repos = github.get_repositories_with_topic("standards-compliant")
 
     try:
         KpiService(
@@ -34,8 +30,7 @@ def main():
         )
         logging.error(e)
 
-    for repos in current_repos:
-        github.set_standards(repository_name=repos)
+    github.set_standards_on_non_compliant_repositories(current_repos)
 
 
 if __name__ == "__main__":
@@ -116,7 +116,7 @@ def get_dormant_users(
         user for user in dormant_users if user["username"] not in org_active_users]
 
     audit_log_active_users = github_service.get_audit_log_active_users(
-        dormant_users)
+        dormant_users, use_activity_index=True)
     dormant_users = [user for user in dormant_users if user["username"]
                      not in audit_log_active_users]
 
@@ -166,11 +166,14 @@ def run_step_one(
 
         date_in_one_month = datetime.now() + relativedelta(months=1)
 
+        email_addresses = github_service.get_user_org_email_addresses(
+            [user["username"] for user in dormant_users])
+
         emailed_users = []
         for user in dormant_users:
             logging.info("\t" + user["username"])
-            email_address = github_service.get_user_org_email_address(
-                user["username"])
+            email_address = email_addresses.get(
+                user["username"]) or MISSING_EMAIL_ADDRESS
 
             the_user = {
                 "email_address": email_address.lower(),
@@ -107,11 +107,15 @@ def get_dormant_users_from_github_csv(
     users = get_usernames_from_csv_ignoring_bots_and_collaborators(
         ALLOWED_BOT_USERS)
 
+    moj_email_addresses = moj_github_org.get_user_org_email_addresses(users)
+    ap_email_addresses = ap_github_org.get_user_org_email_addresses(
+        [user for user in users if not moj_email_addresses.get(user)])
+
     dormant_users = [
         DormantUser(
             user,
-            moj_github_org.get_user_org_email_address(user)
-            or ap_github_org.get_user_org_email_address(user),
+            moj_email_addresses.get(user)
+            or ap_email_addresses.get(user),
         )
         for user in users
     ]
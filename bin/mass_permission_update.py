@@ -35,6 +35,8 @@ def parse_arguments() -> argparse.Namespace:
         "team_name", help="The name of the GitHub team that needs the permission change.")
     parser.add_argument(
         "permission_level", help="The permission level to set for the team (e.g., admin, write, read).")
+    parser.add_argument(
+        "--journal", help="A file to journal the result for each repository in, so an interrupted run can be resumed.")
     return parser.parse_args()
 
 
@@ -45,7 +47,8 @@ def main():
 
     github_service = GithubService(org_token, org_name)
     repositories = read_repository_list('repositories.json')
-    github_service.update_team_repository_permission(args.team_name, repositories, args.permission_level)
+    github_service.update_team_repository_permission(
+        args.team_name, repositories, args.permission_level, journal_path=args.journal)
 
     logging.info("Script has completed successfully.")
 
@@ -59,7 +59,7 @@ def __parse_args(args):
 def main():
     args = __parse_args(__add_arguments())
     repos = GithubService(
-        args.oauth_token, args.org).fetch_all_repositories_in_org()
+        args.oauth_token, args.org).fetch_all_repositories_in_org(concurrent=True)
     repo_reports = [RepositoryReport(repo).output for repo in repos]
 
     reports_service(args.url, args.endpoint, args.api_key). \
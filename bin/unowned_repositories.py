@@ -3,6 +3,8 @@ from config.logging_config import logging
 from services.github_service import GithubService
 from services.slack_service import SlackService
 
+IGNORE_TEAMS = ["organisation-security-auditor", "all-org-members"]
+
 
 def get_cli_arguments() -> tuple[str, str, str] | ValueError:
     expected_number_of_parameters = 4
@@ -15,47 +17,16 @@ def get_cli_arguments() -> tuple[str, str, str] | ValueError:
     return organisation_name, admin_github_token, slack_token
 
 
-def get_org_teams(github_service: GithubService):
-    org_teams = []
-    ignore_teams = ["organisation-security-auditor", "all-org-members"]
-    for team_name in github_service.get_team_names():
-        if team_name in ignore_teams:
-            continue
-        team_repository_names = github_service.get_team_repository_names(
-            team_name)
-        team_user_names = github_service.get_team_user_names(team_name)
-        org_teams.append(
-            {
-                "name": team_name,
-                "repositories": team_repository_names,
-                "number_of_users": len(team_user_names)
-            }
-        )
-    return org_teams
-
-
 def get_unowned_repositories(github_service: GithubService) -> list:
-    repositories_with_no_associations = []
-    org_teams = get_org_teams(github_service)
-
-    for repository_name in github_service.get_org_repo_names():
-        repository_has_team = False
-
-        for team in org_teams:
-            for team_repository_name in team["repositories"]:
-                # Check repository has any team that has users in it
-                if team_repository_name == repository_name and team["number_of_users"] > 0:
-                    repository_has_team = True
-                    break
-            if repository_has_team is True:
-                break
-
-        if repository_has_team is False:
-            # Check repository has any outside collaborators or direct users
-            if (len(github_service.get_repository_collaborators(repository_name)) == 0
-                    and len(github_service.get_repository_direct_users(repository_name)) == 0):
-                # Repository has no owners
-                repositories_with_no_associations.append(repository_name)
+    ownership_index = github_service.get_repository_ownership_index(
+        IGNORE_TEAMS)
+
+    # A repository is owned by any team that has users in it, any outside collaborator or any direct user
+    repositories_with_no_associations = [
+        repository_name
+        for repository_name, ownership in ownership_index.items()
+        if not (ownership["teams"] or ownership["outside_collaborators"] or ownership["direct_collaborators"])
+    ]
 
     # Print the repositories that have no owner
     if len(repositories_with_no_associations) > 0:
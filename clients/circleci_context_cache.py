@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from clients.conditional_request_cache import evict_least_recently_used
+
+
+class CircleciContextCache:
+    """Holds the contexts used by each CircleCI configuration, keyed by a hash of the configuration text, so that
+    a configuration shared by many pipelines is parsed and walked once.
+
+    Entries are kept in memory for the run and, when a cache_directory is given, on disk across runs.
+
+    Arguments:
+        cache_directory {str} -- The directory the entries are stored in, created if it does not exist.
+        max_size_bytes {int} -- Least recently used entries on disk are evicted once the cache grows past this size.
+        max_age {timedelta} -- Entries on disk that have not been used for longer than this are evicted.
+
+    Example Usage:
+        CircleciContextCache(".cache/circleci").get_or_extract(configuration, extract_contexts)
+    """
+
+    DEFAULT_MAX_SIZE_BYTES = 10 * 1024 * 1024
+    DEFAULT_MAX_AGE = timedelta(days=30)
+
+    def __init__(self, cache_directory: str | None = None, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+                 max_age: timedelta = DEFAULT_MAX_AGE) -> None:
+        self.cache_directory = cache_directory
+        self.max_size_bytes = max_size_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.__contexts: dict[str, frozenset[str]] = {}
+        self.__lock = threading.Lock()
+        if self.cache_directory:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            self.evict()
+
+    @staticmethod
+    def key(configuration: str) -> str:
+        return hashlib.sha256(configuration.encode("utf-8")).hexdigest()
+
+    def get(self, configuration: str) -> frozenset[str] | None:
+        key = self.key(configuration)
+        contexts = self.__contexts.get(key)
+        if contexts is None and self.cache_directory:
+            contexts = self.__read(key)
+            if contexts is not None:
+                with self.__lock:
+                    self.__contexts[key] = contexts
+        return contexts
+
+    def set(self, configuration: str, contexts: Iterable[str]) -> frozenset[str]:
+        key = self.key(configuration)
+        contexts = frozenset(contexts)
+        with self.__lock:
+            self.__contexts[key] = contexts
+        if self.cache_directory:
+            self.__write(key, contexts)
+        return contexts
+
+    def get_or_extract(self, configuration: str, extract: Callable[[str], Iterable[str]]) -> frozenset[str]:
+        """Returns the cached contexts of a configuration, or extracts and caches them when it has not been seen."""
+        contexts = self.get(configuration)
+        with self.__lock:
+            if contexts is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if contexts is None:
+            contexts = self.set(configuration, extract(configuration))
+        return contexts
+
+    def evict(self) -> None:
+        if self.cache_directory:
+            evict_least_recently_used(
+                self.cache_directory, self.max_size_bytes, self.max_age)
+
+    def __entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_directory, f"{key}.json")
+
+    def __read(self, key: str) -> frozenset[str] | None:
+        path = self.__entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                contexts = frozenset(json.load(file)["contexts"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+        # The modification time records the last use, which drives eviction
+        os.utime(path)
+        return contexts
+
+    def __write(self, key: str, contexts: frozenset[str]) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.cache_directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump({"contexts": sorted(contexts)}, file)
+        os.replace(temporary_path, self.__entry_path(key))
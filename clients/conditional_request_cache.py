@@ -0,0 +1,187 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config.logging_config import logging
+
+
+class ConditionalRequestCache:
+    """An on-disk store of GET responses that carry an ETag or Last-Modified validator.
+
+    Entries are keyed by the request URL and a scope derived from the token the request was made with, so
+    responses are never shared between tokens that can see different data. The token itself is never stored.
+
+    Arguments:
+        cache_directory {str} -- The directory the entries are stored in, created if it does not exist.
+        token {str} -- The token the cached requests are made with.
+        max_size_bytes {int} -- Least recently used entries are evicted when the cache is opened and whenever
+            a write takes it past this size.
+        max_age {timedelta} -- Entries that have not been used for longer than this are evicted.
+    """
+
+    DEFAULT_MAX_SIZE_BYTES = 100 * 1024 * 1024
+    DEFAULT_MAX_AGE = timedelta(days=7)
+
+    def __init__(self, cache_directory: str, token: str, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+                 max_age: timedelta = DEFAULT_MAX_AGE) -> None:
+        self.cache_directory = cache_directory
+        self.token_scope = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        self.max_size_bytes = max_size_bytes
+        self.max_age = max_age
+        self.__size_bytes = 0
+        self.__lock = threading.Lock()
+        os.makedirs(self.cache_directory, exist_ok=True)
+        self.evict()
+
+    def __entry_path(self, url: str) -> str:
+        key = hashlib.sha256(f"{self.token_scope} {url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_directory, f"{key}.json")
+
+    def get(self, url: str) -> dict | None:
+        path = self.__entry_path(url)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry["url"] != url:
+            return None
+        # The modification time records the last use, which drives eviction
+        os.utime(path)
+        return entry
+
+    def set(self, url: str, response: Response) -> None:
+        entry = {
+            "url": url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        path = self.__entry_path(url)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.cache_directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        written_bytes = os.path.getsize(temporary_path)
+        replaced_bytes = _size(path)
+        os.replace(temporary_path, path)
+
+        with self.__lock:
+            self.__size_bytes += written_bytes - replaced_bytes
+            over_size = self.__size_bytes > self.max_size_bytes
+        if over_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes entries unused for longer than max_age, then the least recently used entries until the cache fits in max_size_bytes."""
+        size_bytes = evict_least_recently_used(
+            self.cache_directory, self.max_size_bytes, self.max_age)
+        with self.__lock:
+            self.__size_bytes = size_bytes
+
+
+def evict_least_recently_used(cache_directory: str, max_size_bytes: int, max_age: timedelta) -> int:
+    """Removes files in cache_directory not modified for longer than max_age, then the least recently modified
+    files until the directory fits in max_size_bytes. Caches touch an entry each time it is used.
+
+    Returns:
+        int: The size in bytes of the files left in cache_directory
+    """
+    now = time.time()
+    entries = []
+    for file_name in os.listdir(cache_directory):
+        path = os.path.join(cache_directory, file_name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > max_age.total_seconds():
+            _remove(path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_size_bytes:
+            break
+        _remove(path)
+        total_size -= size
+    return total_size
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ConditionalRequestCacheAdapter(HTTPAdapter):
+    """A requests transport adapter that revalidates cached GET responses with If-None-Match and
+    If-Modified-Since. GitHub answers a matching validator with 304 Not Modified, which does not count
+    against the core rate limit, and the adapter then returns the cached response in its place.
+
+    Example Usage:
+        session.mount("https://", ConditionalRequestCacheAdapter(ConditionalRequestCache(".cache", token)))
+    """
+
+    def __init__(self, cache: ConditionalRequestCache, **kwargs) -> None:
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:  # pylint: disable=W0221
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry:
+            headers = CaseInsensitiveDict(entry["headers"])
+            if "ETag" in headers:
+                request.headers["If-None-Match"] = headers["ETag"]
+            if "Last-Modified" in headers:
+                request.headers["If-Modified-Since"] = headers["Last-Modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            logging.debug(f"Not modified, using cached response for {request.url}")
+            return self.__build_cached_response(request, entry, response)
+
+        if response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+            self.cache.set(request.url, response)
+
+        return response
+
+    def __build_cached_response(self, request: PreparedRequest, entry: dict, not_modified_response: Response) -> Response:
+        response = Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        # The 304 carries the current rate limit and validator headers
+        response.headers.update(not_modified_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry["body"])  # pylint: disable=W0212
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = not_modified_response.elapsed
+        return response
+
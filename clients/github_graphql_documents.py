@@ -0,0 +1,422 @@
+from clients.graphql_document_registry import GraphQLDocumentRegistry
+
+# The GraphQL queries sent by GithubService, parsed once each at first use
+GITHUB_GRAPHQL_DOCUMENTS = GraphQLDocumentRegistry({
+    "audit_log_member_entries": """
+        query($organisation_name: String!, $audit_log_query: String!, $page_size: Int!, $cursor: String) {
+            organization(login: $organisation_name) {
+                auditLog(
+                    first: $page_size
+                    after: $cursor
+                    query: $audit_log_query
+                ) {
+                    edges{
+                        node{
+                            ... on OrgAddMemberAuditEntry {
+                                action
+                                createdAt
+                                actorLogin
+                                operationType
+                                permission
+                                userLogin
+                            }
+                            ... on OrgUpdateMemberAuditEntry {
+                                action
+                                createdAt
+                                actorLogin
+                                operationType
+                                permission
+                                permissionWas
+                                userLogin
+                            }
+                        }
+                    }
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                }
+            }
+        }
+    """,
+    "repositories_with_last_commit_date": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                repositories(first: $page_size, after: $after_cursor, isArchived: false) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    nodes {
+                        name
+                        isArchived
+                        isFork
+                        createdAt
+                        defaultBranchRef {
+                            target {
+                                ... on Commit {
+                                    committedDate
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "team_id": """
+        query($organisation_name: String!, $team_name: String!) {
+            organization(login: $organisation_name) {
+                team(slug: $team_name) {
+                    databaseId
+                }
+            }
+        }
+    """,
+    "unlocked_unarchived_repos_and_their_first_100_outside_collaborators": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                repositories(first: $page_size, after: $after_cursor, isLocked: false, isArchived: false) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    nodes {
+                        name
+                        isDisabled
+                        collaborators(first: 100, affiliation: OUTSIDE){
+                            pageInfo {
+                                endCursor
+                                hasNextPage
+                            }
+                            edges {
+                                node {
+                                    login
+                                }
+                            }
+                        }
+                    }
+
+                }
+            }
+        }
+    """,
+    "repositories_per_type": """
+        query($page_size: Int!, $after_cursor: String, $the_query: String!) {
+            search(
+                type: REPOSITORY
+                query: $the_query
+                first: $page_size
+                after: $after_cursor
+            ) {
+            repos: edges {
+                repo: node {
+                    ... on Repository {
+                            isDisabled
+                            isPrivate
+                            isLocked
+                            name
+                            pushedAt
+                            url
+                            description
+                            hasIssuesEnabled
+                            repositoryTopics(first: 10) {
+                                edges {
+                                    node {
+                                        topic {
+                                            name
+                                        }
+                                    }
+                                }
+                            }
+                            defaultBranchRef {
+                                name
+                            }
+                            collaborators(affiliation: DIRECT) {
+                                totalCount
+                            }
+                            licenseInfo {
+                                name
+                            }
+                            collaborators(affiliation: DIRECT) {
+                                totalCount
+                            }
+                            branchProtectionRules(first: 10) {
+                                edges {
+                                    node {
+                                        isAdminEnforced
+                                        pattern
+                                        requiredApprovingReviewCount
+                                        requiresApprovingReviews
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """,
+    "team_names": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                teams(first: $page_size, after:$after_cursor) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    edges {
+                        node {
+                            slug
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "team_repositories": """
+        query($organisation_name: String!, $team_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                team(slug: $team_name) {
+                    repositories(first: $page_size, after:$after_cursor) {
+                        edges {
+                            node {
+                                name
+                            }
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "teams_with_repositories_and_member_counts": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                teams(first: $page_size, after: $after_cursor) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    nodes {
+                        slug
+                        members {
+                            totalCount
+                        }
+                        repositories(first: 100) {
+                            pageInfo {
+                                endCursor
+                                hasNextPage
+                            }
+                            nodes {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "repositories_and_collaborator_counts": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                repositories(first: $page_size, after: $after_cursor, isLocked: false, isArchived: false) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    nodes {
+                        name
+                        isDisabled
+                        directCollaborators: collaborators(affiliation: DIRECT) {
+                            totalCount
+                        }
+                        outsideCollaborators: collaborators(affiliation: OUTSIDE) {
+                            totalCount
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "circleci_config_check": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                repositories(first: $page_size, after: $after_cursor) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    edges {
+                        node {
+                            name
+                            object(expression: "HEAD:.circleci/config.yml") {
+                                ... on Blob {
+                                    id
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "repository_outside_collaborators": """
+        query($organisation_name: String!, $repo_name: String!, $page_size: Int!, $after_cursor: String) {
+            repository(owner: $organisation_name, name: $repo_name) {
+                collaborators(first: $page_size, after: $after_cursor, affiliation: OUTSIDE) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    edges {
+                        node {
+                            login
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "repositories_per_topic": """
+        query($page_size: Int!, $after_cursor: String, $the_query: String!) {
+            search(
+                type: REPOSITORY
+                query: $the_query
+                first: $page_size
+                after: $after_cursor
+            ) {
+            repos: edges {
+                repo: node {
+                    ... on Repository {
+                            name
+                            createdAt
+                            isDisabled
+                            isLocked
+                            hasIssuesEnabled
+                            repositoryTopics(first: 10) {
+                                edges {
+                                    node {
+                                        topic {
+                                            name
+                                        }
+                                    }
+                                }
+                            }
+                            collaborators(affiliation: DIRECT) {
+                                totalCount
+                            }
+                            branchProtectionRules(first: 10) {
+                                edges {
+                                    node {
+                                        pattern
+                                        isAdminEnforced
+                                        requiresApprovingReviews
+                                        requiredApprovingReviewCount
+                                        dismissesStaleReviews
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """,
+    "user_org_email_address": """
+        query($organisation_name: String!, $user_name: String!) {
+            user(login: $user_name) {
+                organizationVerifiedDomainEmails(login: $organisation_name)
+            }
+        }
+    """,
+    "default_branch_commit_authors": """
+        query($organisation_name: String!, $repository_name: String!, $since: GitTimestamp!, $page_size: Int!, $after_cursor: String) {
+            repository(owner: $organisation_name, name: $repository_name) {
+                defaultBranchRef {
+                    target {
+                        ... on Commit {
+                            history(first: $page_size, after: $after_cursor, since: $since) {
+                                pageInfo {
+                                    endCursor
+                                    hasNextPage
+                                }
+                                nodes {
+                                    author {
+                                        date
+                                        email
+                                        user {
+                                            login
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "organization_members_with_emails": """
+        query($org: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $org) {
+                membersWithRole(first: $page_size, after: $after_cursor) {
+                    nodes {
+                        login
+                        organizationVerifiedDomainEmails(login: $org)
+                    }
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
+                }
+            }
+        }
+    """,
+    "team_repository_permissions": """
+        query($organisation_name: String!, $team_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                team(slug: $team_name) {
+                    repositories(first: $page_size, after: $after_cursor) {
+                        edges {
+                            permission
+                            node {
+                                name
+                            }
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                }
+            }
+        }
+    """,
+    "organisation_member_logins": """
+        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
+            organization(login: $organisation_name) {
+                membersWithRole(first: $page_size, after: $after_cursor) {
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                    nodes {
+                        login
+                    }
+                }
+            }
+        }
+    """,
+})
@@ -0,0 +1,124 @@
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from config.logging_config import logging
+
+
+@dataclass
+class GraphQLQueryStatistics:
+    queries: int = 0
+    failures: int = 0
+    node_count: int = 0
+    cost: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+    page_size: int | None = None
+    remaining: int | None = None
+
+
+class GraphQLTelemetry:
+    """Records the node count, rate limit cost, latency and remaining budget of each GraphQL query, keyed by the
+    name of the method that sent it, and logs them as a table when the process exits."""
+
+    def __init__(self) -> None:
+        self.statistics: dict[str, GraphQLQueryStatistics] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, query_name: str, page_size: int | None, seconds: float, rate_limit: dict[str, Any] | None) -> None:
+        with self.__lock:
+            statistics = self.statistics.setdefault(
+                query_name, GraphQLQueryStatistics())
+            statistics.queries += 1
+            statistics.total_seconds += seconds
+            statistics.max_seconds = max(statistics.max_seconds, seconds)
+            statistics.page_size = page_size
+            if rate_limit:
+                statistics.node_count += rate_limit.get("nodeCount") or 0
+                statistics.cost += rate_limit.get("cost") or 0
+                statistics.remaining = rate_limit.get("remaining")
+
+    def record_failure(self, query_name: str, page_size: int | None, seconds: float) -> None:
+        with self.__lock:
+            statistics = self.statistics.setdefault(
+                query_name, GraphQLQueryStatistics())
+            statistics.failures += 1
+            statistics.total_seconds += seconds
+            statistics.max_seconds = max(statistics.max_seconds, seconds)
+            statistics.page_size = page_size
+
+    def summary(self) -> str:
+        rows = [("query", "queries", "failures", "nodes", "cost", "mean s", "max s", "page size", "remaining")]
+        for query_name, statistics in sorted(self.statistics.items()):
+            attempts = statistics.queries + statistics.failures
+            rows.append((
+                query_name,
+                str(statistics.queries),
+                str(statistics.failures),
+                str(statistics.node_count),
+                str(statistics.cost),
+                f"{statistics.total_seconds / attempts:.2f}" if attempts else "-",
+                f"{statistics.max_seconds:.2f}",
+                str(statistics.page_size if statistics.page_size is not None else "-"),
+                str(statistics.remaining if statistics.remaining is not None else "-"),
+            ))
+        widths = [max(len(row[column]) for row in rows)
+                  for column in range(len(rows[0]))]
+        return "\n".join("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
+
+    def log_summary(self) -> None:
+        if self.statistics:
+            logging.info(f"GraphQL query summary\n{self.summary()}")
+
+
+class GraphQLPageSizeController:
+    """Adapts the page size of each paginated GraphQL query to how expensive its pages turn out to be.
+
+    A query starts at the page size it asks for. The page size is halved after a page times out or fails with a
+    gateway error, and grown by a quarter, up to the size the caller asked for or max_page_size when the caller
+    left it to the default, after a page that was fast and cost no more than one rate limit point.
+
+    Arguments:
+        max_page_size {int} -- The largest page size a query is grown to.
+        min_page_size {int} -- The smallest page size a query is shrunk to before failures are raised.
+        fast_seconds {float} -- Pages that take less than this are considered cheap.
+    """
+
+    def __init__(self, max_page_size: int, min_page_size: int = 10, fast_seconds: float = 5) -> None:
+        self.max_page_size = max_page_size
+        self.min_page_size = min_page_size
+        self.fast_seconds = fast_seconds
+        self.page_sizes: dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def page_size(self, query_name: str, requested_page_size: int | None, default_page_size: int) -> int:
+        if requested_page_size is not None and requested_page_size > self.max_page_size:
+            # Left for the query to reject
+            return requested_page_size
+        with self.__lock:
+            page_size = self.page_sizes.get(
+                query_name, requested_page_size or default_page_size)
+        return min(page_size, requested_page_size or self.max_page_size)
+
+    def shrink(self, query_name: str, page_size: int) -> bool:
+        """Halves the page size of a query after a failed page, returning False when it cannot shrink further."""
+        if page_size <= self.min_page_size:
+            return False
+        with self.__lock:
+            self.page_sizes[query_name] = max(
+                page_size // 2, self.min_page_size)
+        return True
+
+    def record_success(self, query_name: str, page_size: int, seconds: float, rate_limit: dict[str, Any] | None) -> None:
+        cost = (rate_limit or {}).get("cost") or 0
+        with self.__lock:
+            if seconds < self.fast_seconds and cost <= 1:
+                self.page_sizes[query_name] = min(
+                    page_size + max(page_size // 4, 1), self.max_page_size)
+            else:
+                self.page_sizes[query_name] = page_size
+
+
+graphql_telemetry = GraphQLTelemetry()
+atexit.register(graphql_telemetry.log_summary)
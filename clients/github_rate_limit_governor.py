@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from config.logging_config import logging
+
+
+@dataclass
+class RateLimitBudget:
+    limit: int
+    remaining: int
+    reset: float
+
+
+class RateLimitGovernor:
+    """Paces GitHub requests so that the REST core, GraphQL and search rate limits are not exhausted.
+
+    The governor keeps the last known budget of each rate limit resource, taken from the X-RateLimit-* response
+    headers and from GraphQL rateLimit selections. Before each request it waits until the resource has budget:
+    once the remaining budget drops below pacing_threshold of the limit, requests are spread evenly over the time
+    left until the reset, and once only reserve requests remain it waits for the reset itself. Secondary rate
+    limits block every resource for the Retry-After period.
+
+    Arguments:
+        reserve {int} -- Requests kept back from each budget, so other jobs sharing the token are not starved.
+        pacing_threshold {float} -- The fraction of the limit below which requests are paced.
+    """
+
+    RESET_BUFFER_SECONDS = 5
+    DEFAULT_SECONDARY_RATE_LIMIT_SECONDS = 60
+
+    def __init__(self, reserve: int = 10, pacing_threshold: float = 0.1) -> None:
+        self.reserve = reserve
+        self.pacing_threshold = pacing_threshold
+        self.budgets: dict[str, RateLimitBudget] = {}
+        self.blocked_until: float = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def resource_for_url(url: str) -> str:
+        if "/graphql" in url:
+            return "graphql"
+        if "/search/" in url:
+            return "search"
+        return "core"
+
+    def update_from_headers(self, headers: Mapping[str, str] | None, default_resource: str = "core") -> None:
+        if not headers or "X-RateLimit-Remaining" not in headers:
+            return
+        self.__update(
+            headers.get("X-RateLimit-Resource", default_resource),
+            int(headers.get("X-RateLimit-Limit", 0)),
+            int(headers["X-RateLimit-Remaining"]),
+            float(headers.get("X-RateLimit-Reset", 0))
+        )
+
+    def update_from_graphql(self, rate_limit: dict[str, Any]) -> None:
+        """Updates the GraphQL budget from a rateLimit { limit cost remaining resetAt } selection."""
+        budget = self.budgets.get("graphql")
+        self.__update(
+            "graphql",
+            rate_limit.get("limit") or (budget.limit if budget else 0),
+            rate_limit["remaining"],
+            datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+        )
+
+    def __update(self, resource: str, limit: int, remaining: int, reset: float) -> None:
+        with self.__lock:
+            self.budgets[resource] = RateLimitBudget(limit, remaining, reset)
+
+    def secondary_rate_limit_delay(self, status_code: int, headers: Mapping[str, str] | None) -> float | None:
+        """Returns how long to back off when a response is a rate limit rejection, otherwise None."""
+        if status_code not in (403, 429):
+            return None
+        headers = headers or {}
+        if "Retry-After" in headers:
+            return float(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0":
+            return max(float(headers.get("X-RateLimit-Reset", 0)) - time.time(), 0) + self.RESET_BUFFER_SECONDS
+        if status_code == 429:
+            return self.DEFAULT_SECONDARY_RATE_LIMIT_SECONDS
+        return None
+
+    def block_for(self, seconds: float) -> None:
+        with self.__lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def seconds_until_budget(self, resource: str) -> float:
+        """Returns how long to wait before the next request to resource, and counts that request against its budget."""
+        with self.__lock:
+            now = time.time()
+            delay = max(self.blocked_until - now, 0)
+            budget = self.budgets.get(resource)
+            if budget is None or now >= budget.reset:
+                return delay
+
+            seconds_until_reset = budget.reset - now
+            spendable = budget.remaining - self.reserve
+            if spendable <= 0:
+                delay = max(delay, seconds_until_reset + self.RESET_BUFFER_SECONDS)
+            elif budget.remaining < budget.limit * self.pacing_threshold:
+                delay = max(delay, seconds_until_reset / spendable)
+            budget.remaining -= 1
+            return delay
+
+    def wait(self, resource: str) -> None:
+        if (delay := self.seconds_until_budget(resource)) > 0:
+            logging.info(
+                f"Waiting {delay:.1f}s for {resource} rate limit budget")
+            time.sleep(delay)
+
+    async def wait_async(self, resource: str) -> None:
+        if (delay := self.seconds_until_budget(resource)) > 0:
+            logging.info(
+                f"Waiting {delay:.1f}s for {resource} rate limit budget")
+            await asyncio.sleep(delay)
+
+
+class RateLimitGovernorAdapter(BaseAdapter):
+    """A requests transport adapter that waits for rate limit budget before sending through the wrapped adapter,
+    records the budget from the response, and resends requests rejected by a secondary rate limit."""
+
+    def __init__(self, governor: RateLimitGovernor, adapter: BaseAdapter | None = None,
+                 max_rate_limit_retries: int = 3) -> None:
+        super().__init__()
+        self.governor = governor
+        self.adapter = adapter or HTTPAdapter()
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:  # pylint: disable=W0221
+        resource = self.governor.resource_for_url(request.url)
+        attempt = 0
+        while True:
+            self.governor.wait(resource)
+            response = self.adapter.send(request, **kwargs)
+            self.governor.update_from_headers(response.headers, resource)
+            delay = self.governor.secondary_rate_limit_delay(
+                response.status_code, response.headers)
+            if delay is None or attempt >= self.max_rate_limit_retries:
+                return response
+            attempt += 1
+            logging.warning(
+                f"Rate limited on {request.method} {request.url}, retrying in {delay:.1f}s")
+            self.governor.block_for(delay)
+
+    def close(self) -> None:
+        self.adapter.close()
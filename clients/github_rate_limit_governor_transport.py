@@ -0,0 +1,87 @@
+import threading
+from copy import copy
+from weakref import WeakKeyDictionary
+
+from gql.transport.aiohttp import AIOHTTPTransport
+from gql.transport.exceptions import TransportServerError
+from graphql import (DocumentNode, ExecutionResult, FieldNode,
+                     OperationDefinitionNode, OperationType, SelectionSetNode,
+                     parse)
+
+from clients.github_rate_limit_governor import RateLimitGovernor
+from config.logging_config import logging
+
+RATE_LIMIT_SELECTION = parse(
+    "{ rateLimit { limit cost remaining resetAt nodeCount } }").definitions[0].selection_set.selections[0]
+
+
+_documents_with_rate_limit_selection: WeakKeyDictionary = WeakKeyDictionary()
+_documents_with_rate_limit_selection_lock = threading.Lock()
+
+
+def with_rate_limit_selection(document: DocumentNode) -> DocumentNode:
+    """Returns a copy of a document with the rateLimit selection added to each query that does not select it.
+
+    The copy is built once per document and reused while the document is alive, so documents parsed once by the
+    GraphQL document registry are not rebuilt on every request."""
+    if not isinstance(document, DocumentNode):
+        return document
+    with _documents_with_rate_limit_selection_lock:
+        augmented_document = _documents_with_rate_limit_selection.get(document)
+    if augmented_document is None:
+        augmented_document = _add_rate_limit_selection(document)
+        with _documents_with_rate_limit_selection_lock:
+            _documents_with_rate_limit_selection[document] = augmented_document
+    return augmented_document
+
+
+def _add_rate_limit_selection(document: DocumentNode) -> DocumentNode:
+    definitions = []
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode) and definition.operation == OperationType.QUERY and not any(
+                isinstance(selection, FieldNode) and (selection.alias or selection.name).value == "rateLimit"
+                for selection in definition.selection_set.selections):
+            definition = copy(definition)
+            definition.selection_set = SelectionSetNode(
+                selections=(*definition.selection_set.selections, RATE_LIMIT_SELECTION))
+        definitions.append(definition)
+    return DocumentNode(definitions=tuple(definitions))
+
+
+class RateLimitGovernorTransport(AIOHTTPTransport):
+    """An AIOHTTPTransport that waits for GraphQL rate limit budget before each query, records the budget from
+    the response headers and the rateLimit selection, which it adds to every query, and retries queries rejected
+    by a secondary rate limit.
+
+    The waits happen inside execute, so the timeout should be set on the transport rather than as the
+    Client execute_timeout, which would otherwise cut a wait for the rate limit reset short.
+    """
+
+    def __init__(self, governor: RateLimitGovernor, *args, max_rate_limit_retries: int = 3, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.governor = governor
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+    async def execute(self, document: DocumentNode, *args, **kwargs) -> ExecutionResult:
+        document = with_rate_limit_selection(document)
+        attempt = 0
+        while True:
+            await self.governor.wait_async("graphql")
+            try:
+                result = await super().execute(document, *args, **kwargs)
+            except TransportServerError as exception:
+                delay = self.governor.secondary_rate_limit_delay(
+                    exception.code, getattr(self, "response_headers", None))
+                if delay is None or attempt >= self.max_rate_limit_retries:
+                    raise
+                attempt += 1
+                logging.warning(
+                    f"GraphQL query rate limited, retrying in {delay:.1f}s")
+                self.governor.block_for(delay)
+                continue
+
+            self.governor.update_from_headers(
+                getattr(self, "response_headers", None), "graphql")
+            if result.data and result.data.get("rateLimit"):
+                self.governor.update_from_graphql(result.data["rateLimit"])
+            return result
@@ -0,0 +1,131 @@
+import threading
+from copy import copy
+from typing import Iterable
+
+from gql import gql
+from graphql import (DocumentNode, FieldNode, GraphQLSyntaxError,
+                     InlineFragmentNode, OperationDefinitionNode,
+                     SelectionSetNode, VariableNode, visit)
+from graphql.language import Visitor
+
+
+class GraphQLDocumentRegistry:
+    """Holds GraphQL queries by name and parses each one once, at first use, into a DocumentNode that is reused by
+    every later call, instead of parsing the query text again for each request.
+
+    A caller can ask for a query trimmed to the fields it needs, given as dotted response key paths such as
+    "search.repos.repo.name". A field is kept when it is on the path to a needed field, and a needed field keeps
+    its whole selection. Trimmed documents are cached as well.
+
+    Example Usage:
+        GraphQLDocumentRegistry({"viewer": "query { viewer { login name } }"}).get("viewer", ["viewer.login"])
+    """
+
+    MAX_AD_HOC_DOCUMENTS = 128
+
+    def __init__(self, sources: dict[str, str] | None = None) -> None:
+        self.sources: dict[str, str] = dict(sources or {})
+        self.__documents: dict[tuple[str, frozenset[str] | None], DocumentNode] = {}
+        self.__ad_hoc_documents: dict[str, DocumentNode] = {}
+        self.__lock = threading.Lock()
+
+    def register(self, name: str, source: str) -> None:
+        if self.sources.get(name, source) != source:
+            raise ValueError(f"A different GraphQL query is already registered as {name}")
+        self.sources[name] = source
+
+    def get(self, name: str, fields: Iterable[str] | None = None) -> DocumentNode:
+        key = (name, frozenset(fields) if fields is not None else None)
+        document = self.__documents.get(key)
+        if document is None:
+            if name not in self.sources:
+                raise KeyError(f"No GraphQL query is registered as {name}")
+            document = self.__parse(name, self.sources[name])
+            if key[1] is not None:
+                document = trim_selections(document, key[1])
+            with self.__lock:
+                document = self.__documents.setdefault(key, document)
+        return document
+
+    def __getitem__(self, name: str) -> DocumentNode:
+        return self.get(name)
+
+    def get_for_source(self, source: str) -> DocumentNode:
+        """Parses a query built at run time, such as one with a variable number of aliased fields, once per distinct
+        source. The most recently added MAX_AD_HOC_DOCUMENTS sources are kept."""
+        document = self.__ad_hoc_documents.get(source)
+        if document is None:
+            document = self.__parse("ad hoc query", source)
+            with self.__lock:
+                if len(self.__ad_hoc_documents) >= self.MAX_AD_HOC_DOCUMENTS:
+                    self.__ad_hoc_documents.pop(next(iter(self.__ad_hoc_documents)))
+                self.__ad_hoc_documents[source] = document
+        return document
+
+    @staticmethod
+    def __parse(name: str, source: str) -> DocumentNode:
+        try:
+            document = gql(source)
+        except GraphQLSyntaxError as exception:
+            raise ValueError(f"The GraphQL query {name} is not valid: {exception.message}") from exception
+        if not any(isinstance(definition, OperationDefinitionNode) for definition in document.definitions):
+            raise ValueError(f"The GraphQL query {name} has no operation")
+        return document
+
+
+def trim_selections(document: DocumentNode, fields: Iterable[str]) -> DocumentNode:
+    """Returns a copy of a document with only the fields on the paths to the given dotted response key paths, and
+    without the variable definitions that are no longer used."""
+    fields = frozenset(fields)
+    definitions = []
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            definition = copy(definition)
+            definition.selection_set = _trim_selection_set(
+                definition.selection_set, "", fields)
+            used_variables = _get_variable_names(definition.selection_set)
+            definition.variable_definitions = tuple(
+                variable_definition for variable_definition in definition.variable_definitions
+                if variable_definition.variable.name.value in used_variables)
+        definitions.append(definition)
+    return DocumentNode(definitions=tuple(definitions))
+
+
+def _trim_selection_set(selection_set: SelectionSetNode, path: str, fields: frozenset[str]) -> SelectionSetNode:
+    selections = []
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            response_key = (selection.alias or selection.name).value
+            field_path = f"{path}.{response_key}" if path else response_key
+            if field_path in fields:
+                selections.append(selection)
+            elif selection.selection_set and any(field.startswith(f"{field_path}.") for field in fields):
+                selections.append(_with_trimmed_selection_set(
+                    selection, field_path, fields))
+        elif isinstance(selection, InlineFragmentNode):
+            selections.append(_with_trimmed_selection_set(
+                selection, path, fields))
+        else:
+            selections.append(selection)
+    return SelectionSetNode(selections=tuple(selection for selection in selections if selection))
+
+
+def _with_trimmed_selection_set(selection: FieldNode | InlineFragmentNode, path: str,
+                                fields: frozenset[str]) -> FieldNode | InlineFragmentNode | None:
+    selection_set = _trim_selection_set(selection.selection_set, path, fields)
+    if not selection_set.selections:
+        return None
+    selection = copy(selection)
+    selection.selection_set = selection_set
+    return selection
+
+
+def _get_variable_names(selection_set: SelectionSetNode) -> set[str]:
+    variable_names = set()
+
+    class VariableCollector(Visitor):
+        def enter_variable(self, node: VariableNode, *_args) -> None:
+            variable_names.add(node.name.value)
+
+    visit(selection_set, VariableCollector())
+    return variable_names
@@ -0,0 +1,60 @@
+import threading
+from urllib.parse import urlsplit
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+# Server errors on idempotent methods are retried with 1s, 2s, 4s backoff. raise_on_status is off so that the
+# last response is returned to the caller, who checks its status code as it would without retries.
+DEFAULT_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[500, 502, 503, 504],
+    raise_on_status=False,
+)
+
+_sessions: dict[tuple, Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url: str, pool_size: int = DEFAULT_POOL_SIZE, max_retries: Retry = DEFAULT_RETRY) -> Session:
+    """Returns the pooled, keep-alive session for the scheme and host of a URL, so that every service calling
+    the host reuses its connections instead of opening a new TCP and TLS connection for each request.
+
+    Sessions are shared between callers that ask for the same pool_size and max_retries.
+
+    Example Usage:
+        get_session("https://api.pingdom.com/api/3.1/checks").get("https://api.pingdom.com/api/3.1/checks", timeout=60)
+    """
+    scheme, host = urlsplit(url)[:2]
+    key = (scheme, host, pool_size, max_retries)
+    with _sessions_lock:
+        if key not in _sessions:
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size, max_retries=max_retries)
+            session = Session()
+            session.mount(f"{scheme}://{host}", adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+def close_sessions() -> None:
+    """Closes every pooled session, dropping their connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def request(method: str, url: str, **kwargs) -> Response:
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> Response:
+    return get_session(url).get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> Response:
+    return get_session(url).post(url, **kwargs)
@@ -0,0 +1,21 @@
+from typing import Callable
+
+from github.Requester import HTTPSRequestsConnectionClass
+from requests.adapters import BaseAdapter
+
+
+def build_pygithub_connection_class(adapter_factory: Callable[..., BaseAdapter]) -> type[HTTPSRequestsConnectionClass]:
+    """Builds a PyGithub connection class whose session sends requests through the adapter built by adapter_factory.
+    The factory is called with the max_retries, pool_connections and pool_maxsize PyGithub would give its own adapter."""
+
+    class AdapterConnectionClass(HTTPSRequestsConnectionClass):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.adapter = adapter_factory(
+                max_retries=self.retry,
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size,
+            )
+            self.session.mount("https://", self.adapter)
+
+    return AdapterConnectionClass
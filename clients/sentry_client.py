@@ -1,8 +1,9 @@
 from datetime import datetime
 
-import requests
 from requests import Response
 
+from clients import http_transport
+
 
 class SentryClient:
     # Added to stop TypeError on instantiation. See https://github.com/python/cpython/blob/d2340ef25721b6a72d45d4508c672c4be38c67d3/Objects/typeobject.c#L4444
@@ -15,8 +16,8 @@ class SentryClient:
         self.__request_timeout = 10
 
     def __get(self, endpoint: str) -> Response:
-        return requests.get(f"{self.__base_url}{endpoint}", headers=self.__request_headers,
-                            timeout=self.__request_timeout)
+        return http_transport.get(f"{self.__base_url}{endpoint}", headers=self.__request_headers,
+                                  timeout=self.__request_timeout)
 
     def get_usage_total_for_period_in_days(self, category: str, period_in_days: int) -> tuple[int, datetime, datetime]:
         json_data = self.__get(
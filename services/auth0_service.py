@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 
 import requests
 
+from clients import http_transport
+
 RESPONSE_OKAY = 200
 RESPONSE_NO_CONTENT = 204
 logging.basicConfig(level=logging.INFO)
@@ -49,11 +51,11 @@ class Auth0Service:
 
         if data is not None:
             # Makes a request based on the given method, URL, headers and data
-            response = requests.request(
+            response = http_transport.request(
                 method, url, json=data, headers=headers, timeout=10)
         else:
             # Makes a request based on the given method, URL and headers only
-            response = requests.request(
+            response = http_transport.request(
                 method, url, headers=headers, timeout=10)
 
         return response
@@ -83,7 +85,7 @@ class Auth0Service:
         }
 
         # Makes request
-        response = requests.post(
+        response = http_transport.post(
             url, json=payload, headers=headers, timeout=10)
 
         if response.status_code == RESPONSE_OKAY:
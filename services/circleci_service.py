@@ -1,10 +1,139 @@
-import requests
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
+
 import yaml
 
+from clients import http_transport
+from clients.circleci_context_cache import CircleciContextCache
+
+# The libyaml loader is several times faster than the pure Python one on large compiled configurations
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_STRING_TAG = "tag:yaml.org,2002:str"
+
+
+def load_configuration(configuration: str):
+    return yaml.load(configuration, Loader=YAML_SAFE_LOADER)
+
+
+def find_contexts(configuration) -> set[str]:
+    """Returns the values of every context key in a loaded configuration, walking it with a stack rather than by
+    recursion. A context is either a string or a list of strings."""
+    contexts = set()
+    stack = [configuration]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key != "context":
+                    stack.append(value)
+                elif isinstance(value, str):
+                    contexts.add(value)
+                elif isinstance(value, list):
+                    contexts.update(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+    return contexts
+
+
+def scan_contexts(configuration: str) -> set[str]:
+    """Returns the values of every context key in a configuration from its YAML event stream, without building
+    the document. Anchors and merge keys are not followed, so configurations that use them should be loaded
+    with load_configuration instead; compiled CircleCI configurations have them expanded already."""
+    contexts = set()
+    resolver = yaml.resolver.Resolver()
+    # One entry per open collection: [is_mapping, expecting_key, key of the value being read]
+    collections = []
+    for event in yaml.parse(configuration, Loader=YAML_SAFE_LOADER):
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            collections.append([isinstance(event, yaml.MappingStartEvent), True, None])
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            collections.pop()
+            _end_value(collections)
+        elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+            is_mapping, expecting_key, _ = collections[-1] if collections else (False, False, None)
+            if is_mapping and expecting_key:
+                collections[-1][1:] = [False, event.value if isinstance(event, yaml.ScalarEvent) else None]
+                continue
+            if isinstance(event, yaml.ScalarEvent) and _is_context_value(collections) and \
+                    resolver.resolve(yaml.ScalarNode, event.value, event.implicit) == YAML_STRING_TAG:
+                contexts.add(event.value)
+            _end_value(collections)
+    return contexts
+
+
+def _is_context_value(collections: list) -> bool:
+    if not collections:
+        return False
+    is_mapping, _, key = collections[-1]
+    if is_mapping:
+        return key == "context"
+    # A list of contexts
+    return len(collections) > 1 and collections[-2][0] and collections[-2][2] == "context"
+
+
+def _end_value(collections: list) -> None:
+    if collections and collections[-1][0]:
+        collections[-1][1:] = [True, None]
+
+
+class PipelineScanProgress:
+    """Counts the repositories listed and pipeline configurations fetched by a scan, printing progress every
+    report_interval configurations and the overall throughput when the scan ends."""
+
+    def __init__(self, report_interval: int) -> None:
+        self.report_interval = report_interval
+        self.repositories = 0
+        self.listed_pipelines = 0
+        self.pipelines = 0
+        self.configurations = 0
+        self.failures = 0
+        self.contexts: set[str] = set()
+        self.__started = perf_counter()
+        self.__lock = threading.Lock()
+
+    def add_repository(self, pipelines: int, listed_pipelines: int | None = None) -> None:
+        """Counts a listed repository and the configurations to fetch for it, which can be fewer than the
+        pipelines listed when pipelines share a revision."""
+        with self.__lock:
+            self.repositories += 1
+            self.listed_pipelines += pipelines if listed_pipelines is None else listed_pipelines
+            self.pipelines += pipelines
+
+    def add_configuration(self, contexts: set[str] | None) -> None:
+        """Counts a fetched configuration and merges its contexts, or counts a failure when contexts is None."""
+        with self.__lock:
+            self.configurations += 1
+            if contexts is None:
+                self.failures += 1
+            else:
+                self.contexts.update(contexts)
+            if self.configurations % self.report_interval == 0:
+                print(f"Fetched {self.configurations} of {self.pipelines} pipeline configurations "
+                      f"from {self.repositories} repositories, {len(self.contexts)} contexts found so far")
+
+    def report(self) -> None:
+        seconds = perf_counter() - self.__started
+        print(f"Fetched {self.configurations} pipeline configurations for {self.listed_pipelines} pipelines "
+              f"from {self.repositories} repositories in {seconds:.1f}s ({self.configurations / seconds if seconds else 0:.1f} per second), "
+              f"{len(self.contexts)} contexts used, {self.failures} configurations could not be fetched")
+
 
 class CircleciService:
-    def __init__(self, token, owner_id, github_org) -> None:
+    DEFAULT_MAX_CONCURRENT_REQUESTS = http_transport.DEFAULT_POOL_SIZE
+    PROGRESS_REPORT_INTERVAL = 100
+    # The size of the first page of pipelines, which is all a scan without state reads
+    PIPELINES_KEPT_PER_REPOSITORY = 20
+
+    def __init__(self, token, owner_id, github_org, context_cache: CircleciContextCache | None = None,
+                 scan_configuration_events: bool = False) -> None:
         self.github_org = github_org
+        self.context_cache = context_cache or CircleciContextCache()
+        self.scan_configuration_events = scan_configuration_events
         self.owner_id = owner_id
         self.base_url = "https://circleci.com/api/v2/"
         self.headers = {
@@ -13,7 +142,7 @@ class CircleciService:
 
     def get_circleci_pipelines_for_repository(self, repo):
         url = self.base_url + f"project/github/{self.github_org}/{repo}/pipeline?branch=main"
-        response = requests.get(url, headers=self.headers, timeout=60)
+        response = http_transport.get(url, headers=self.headers, timeout=60)
         if response.status_code != 200:
             print(f"Error getting pipelines for {repo}: {response.text}")
             return []
@@ -22,32 +151,50 @@ class CircleciService:
         print(f"{len(pipelines)} pipelines found for repo: {repo}")
         return pipelines
 
+    def get_new_circleci_pipelines_for_repository(self, repo, newest_seen=None,
+                                                  max_pipelines=PIPELINES_KEPT_PER_REPOSITORY):
+        """Returns the main branch pipelines created since the newest_seen pipeline, newest first, paging through
+        next_page_token until it is reached or max_pipelines have been read."""
+        url = self.base_url + f"project/github/{self.github_org}/{repo}/pipeline?branch=main"
+        pipelines = []
+        next_page = None
+
+        while True:
+            response = http_transport.get(url, headers=self.headers, params={'page-token': next_page} if next_page else {}, timeout=60)
+            if response.status_code != 200:
+                print(f"Error getting pipelines for {repo}: {response.text}")
+                return []
+
+            response_json = response.json()
+            for pipeline in response_json.get("items", []):
+                if newest_seen and (pipeline["id"] == newest_seen["id"] or pipeline["created_at"] <= newest_seen["created_at"]):
+                    next_page = None
+                    break
+                pipelines.append(pipeline)
+                if len(pipelines) >= max_pipelines:
+                    next_page = None
+                    break
+            else:
+                next_page = response_json.get("next_page_token")
+
+            if not next_page:
+                break
+
+        print(f"{len(pipelines)} new pipelines found for repo: {repo}")
+        return pipelines
+
     def get_pipeline_configurations_from_pipeline_id(self, pipeline_id):
         url = self.base_url + f"pipeline/{pipeline_id}/config"
         headers = self.headers
-        response = requests.get(url, headers=headers, timeout=60)
+        response = http_transport.get(url, headers=headers, timeout=60)
         if response.status_code != 200:
             print(f"Error getting pipeline config {pipeline_id}: {response.text}")
-            return {}
+            return None
         configurations = response.json()
         return configurations
 
     def find_all_contexts_from_configuration(self, configuration):
-        contexts = []
-        if isinstance(configuration, dict):
-            for key, value in configuration.items():
-                if key == "context":
-                    if isinstance(value, list):
-                        contexts.extend(value)
-                    elif isinstance(value, str):
-                        contexts.append(value)
-                else:
-                    contexts.extend(self.find_all_contexts_from_configuration(value))
-        elif isinstance(configuration, list):
-            for item in configuration:
-                contexts.extend(self.find_all_contexts_from_configuration(item))
-
-        return contexts
+        return list(find_contexts(configuration))
 
     def list_all_contexts(self):
         url = self.base_url + f"context?owner-id={self.owner_id}"
@@ -57,7 +204,7 @@ class CircleciService:
         next_page = None
 
         while True:
-            response = requests.get(url, headers=headers, params={'page-token': next_page} if next_page else {}, timeout=360)
+            response = http_transport.get(url, headers=headers, params={'page-token': next_page} if next_page else {}, timeout=360)
             if response.status_code != 200:
                 print(f"Whoopsie! Error listing contexts: {response.text}")
                 return []
@@ -81,18 +228,157 @@ class CircleciService:
 
         return all_pipeline_ids
 
-    def get_all_used_contexts(self, full_pipeline_id_list):
-        all_used_contexts = set()
-
-        for pipeline in full_pipeline_id_list:
-            full_configuration_list = self.get_pipeline_configurations_from_pipeline_id(pipeline)
-            if full_configuration_list:
-                compiled_config = full_configuration_list.get("compiled", "")
-                compiled_setup_config = full_configuration_list.get("compiled-setup-config", "")
-                all_configurations_for_pipeline = [compiled_config, compiled_setup_config]
-                for configuration in all_configurations_for_pipeline:
-                    configuration_data = yaml.safe_load(configuration)
-                    contexts_in_configuration = self.find_all_contexts_from_configuration(configuration_data)
-                    all_used_contexts.update(contexts_in_configuration)
-
-        return all_used_contexts
+    @staticmethod
+    def group_pipelines_by_revision(pipelines, max_revisions=None) -> dict[str, list]:
+        """Groups pipelines, listed newest first, by their vcs revision, keeping the newest max_revisions revisions
+        when given. Pipelines without a revision are kept in a group of their own."""
+        revisions = defaultdict(list)
+        for pipeline in pipelines:
+            revision = (pipeline.get("vcs") or {}).get("revision") or pipeline["id"]
+            if revision in revisions or max_revisions is None or len(revisions) < max_revisions:
+                revisions[revision].append(pipeline)
+        return dict(revisions)
+
+    def get_contexts_from_pipeline_id(self, pipeline_id) -> set[str] | None:
+        """Returns the contexts used by a pipeline, or None when its configuration could not be fetched."""
+        contexts = set()
+        full_configuration_list = self.get_pipeline_configurations_from_pipeline_id(pipeline_id)
+        if full_configuration_list is None:
+            return None
+        if full_configuration_list:
+            compiled_config = full_configuration_list.get("compiled", "")
+            compiled_setup_config = full_configuration_list.get("compiled-setup-config", "")
+            all_configurations_for_pipeline = [compiled_config, compiled_setup_config]
+            for configuration in all_configurations_for_pipeline:
+                contexts.update(self.context_cache.get_or_extract(
+                    configuration, self.__extract_contexts))
+        return contexts
+
+    def __extract_contexts(self, configuration: str) -> set[str]:
+        if self.scan_configuration_events:
+            return scan_contexts(configuration)
+        return set(self.find_all_contexts_from_configuration(load_configuration(configuration)))
+
+    def get_all_used_contexts(self, full_pipeline_id_list, max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS):
+        progress = PipelineScanProgress(self.PROGRESS_REPORT_INTERVAL)
+        progress.add_repository(len(full_pipeline_id_list))
+
+        with ThreadPoolExecutor(max_workers=max_concurrent_requests) as config_fetchers:
+            futures = [config_fetchers.submit(self.__get_contexts_from_pipeline_id, pipeline_id, progress)
+                       for pipeline_id in full_pipeline_id_list]
+            for future in as_completed(futures):
+                future.result()
+
+        progress.report()
+        self.__report_context_cache()
+        return progress.contexts
+
+    def get_all_used_contexts_for_repositories(self, repo_list, max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                                               state_path=None, max_revisions_per_repository=None):
+        """Lists the pipelines of each repository and fetches their configurations in the same pass: pipeline
+        ids are handed to the configuration fetchers as soon as their repository is listed, and contexts are merged
+        as each configuration arrives. Listing and fetching share one pool of max_concurrent_requests workers, so no
+        more requests are in flight than the pooled circleci.com session keeps connections for.
+
+        Pipelines are grouped by repository and vcs revision, and the configuration of each revision is fetched
+        once, from its newest pipeline. When max_revisions_per_repository is given only the newest revisions of
+        each repository are scanned; by default every revision listed is.
+
+        When a state file is given, the newest PIPELINES_KEPT_PER_REPOSITORY pipelines of each repository and
+        their contexts are kept in it between runs. The next run fetches only the pipelines created since the
+        newest one kept, and reuses the contexts of the others, including those of new pipelines of a kept revision.
+        Pipelines whose configuration could not be fetched are not kept, nor are the newer pipelines of their
+        repository, so the next run lists and fetches them again."""
+        state = self.__read_pipeline_scan_state(state_path) if state_path else {}
+        progress = PipelineScanProgress(self.PROGRESS_REPORT_INTERVAL)
+        new_pipelines = defaultdict(list)
+        # The created_at of the oldest pipeline of each repository whose configuration could not be fetched
+        failed_since = {}
+
+        with ThreadPoolExecutor(max_workers=max_concurrent_requests) as workers:
+            repo_futures = {workers.submit(self.__get_pipelines_to_scan, repo, state.get(repo), state_path): repo
+                            for repo in repo_list}
+            config_futures = {}
+            for repo_future in as_completed(repo_futures):
+                repo = repo_futures[repo_future]
+                pipelines = repo_future.result()
+                kept_revisions = {pipeline.get("revision", pipeline["id"]): pipeline["contexts"]
+                                  for pipeline in state.get(repo, [])}
+                revisions = self.group_pipelines_by_revision(pipelines, max_revisions_per_repository)
+                progress.add_repository(len(revisions.keys() - kept_revisions.keys()), len(pipelines))
+                for revision, revision_pipelines in revisions.items():
+                    if revision in kept_revisions:
+                        new_pipelines[repo].extend(self.__to_scanned_pipelines(
+                            revision, revision_pipelines, kept_revisions[revision]))
+                    else:
+                        config_futures[workers.submit(
+                            self.__get_contexts_from_pipeline_id, revision_pipelines[0]["id"], progress)] = (repo, revision, revision_pipelines)
+            for config_future in as_completed(config_futures):
+                repo, revision, revision_pipelines = config_futures[config_future]
+                contexts = config_future.result()
+                if contexts is None:
+                    failed_since[repo] = min([failed_since.get(repo, revision_pipelines[0].get("created_at", ""))] +
+                                             [pipeline.get("created_at", "") for pipeline in revision_pipelines])
+                    continue
+                new_pipelines[repo].extend(self.__to_scanned_pipelines(
+                    revision, revision_pipelines, contexts))
+
+        progress.report()
+        self.__report_context_cache()
+        if not state_path:
+            return progress.contexts
+
+        if failed_since:
+            print(f"Pipeline configurations could not be fetched for {len(failed_since)} repositories, "
+                  f"their pipelines will be scanned again on the next run")
+        used_contexts = {context for pipelines in new_pipelines.values() for pipeline in pipelines
+                         for context in pipeline["contexts"]}
+        for repo in repo_list:
+            kept_pipelines = [pipeline for pipeline in new_pipelines[repo]
+                              if repo not in failed_since or pipeline["created_at"] < failed_since[repo]]
+            kept_pipelines += state.get(repo, [])
+            state[repo] = sorted(kept_pipelines, key=lambda pipeline: pipeline["created_at"],
+                                 reverse=True)[:self.PIPELINES_KEPT_PER_REPOSITORY]
+        state = {repo: state[repo] for repo in repo_list}
+        self.__write_pipeline_scan_state(state_path, state)
+        return used_contexts | {context for pipelines in state.values() for pipeline in pipelines
+                                for context in pipeline["contexts"]}
+
+    def __get_pipelines_to_scan(self, repo, kept_pipelines, state_path):
+        if not state_path:
+            return self.get_circleci_pipelines_for_repository(repo)
+        return self.get_new_circleci_pipelines_for_repository(repo, kept_pipelines[0] if kept_pipelines else None)
+
+    @staticmethod
+    def __to_scanned_pipelines(revision, pipelines, contexts) -> list[dict]:
+        return [{
+            "id": pipeline["id"],
+            "created_at": pipeline.get("created_at", ""),
+            "revision": revision,
+            "contexts": sorted(contexts)
+        } for pipeline in pipelines]
+
+    def __get_contexts_from_pipeline_id(self, pipeline_id, progress: PipelineScanProgress) -> set[str] | None:
+        contexts = self.get_contexts_from_pipeline_id(pipeline_id)
+        progress.add_configuration(contexts)
+        return contexts
+
+    @staticmethod
+    def __read_pipeline_scan_state(state_path: str) -> dict[str, list[dict]]:
+        try:
+            with open(state_path, encoding="utf-8") as state_file:
+                return json.load(state_file)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def __write_pipeline_scan_state(state_path: str, state: dict[str, list[dict]]) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(state_path)), suffix=".tmp")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        os.replace(temporary_path, state_path)
+
+    def __report_context_cache(self) -> None:
+        print(f"Context cache: {self.context_cache.hits} configurations reused, "
+              f"{self.context_cache.misses} parsed")
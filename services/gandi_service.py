@@ -1,5 +1,7 @@
 import requests
 
+from clients import http_transport
+
 
 class GandiService:
     def __init__(self, token, url_extension) -> None:
@@ -8,7 +10,7 @@ class GandiService:
 
     def get_current_account_balance_from_org(self, org_id):
         try:
-            response = requests.get(
+            response = http_transport.get(
                 url=self.url + org_id, headers=self.headers, timeout=60)
             response.raise_for_status()
             return float(response.json()['prepaid']['amount'])
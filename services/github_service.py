@@ -1,21 +1,41 @@
 # pylint: disable=E1136, E1135, W0718, C0411
 
+import asyncio
+import functools
+import inspect
 import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from calendar import timegm
 from datetime import date, datetime, timedelta, timezone
-from time import gmtime, sleep
-from typing import Any, Callable
+from time import gmtime, perf_counter, sleep
+from typing import Any, Callable, Iterator
+from urllib.parse import quote
 
 from dateutil.relativedelta import relativedelta
 from github import (Github, GithubException, NamedUser, RateLimitExceededException,
                     UnknownObjectException)
 from github.Organization import Organization
 from github.Repository import Repository
-from gql import Client, gql
-from gql.transport.aiohttp import AIOHTTPTransport
-from gql.transport.exceptions import TransportQueryError
+from github.Requester import Requester
+from github.Team import Team
+from gql import Client
+from gql.client import AsyncClientSession
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+from graphql import DocumentNode
 from requests import Session
-
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from clients.conditional_request_cache import (
+    ConditionalRequestCache, ConditionalRequestCacheAdapter)
+from clients.github_graphql_documents import GITHUB_GRAPHQL_DOCUMENTS
+from clients.github_graphql_telemetry import (GraphQLPageSizeController,
+                                              graphql_telemetry)
+from clients.github_rate_limit_governor import (RateLimitGovernor,
+                                                RateLimitGovernorAdapter)
+from clients.pygithub_connection import build_pygithub_connection_class
 from config.logging_config import logging
 
 logging.getLogger("gql").setLevel(logging.WARNING)
@@ -57,10 +77,127 @@ def retries_github_rate_limit_exception_at_next_reset_once(func: Callable) -> Ca
     return decorator
 
 
+GRAPHQL_PAGE_RETRY_STATUS_CODES = (502, 504)
+
+
+def adapts_graphql_page_size(func: Callable) -> Callable:
+    """
+    A decorator for paginated GraphQL query methods, which take a page_size argument, that records the latency
+    and the rateLimit cost of each page in the service's GraphQL telemetry, and sends each page at the size chosen
+    by the service's page size controller. A page that times out or fails with a gateway error is resent at a
+    smaller page size, which is safe as GitHub cursors do not depend on the page size.
+    """
+    signature = inspect.signature(func)
+    default_page_size = signature.parameters["page_size"].default
+    if default_page_size is inspect.Parameter.empty:
+        default_page_size = None
+
+    def bind_page_size(args: tuple, kwargs: dict) -> tuple[Any, inspect.BoundArguments, int]:
+        arguments = signature.bind(*args, **kwargs)
+        service = arguments.arguments["self"]
+        page_size = service.graphql_page_size_controller.page_size(
+            func.__name__, arguments.arguments.get("page_size"), default_page_size)
+        arguments.arguments["page_size"] = page_size
+        return service, arguments, page_size
+
+    def record_success(service: Any, page_size: int, seconds: float, result: Any) -> None:
+        rate_limit = result.get("rateLimit") if isinstance(
+            result, dict) else None
+        service.graphql_telemetry.record(
+            func.__name__, page_size, seconds, rate_limit)
+        service.graphql_page_size_controller.record_success(
+            func.__name__, page_size, seconds, rate_limit)
+
+    def shrinks_after_failure(service: Any, page_size: int, seconds: float, exception: Exception) -> bool:
+        service.graphql_telemetry.record_failure(
+            func.__name__, page_size, seconds)
+        if isinstance(exception, TransportServerError) and exception.code not in GRAPHQL_PAGE_RETRY_STATUS_CODES:
+            return False
+        if not service.graphql_page_size_controller.shrink(func.__name__, page_size):
+            return False
+        logging.warning(
+            f"{func.__name__} failed with {type(exception).__name__} at page size {page_size}, retrying with a smaller page")
+        return True
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_decorator(*args, **kwargs):
+            while True:
+                service, arguments, page_size = bind_page_size(args, kwargs)
+                start = perf_counter()
+                try:
+                    result = await func(*arguments.args, **arguments.kwargs)
+                except (TimeoutError, TransportServerError) as exception:
+                    if shrinks_after_failure(service, page_size, perf_counter() - start, exception):
+                        continue
+                    raise
+                record_success(service, page_size,
+                               perf_counter() - start, result)
+                return result
+
+        return async_decorator
+
+    @functools.wraps(func)
+    def decorator(*args, **kwargs):
+        while True:
+            service, arguments, page_size = bind_page_size(args, kwargs)
+            start = perf_counter()
+            try:
+                result = func(*arguments.args, **arguments.kwargs)
+            except (TimeoutError, TransportServerError) as exception:
+                if shrinks_after_failure(service, page_size, perf_counter() - start, exception):
+                    continue
+                raise
+            record_success(service, page_size, perf_counter() - start, result)
+            return result
+
+    return decorator
+
+
+@dataclass
+class CommitActivityIndex:
+    """The date of the latest default branch commit by each author in each indexed repository, keyed by
+    lower case author login and email. repositories_since records how far back each repository was indexed."""
+    repositories_since: dict[str, datetime] = field(default_factory=dict)
+    last_commit_dates: dict[str, dict[str, datetime]] = field(default_factory=dict)
+
+    def covers(self, repository_name: str, since: datetime) -> bool:
+        return repository_name in self.repositories_since and self.repositories_since[repository_name] <= since
+
+    def add_commit(self, repository_name: str, author: dict[str, Any]) -> None:
+        commit_date = datetime.fromisoformat(author["date"]).astimezone(timezone.utc).replace(tzinfo=None)
+        authors = self.last_commit_dates.setdefault(repository_name, {})
+        keys = [(author.get("user") or {}).get("login"), author.get("email")]
+        for key in [key.lower() for key in keys if key]:
+            if key not in authors or authors[key] < commit_date:
+                authors[key] = commit_date
+
+    def last_commit_date(self, repository_names: list[str], login: str, emails: list[str] | None = None) -> datetime | None:
+        keys = [key.lower() for key in [login, *(emails or [])] if key]
+        commit_dates = [
+            self.last_commit_dates.get(repository_name, {}).get(key)
+            for repository_name in repository_names for key in keys
+        ]
+        return max([commit_date for commit_date in commit_dates if commit_date], default=None)
+
+
 class GithubService:
     USER_ACCESS_REMOVED_ISSUE_TITLE: str = "User access removed, access is now via a team"
     GITHUB_GQL_MAX_PAGE_SIZE = 100
     GITHUB_GQL_DEFAULT_PAGE_SIZE = 80
+    GITHUB_GQL_DEFAULT_MAX_IN_FLIGHT_QUERIES = 3
+    GITHUB_GQL_USERS_PER_QUERY = 50
+    GITHUB_DEFAULT_MAX_CONCURRENT_WRITES = 5
+    GITHUB_DEFAULT_MAX_CONCURRENT_READS = 10
+    GITHUB_REST_MAX_VARIABLES_PAGE_SIZE = 30
+    REPOSITORY_TYPES = ["public", "private", "internal"]
+    REPOSITORY_AGE_FIELDS = ["search.repos.repo.name",
+                             "search.repos.repo.createdAt", "search.pageInfo"]
+    # The GraphQL RepositoryPermission of each REST team permission and its alias
+    REPOSITORY_PERMISSIONS = {"pull": "READ", "read": "READ", "triage": "TRIAGE", "push": "WRITE",
+                              "write": "WRITE", "maintain": "MAINTAIN", "admin": "ADMIN"}
+    AUDIT_LOG_MEMBER_CHANGE_ACTIONS = ["org.add_member", "org.update_member"]
+    GRAPHQL_DOCUMENTS = GITHUB_GRAPHQL_DOCUMENTS
     ENTERPRISE_NAME = "ministry-of-justice-uk"
 
     # Added to stop TypeError on instantiation. See https://github.com/python/cpython/blob/d2340ef25721b6a72d45d4508c672c4be38c67d3/Objects/typeobject.c#L4444
@@ -68,16 +205,23 @@ class GithubService:
         return super(GithubService, cls).__new__(cls)
 
     def __init__(self, org_token: str, organisation_name: str,
-                 enterprise_name: str = ENTERPRISE_NAME) -> None:
+                 enterprise_name: str = ENTERPRISE_NAME, http_cache_directory: str | None = None) -> None:
         self.organisation_name: str = organisation_name
         self.enterprise_name: str = enterprise_name
         self.organisations_in_enterprise: list = ["ministryofjustice", "moj-analytical-services"]
 
+        self.rate_limit_governor = RateLimitGovernor()
+        self.graphql_telemetry = graphql_telemetry
+        self.graphql_page_size_controller = GraphQLPageSizeController(
+            self.GITHUB_GQL_MAX_PAGE_SIZE)
+        self.commit_activity_index = CommitActivityIndex()
+        self.__audit_log_last_active_dates: dict[str, tuple[datetime, dict[str, datetime]]] = {}
+        self.__repository_variables: dict[str, str] | None = None
+        self.__pending_audit_log_checkpoints: dict[str, dict[str, str]] = {}
+
         self.github_client_core_api: Github = Github(org_token)
-        self.github_client_gql_api: Client = Client(transport=AIOHTTPTransport(
-            url="https://api.github.com/graphql",
-            headers={"Authorization": f"Bearer {org_token}"},
-        ), execute_timeout=120)
+        self.__graphql_headers = {"Authorization": f"Bearer {org_token}"}
+        self.__github_client_gql_api: Client | None = None
         self.github_client_rest_api = Session()
         self.github_client_rest_api.headers.update(
             {
@@ -85,41 +229,130 @@ class GithubService:
                 "Authorization": f"Bearer {org_token}",
             }
         )
+        self.__mount_rest_adapters(ConditionalRequestCache(
+            http_cache_directory, org_token) if http_cache_directory else None)
+
+    @property
+    def github_client_gql_api(self) -> Client:
+        """The GraphQL client, created at first use so that jobs which only call the REST API never import the
+        aiohttp transport."""
+        if self.__github_client_gql_api is None:
+            # pylint: disable=C0415
+            from clients.github_rate_limit_governor_transport import \
+                RateLimitGovernorTransport
+            self.__github_client_gql_api = Client(transport=RateLimitGovernorTransport(
+                self.rate_limit_governor,
+                url="https://api.github.com/graphql",
+                headers=self.__graphql_headers,
+                timeout=120,
+            ), execute_timeout=None)
+        return self.__github_client_gql_api
+
+    @github_client_gql_api.setter
+    def github_client_gql_api(self, github_client_gql_api: Client) -> None:
+        self.__github_client_gql_api = github_client_gql_api
+
+    def __build_rest_adapter(self, conditional_request_cache: ConditionalRequestCache | None, **kwargs) -> BaseAdapter:
+        if conditional_request_cache:
+            adapter = ConditionalRequestCacheAdapter(
+                conditional_request_cache, **kwargs)
+        else:
+            adapter = HTTPAdapter(**kwargs)
+        return RateLimitGovernorAdapter(self.rate_limit_governor, adapter)
+
+    def __mount_rest_adapters(self, conditional_request_cache: ConditionalRequestCache | None) -> None:
+        """Sends REST requests, both raw and through PyGithub, through the rate limit governor and, when given, the
+        conditional request cache, which revalidates GET requests against an on-disk ETag/Last-Modified cache.
+        Responses that have not changed come back as 304 Not Modified, which does not count against the rate limit."""
+        if conditional_request_cache:
+            logging.info(
+                f"Using conditional request cache in {conditional_request_cache.cache_directory}")
+        self.github_client_rest_api.mount(
+            "https://", self.__build_rest_adapter(conditional_request_cache))
+        # PyGithub creates its session lazily from the connection class held by its requester
+        requester = getattr(self.github_client_core_api,
+                            "_Github__requester", None)
+        if requester is not None:
+            requester._Requester__connectionClass = build_pygithub_connection_class(  # pylint: disable=W0212
+                lambda **kwargs: self.__build_rest_adapter(conditional_request_cache, **kwargs))
 
     def archive_all_inactive_repositories(self, last_active_cutoff_date: datetime, allow_list: list[str]) -> None:
-        for repo in self.__get_repos_to_consider_for_archiving("all"):
-            if self.__is_repo_ready_for_archiving(repo, last_active_cutoff_date, allow_list):
-                logging.info(f"Archiving repository: {repo.name}")
-                repo.edit(archived=True)
-
-    def __get_repos_to_consider_for_archiving(self, repository_type: str) -> list[Repository]:
-        repositories = list(
-            self.github_client_core_api.get_organization(self.organisation_name).get_repos(type=repository_type))
-        return [repository for repository in repositories if not (repository.archived or repository.fork)]
-
-    def __is_repo_ready_for_archiving(self, repository: Repository, last_active_cutoff_date: datetime, allow_list: list[str]) -> bool:
-        if (repository.created_at).replace(tzinfo=None) >= (last_active_cutoff_date).replace(tzinfo=None):
+        for repository_name in self.get_inactive_repository_names(last_active_cutoff_date, allow_list):
+            logging.info(f"Archiving repository: {repository_name}")
+            self.github_client_core_api.get_repo(
+                f"{self.organisation_name}/{repository_name}", lazy=True).edit(archived=True)
+
+    def get_inactive_repository_names(self, last_active_cutoff_date: datetime, allow_list: list[str]) -> list[str]:
+        """Selects the repositories to archive from paged GraphQL queries of every repository's creation date and
+        the date of the last commit on its default branch, so no per repository REST requests are made.
+
+        Arguments:
+            last_active_cutoff_date {datetime} -- Repositories created or committed to since this date are kept.
+            allow_list {list[str]} -- Names of repositories that are never archived.
+
+        Returns:
+            list[str] -- Names of the unarchived, non fork repositories that are ready for archiving.
+        """
+        return [
+            repository["name"]
+            for repository in self.__get_repos_to_consider_for_archiving()
+            if self.__is_repo_ready_for_archiving(repository, last_active_cutoff_date, allow_list)
+        ]
+
+    def __get_repos_to_consider_for_archiving(self) -> list[dict[str, Any]]:
+        repositories = []
+        has_next_page = True
+        after_cursor = None
+        while has_next_page:
+            data = self.get_paginated_list_of_repositories_with_last_commit_date(
+                after_cursor)
+            repositories.extend(
+                data["organization"]["repositories"]["nodes"])
+            has_next_page = data["organization"]["repositories"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["organization"]["repositories"]["pageInfo"]["endCursor"]
+        return [repository for repository in repositories if not (repository["isArchived"] or repository["isFork"])]
+
+    def __is_repo_ready_for_archiving(self, repository: dict[str, Any], last_active_cutoff_date: datetime, allow_list: list[str]) -> bool:
+        cutoff_date = last_active_cutoff_date.replace(tzinfo=None)
+        if datetime.fromisoformat(repository["createdAt"]).replace(tzinfo=None) >= cutoff_date:
             logging.debug(
-                f"Skipping repository: {repository.name}. Reason: Repository created later than last active cutoff date")
+                f"Skipping repository: {repository['name']}. Reason: Repository created later than last active cutoff date")
             return False
 
-        if repository.name in allow_list:
+        if repository["name"] in allow_list:
             logging.debug(
-                f"Skipping repository: {repository.name}. Reason: Present in allow list")
+                f"Skipping repository: {repository['name']}. Reason: Present in allow list")
             return False
 
-        try:  # Try block needed as get_commits() can cause exception when a repository has no commits as GH returns negative result.
-            latest_commit_position = 0
-            commit = repository.get_commits()[latest_commit_position]
-            if commit and (commit.commit.author.date).replace(tzinfo=None) >= (last_active_cutoff_date).replace(tzinfo=None):
-                logging.debug(
-                    f"Skipping repository: {repository.name}. Reason: Last commit date later than last active cutoff date")
-                return False
-        except GithubException:
-            logging.debug(f"Repository has no commits: {repository.name}")
+        # An empty repository has no default branch, and a default branch can point at a tag rather than a commit
+        last_commit = (repository["defaultBranchRef"] or {}).get("target") or {}
+        if not last_commit.get("committedDate"):
+            logging.debug(f"Repository has no commits: {repository['name']}")
+        elif datetime.fromisoformat(last_commit["committedDate"]).replace(tzinfo=None) >= cutoff_date:
+            logging.debug(
+                f"Skipping repository: {repository['name']}. Reason: Last commit date later than last active cutoff date")
+            return False
 
         return True
 
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def get_paginated_list_of_repositories_with_last_commit_date(
+        self,
+        after_cursor: str | None,
+        page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE,
+    ) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of org repositories with last commit date. Page size {page_size}, after cursor {bool(after_cursor)}"
+        )
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["repositories_with_last_commit_date"],
+            variable_values={"organisation_name": self.organisation_name, "page_size": page_size,
+                             "after_cursor": after_cursor})
+
     @retries_github_rate_limit_exception_at_next_reset_once
     def get_outside_collaborators_login_names(self) -> list[str]:
         logging.info("Getting Outside Collaborators Login Names")
@@ -128,15 +361,44 @@ class GithubService:
         return [outside_collaborator.login.lower() for outside_collaborator in outside_collaborators]
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def add_all_users_to_team(self, team_name: str) -> None:
+    def add_all_users_to_team(self, team_name: str, dry_run: bool = False,
+                              max_concurrent_writes: int = GITHUB_DEFAULT_MAX_CONCURRENT_WRITES) -> list[str]:
+        """Reconciles a team with the organisation by adding every organisation member that is not in the team.
+
+        Both memberships are fetched once as login sets and only the difference is written, up to
+        max_concurrent_writes memberships at a time, through a single team handle.
+
+        Args:
+            team_name (str): The name of the team.
+            dry_run (bool): Log the planned additions without making them.
+            max_concurrent_writes (int): The number of memberships added at the same time.
+
+        Returns:
+            list[str]: The logins added to the team, or that would be added on a dry run.
+        """
         logging.info(f"Adding all users to {team_name}")
         team_id = self.get_team_id_from_team_name(team_name)
-        all_users = self.__get_all_users()
-        existing_users_in_team = self.__get_users_from_team(team_id)
+        team = self.github_client_core_api.get_organization(
+            self.organisation_name).get_team(team_id)
+        all_users = {user.login.lower(): user for user in self.__get_all_users()}
+        existing_user_logins = {user.login.lower()
+                                for user in team.get_members() or []}
+        users_to_add = [all_users[login]
+                        for login in sorted(all_users.keys() - existing_user_logins)]
+        logging.info(
+            f"{len(users_to_add)} of {len(all_users)} organisation members are not in team {team_name}")
+
+        if dry_run:
+            for user in users_to_add:
+                logging.info(
+                    f"Dry run: would add user {user.login} to team {team_name}")
+            return [user.login for user in users_to_add]
 
-        for user in all_users:
-            if user not in existing_users_in_team:
-                self.__add_user_to_team(user, team_id)
+        with ThreadPoolExecutor(max_workers=max_concurrent_writes) as executor:
+            # Consuming the results raises the first exception from the writes
+            list(executor.map(lambda user: self.__add_user_to_team(
+                user, team), users_to_add))
+        return [user.login for user in users_to_add]
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def __get_all_users(self) -> list:
@@ -144,10 +406,9 @@ class GithubService:
         return self.github_client_core_api.get_organization(self.organisation_name).get_members() or []
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def __add_user_to_team(self, user: NamedUser, team_id: int) -> None:
-        logging.info(f"Adding user {user.name} to team {team_id}")
-        self.github_client_core_api.get_organization(
-            self.organisation_name).get_team(team_id).add_membership(user)
+    def __add_user_to_team(self, user: NamedUser, team: Team) -> None:
+        logging.info(f"Adding user {user.login} to team {team.name}")
+        team.add_membership(user)
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def __get_repositories_from_team(self, team_id: int) -> list[Repository]:
@@ -164,47 +425,14 @@ class GithubService:
     @retries_github_rate_limit_exception_at_next_reset_once
     def get_team_id_from_team_name(self, team_name: str) -> int | TypeError:
         logging.info(f"Getting team ID for team name {team_name}")
-        data = self.github_client_gql_api.execute(gql("""
-            query($organisation_name: String!, $team_name: String!) {
-                organization(login: $organisation_name) {
-                    team(slug: $team_name) {
-                        databaseId
-                    }
-                }
-            }
-        """), variable_values={"organisation_name": self.organisation_name, "team_name": team_name})
+        data = self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["team_id"],
+            variable_values={"organisation_name": self.organisation_name, "team_name": team_name})
 
         return data["organization"]["team"]["databaseId"]
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def get_paginated_list_of_org_repository_names(self, after_cursor: str | None,
-                                                   page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
-        logging.info(
-            f"Getting paginated list of org repository names. Page size {page_size}, after cursor {bool(after_cursor)}")
-        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
-            raise ValueError(
-                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        return self.github_client_gql_api.execute(gql("""
-            query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
-                organization(login: $organisation_name) {
-                    repositories(first: $page_size, after: $after_cursor, isLocked: false, isArchived: false) {
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                        edges {
-                            node {
-                                isDisabled
-                                name
-                            }
-                        }
-                    }
-                }
-            }
-        """), variable_values={"organisation_name": self.organisation_name, "page_size": page_size,
-                               "after_cursor": after_cursor})
-
-    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_list_of_unlocked_unarchived_repos_and_their_first_100_outside_collaborators(
         self,
         after_cursor: str | None,
@@ -216,106 +444,41 @@ class GithubService:
         if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
             raise ValueError(
                 f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        return self.github_client_gql_api.execute(gql("""
-            query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
-                organization(login: $organisation_name) {
-                    repositories(first: $page_size, after: $after_cursor, isLocked: false, isArchived: false) {
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                        nodes {
-                            name
-                            isDisabled
-                            collaborators(first: 100, affiliation: OUTSIDE){
-                                pageInfo {
-                                    hasNextPage
-                                }
-                                edges {
-                                    node {
-                                        login
-                                    }
-                                }
-                            }
-                        }
-
-                    }
-                }
-            }
-        """), variable_values={"organisation_name": self.organisation_name, "page_size": page_size,
-                               "after_cursor": after_cursor})
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["unlocked_unarchived_repos_and_their_first_100_outside_collaborators"],
+            variable_values={"organisation_name": self.organisation_name, "page_size": page_size,
+                             "after_cursor": after_cursor})
+
+    def __get_repositories_per_type_query(self, repo_type: str, after_cursor: str | None,
+                                          page_size: int) -> tuple[DocumentNode, dict[str, Any]]:
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        the_query = f"org:{self.organisation_name}, archived:false, is:{repo_type}"
+        return self.GRAPHQL_DOCUMENTS["repositories_per_type"], {"the_query": the_query, "page_size": page_size, "after_cursor": after_cursor}
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_list_of_repositories_per_type(self, repo_type: str, after_cursor: str | None,
                                                     page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
         logging.info(
             f"Getting paginated list of repositories per type {repo_type}. Page size {page_size}, after cursor {bool(after_cursor)}")
-        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
-            raise ValueError(
-                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        the_query = f"org:{self.organisation_name}, archived:false, is:{repo_type}"
-        return self.github_client_gql_api.execute(gql("""
-            query($page_size: Int!, $after_cursor: String, $the_query: String!) {
-                search(
-                    type: REPOSITORY
-                    query: $the_query
-                    first: $page_size
-                    after: $after_cursor
-                ) {
-                repos: edges {
-                    repo: node {
-                        ... on Repository {
-                                isDisabled
-                                isPrivate
-                                isLocked
-                                name
-                                pushedAt
-                                url
-                                description
-                                hasIssuesEnabled
-                                repositoryTopics(first: 10) {
-                                    edges {
-                                        node {
-                                            topic {
-                                                name
-                                            }
-                                        }
-                                    }
-                                }
-                                defaultBranchRef {
-                                    name
-                                }
-                                collaborators(affiliation: DIRECT) {
-                                    totalCount
-                                }
-                                licenseInfo {
-                                    name
-                                }
-                                collaborators(affiliation: DIRECT) {
-                                    totalCount
-                                }
-                                branchProtectionRules(first: 10) {
-                                    edges {
-                                        node {
-                                            isAdminEnforced
-                                            pattern
-                                            requiredApprovingReviewCount
-                                            requiresApprovingReviews
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                    pageInfo {
-                        hasNextPage
-                        endCursor
-                    }
-                }
-            }
-        """), variable_values={"the_query": the_query, "page_size": page_size, "after_cursor": after_cursor})
+        query, variable_values = self.__get_repositories_per_type_query(
+            repo_type, after_cursor, page_size)
+        return self.github_client_gql_api.execute(query, variable_values=variable_values)
+
+    @adapts_graphql_page_size
+    async def get_paginated_list_of_repositories_per_type_async(self, session: AsyncClientSession, repo_type: str,
+                                                                after_cursor: str | None,
+                                                                page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of repositories per type {repo_type} asynchronously. Page size {page_size}, after cursor {bool(after_cursor)}")
+        query, variable_values = self.__get_repositories_per_type_query(
+            repo_type, after_cursor, page_size)
+        return await session.execute(query, variable_values=variable_values)
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_list_of_team_names(self, after_cursor: str | None,
                                          page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
         logging.info(
@@ -323,29 +486,16 @@ class GithubService:
         if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
             raise ValueError(
                 f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        return self.github_client_gql_api.execute(gql("""
-            query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
-                organization(login: $organisation_name) {
-                    teams(first: $page_size, after:$after_cursor) {
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                        edges {
-                            node {
-                                slug
-                            }
-                        }
-                    }
-                }
-            }
-        """), variable_values={
-            "organisation_name": self.organisation_name,
-            "page_size": page_size,
-            "after_cursor": after_cursor
-        })
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["team_names"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_list_of_team_repositories(self, team_name: str, after_cursor: str | None,
                                                 page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
         logging.info(
@@ -353,32 +503,102 @@ class GithubService:
         if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
             raise ValueError(
                 f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        return self.github_client_gql_api.execute(gql("""
-        query($organisation_name: String!, $team_name: String!, $page_size: Int!, $after_cursor: String) {
-            organization(login: $organisation_name) {
-                team(slug: $team_name) {
-                    repositories(first: $page_size, after:$after_cursor) {
-                        edges {
-                            node {
-                                name
-                            }
-                        }
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                    }
-                }
-            }
-        }
-        """), variable_values={
-            "organisation_name": self.organisation_name,
-            "team_name": team_name,
-            "page_size": page_size,
-            "after_cursor": after_cursor
-        })
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["team_repositories"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "team_name": team_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
+
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def get_paginated_list_of_teams_with_repositories_and_member_counts(self, after_cursor: str | None,
+                                                                       page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of teams with their first 100 repositories and member counts. Page size {page_size}, after cursor {bool(after_cursor)}")
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["teams_with_repositories_and_member_counts"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def get_paginated_list_of_repositories_and_collaborator_counts(self, after_cursor: str | None,
+                                                                   page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of org repositories and their collaborator counts. Page size {page_size}, after cursor {bool(after_cursor)}")
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["repositories_and_collaborator_counts"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
+
+    def get_repository_ownership_index(self, teams_to_ignore: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        """Builds the team and collaborator ownership of every open (not locked, not archived nor disabled)
+        repository in the organisation from paged GraphQL queries, rather than per team and per repository calls.
+
+        Args:
+            teams_to_ignore (list[str] | None): Team slugs that do not count as owning a repository
+
+        Returns:
+            dict: Keyed by repository name, each value holds "teams", the set of team slugs with at least one member
+                that can access the repository, and "direct_collaborators" and "outside_collaborators" counts
+        """
+        teams_to_ignore = set(teams_to_ignore or [])
+        ownership_index = {}
+
+        has_next_page = True
+        after_cursor = None
+        while has_next_page:
+            data = self.get_paginated_list_of_repositories_and_collaborator_counts(
+                after_cursor, self.GITHUB_GQL_MAX_PAGE_SIZE)
+            for repo in data["organization"]["repositories"]["nodes"] or []:
+                if repo["isDisabled"]:
+                    continue
+                ownership_index[repo["name"]] = {
+                    "teams": set(),
+                    "direct_collaborators": (repo["directCollaborators"] or {}).get("totalCount", 0),
+                    "outside_collaborators": (repo["outsideCollaborators"] or {}).get("totalCount", 0),
+                }
+            has_next_page = data["organization"]["repositories"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["organization"]["repositories"]["pageInfo"]["endCursor"]
+
+        has_next_page = True
+        after_cursor = None
+        while has_next_page:
+            data = self.get_paginated_list_of_teams_with_repositories_and_member_counts(
+                after_cursor)
+            for team in data["organization"]["teams"]["nodes"] or []:
+                if team["slug"] in teams_to_ignore or team["members"]["totalCount"] == 0:
+                    continue
+                team_repositories = team["repositories"]
+                team_repository_names = [
+                    repo["name"] for repo in team_repositories["nodes"] or []]
+                if team_repositories["pageInfo"]["hasNextPage"]:
+                    team_repository_names.extend(self.get_team_repository_names(
+                        team["slug"], team_repositories["pageInfo"]["endCursor"]))
+                for repository_name in team_repository_names:
+                    if repository_name in ownership_index:
+                        ownership_index[repository_name]["teams"].add(
+                            team["slug"])
+            has_next_page = data["organization"]["teams"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["organization"]["teams"]["pageInfo"]["endCursor"]
+
+        return ownership_index
+
     def get_team_names(self) -> list[str]:
         """A wrapper function to run a GraphQL query to get the team names in the organisation
 
@@ -400,15 +620,16 @@ class GithubService:
             after_cursor = data["organization"]["teams"]["pageInfo"]["endCursor"]
         return team_names
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_team_repository_names(self, team_name: str) -> list[str]:
+    def get_team_repository_names(self, team_name: str, after_cursor: str | None = None) -> list[str]:
         """A wrapper function to run a GraphQL query to get a team repository names
 
+        Args:
+            after_cursor (str | None): Start from this cursor, used to finish a list that was partially fetched elsewhere
+
         Returns:
             list: A list of the team repository names
         """
         has_next_page = True
-        after_cursor = None
         team_repository_names = []
 
         while has_next_page:
@@ -423,55 +644,6 @@ class GithubService:
             after_cursor = data["organization"]["team"]["repositories"]["pageInfo"]["endCursor"]
         return team_repository_names
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_team_user_names(self, team_name: str) -> list[str]:
-        """A wrapper function to run a GraphQL query to get a team user names
-
-        Returns:
-            list: A list of the team user names
-        """
-        has_next_page = True
-        after_cursor = None
-        team_user_names = []
-
-        while has_next_page:
-            data = self.get_paginated_list_of_team_user_names(
-                team_name, after_cursor, 100)
-
-            if data["organization"]["team"]["members"]["edges"] is not None:
-                for team in data["organization"]["team"]["members"]["edges"]:
-                    team_user_names.append(team["node"]["login"])
-
-            has_next_page = data["organization"]["team"]["members"]["pageInfo"]["hasNextPage"]
-            after_cursor = data["organization"]["team"]["members"]["pageInfo"]["endCursor"]
-        return team_user_names
-
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_org_repo_names(self) -> list[str]:
-        """A wrapper function to run a GraphQL query to get a list of the organisation repository names
-        (open repositories only).
-
-        Returns:
-            list: A list of the organisation repository names
-        """
-        has_next_page = True
-        after_cursor = None
-        repository_names = []
-        while has_next_page:
-            data = self.get_paginated_list_of_org_repository_names(
-                after_cursor, 100)
-
-            if data["organization"]["repositories"]["edges"] is not None:
-                for repo in data["organization"]["repositories"]["edges"]:
-                    if repo["node"]["isDisabled"]:
-                        continue
-                    repository_names.append(repo["node"]["name"])
-
-            has_next_page = data["organization"]["repositories"]["pageInfo"]["hasNextPage"]
-            after_cursor = data["organization"]["repositories"]["pageInfo"]["endCursor"]
-        return repository_names
-
-    @retries_github_rate_limit_exception_at_next_reset_once
     def check_circleci_config_in_repos(self) -> list[str]:
         """Check if each repository in the list has a CircleCI configuration file using GraphQL.
 
@@ -497,45 +669,32 @@ class GithubService:
             after_cursor = data["organization"]["repositories"]["pageInfo"]["endCursor"]
         return repos_with_circleci_config
 
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_circleci_config_check(self, after_cursor: str | None, page_size: int) -> dict[str, Any]:
         logging.info(f"Checking CircleCI config in repos. Page size {page_size}, after cursor {bool(after_cursor)}")
         if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
             raise ValueError(f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
 
-        return self.github_client_gql_api.execute(gql("""
-        query($organisation_name: String!, $page_size: Int!, $after_cursor: String) {
-            organization(login: $organisation_name) {
-                repositories(first: $page_size, after: $after_cursor) {
-                    pageInfo {
-                        endCursor
-                        hasNextPage
-                    }
-                    edges {
-                        node {
-                            name
-                            object(expression: "HEAD:.circleci/config.yml") {
-                                ... on Blob {
-                                    id
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        """), variable_values={
-            "organisation_name": self.organisation_name,
-            "page_size": page_size,
-            "after_cursor": after_cursor
-        })
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["circleci_config_check"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
 
-    def get_stale_outside_collaborators(self) -> list[str]:
+    def get_stale_outside_collaborators(self,
+                                        max_in_flight_queries: int = GITHUB_GQL_DEFAULT_MAX_IN_FLIGHT_QUERIES) -> list[str]:
         """A wrapper function to run a GraphQL query to get a list of the Stale Outside Collaborators
         in the organisation. These are Outside Collaborators not affiliated with any open (not locked,
         not archived nor disabled) repositories. The function collects the Active Outside Collaborators
         (those affiliated with at least one open repository) and then subtracts these from the total
         list of Outside Collaborators.
 
+        Repositories with more than 100 Outside Collaborators have their remaining collaborators fetched
+        concurrently, up to max_in_flight_queries at a time, after each page of repositories.
+
         Returns:
             list: A list of the organisation stale outside collaborators login names in lower case
         """
@@ -543,130 +702,223 @@ class GithubService:
         all_outside_collaborators = self.get_outside_collaborators_login_names()
         repo_has_next_page = True
         after_cursor = None
-        active_outside_collaborators = []
+        active_outside_collaborators = set()
         while repo_has_next_page:
             data = self.get_paginated_list_of_unlocked_unarchived_repos_and_their_first_100_outside_collaborators(
                 after_cursor, self.GITHUB_GQL_MAX_PAGE_SIZE
             )
+            repos_with_more_collaborators = []
             if data["organization"]["repositories"]["nodes"] is not None:
                 for repo in data["organization"]["repositories"]["nodes"]:
                     if repo["isDisabled"]:
                         continue
-                    # The query only returns the first 100 Outside Collaborators on a repo, if there is a next page
-                    # it will not collect them. This is very unlikely to occur, however the function output is
-                    # unreliable if it does so.
+                    active_outside_collaborators.update(
+                        self.__get_collaborator_login_names(repo["collaborators"]))
                     if repo["collaborators"]["pageInfo"]["hasNextPage"]:
-                        raise ValueError(
-                            "Some Outside Collaborators omitted from calculation; cannot get reliable Stale Outside Collaborators list."
-                        )
-                    for collaborators in repo["collaborators"]["edges"]:
-                        if collaborators:
-                            active_outside_collaborators.append(collaborators["node"]["login"].lower())
+                        repos_with_more_collaborators.append(
+                            (repo["name"], repo["collaborators"]["pageInfo"]["endCursor"]))
+            if repos_with_more_collaborators:
+                active_outside_collaborators.update(asyncio.run(
+                    self.__get_remaining_outside_collaborators_async(repos_with_more_collaborators, max_in_flight_queries)))
             repo_has_next_page = data["organization"]["repositories"]["pageInfo"]["hasNextPage"]
             after_cursor = data["organization"]["repositories"]["pageInfo"]["endCursor"]
 
-        stale_outside_collaborators = set(all_outside_collaborators) - set(active_outside_collaborators)
+        stale_outside_collaborators = set(all_outside_collaborators) - active_outside_collaborators
 
         return list(stale_outside_collaborators)
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def fetch_all_repositories_in_org(self) -> list[dict[str, Any]]:
+    @staticmethod
+    def __get_collaborator_login_names(collaborators: dict[str, Any]) -> set[str]:
+        return {collaborator["node"]["login"].lower() for collaborator in collaborators["edges"] if collaborator}
+
+    async def __get_remaining_outside_collaborators_async(self, repos: list[tuple[str, str]],
+                                                          max_in_flight_queries: int) -> set[str]:
+        in_flight_queries = asyncio.Semaphore(max_in_flight_queries)
+        async with self.github_client_gql_api as session:
+            collaborators_per_repo = await asyncio.gather(*[
+                self.__get_remaining_repository_outside_collaborators_async(
+                    session, repo_name, after_cursor, in_flight_queries)
+                for repo_name, after_cursor in repos
+            ])
+        return set().union(*collaborators_per_repo)
+
+    async def __get_remaining_repository_outside_collaborators_async(self, session: AsyncClientSession, repo_name: str,
+                                                                     after_cursor: str,
+                                                                     in_flight_queries: asyncio.Semaphore) -> set[str]:
+        collaborators = set()
+        has_next_page = True
+        while has_next_page:
+            async with in_flight_queries:
+                data = await self.get_paginated_list_of_repository_outside_collaborators_async(
+                    session, repo_name, after_cursor)
+            collaborators.update(self.__get_collaborator_login_names(
+                data["repository"]["collaborators"]))
+            has_next_page = data["repository"]["collaborators"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["repository"]["collaborators"]["pageInfo"]["endCursor"]
+        return collaborators
+
+    @adapts_graphql_page_size
+    async def get_paginated_list_of_repository_outside_collaborators_async(self, session: AsyncClientSession,
+                                                                           repo_name: str, after_cursor: str | None,
+                                                                           page_size: int = GITHUB_GQL_MAX_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of outside collaborators of {repo_name} asynchronously. Page size {page_size}, after cursor {bool(after_cursor)}")
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return await session.execute(
+            self.GRAPHQL_DOCUMENTS["repository_outside_collaborators"],
+            variable_values={"organisation_name": self.organisation_name, "repo_name": repo_name,
+                             "page_size": page_size, "after_cursor": after_cursor})
+
+    def fetch_all_repositories_in_org(self, concurrent: bool = False) -> list[dict[str, Any]]:
         """A wrapper function to run a GraphQL query to get the list of repositories in the organisation
 
+        Args:
+            concurrent (bool): Page through the public, private and internal search streams concurrently
+                over a single asynchronous session instead of one after another. Each stream has at most
+                one page in flight, so at most three pages are requested at once.
+
         Returns:
             list: A list of the organisation repos names
         """
-        repos = []
-
         # Specifically switch off logging for this query as it is very large and doesn't need to be logged
         logging.disabled = True
 
-        for repo_type in ["public", "private", "internal"]:
-            after_cursor = None
-            has_next_page = True
-            while has_next_page:
-                data = self.get_paginated_list_of_repositories_per_type(
-                    repo_type, after_cursor)
+        try:
+            if concurrent:
+                repos_per_type = asyncio.run(
+                    self.__fetch_all_repositories_in_org_async())
+            else:
+                repos_per_type = [self.__fetch_repositories_of_type(
+                    repo_type) for repo_type in self.REPOSITORY_TYPES]
+        finally:
+            # Re-enable logging
+            logging.disabled = False
+
+        return [repo for repos in repos_per_type for repo in repos]
 
-                if data["search"]["repos"] is not None:
-                    for repo in data["search"]["repos"]:
-                        if repo["repo"]["isDisabled"] or repo["repo"]["isLocked"]:
-                            continue
-                        repos.append(repo["repo"])
+    def __fetch_repositories_of_type(self, repo_type: str) -> list[dict[str, Any]]:
+        repos = []
+        after_cursor = None
+        has_next_page = True
+        while has_next_page:
+            data = self.get_paginated_list_of_repositories_per_type(
+                repo_type, after_cursor)
+            repos.extend(self.__get_open_repositories_from_search(data))
+            has_next_page = data["search"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["search"]["pageInfo"]["endCursor"]
+        return repos
 
-                has_next_page = data["search"]["pageInfo"]["hasNextPage"]
-                after_cursor = data["search"]["pageInfo"]["endCursor"]
+    async def __fetch_all_repositories_in_org_async(self) -> list[list[dict[str, Any]]]:
+        async with self.github_client_gql_api as session:
+            return await asyncio.gather(*[
+                self.__fetch_repositories_of_type_async(session, repo_type)
+                for repo_type in self.REPOSITORY_TYPES
+            ])
 
-        # Re-enable logging
-        logging.disabled = False
+    async def __fetch_repositories_of_type_async(self, session: AsyncClientSession,
+                                                 repo_type: str) -> list[dict[str, Any]]:
+        repos = []
+        after_cursor = None
+        has_next_page = True
+        while has_next_page:
+            data = await self.get_paginated_list_of_repositories_per_type_async(
+                session, repo_type, after_cursor)
+            repos.extend(self.__get_open_repositories_from_search(data))
+            has_next_page = data["search"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["search"]["pageInfo"]["endCursor"]
         return repos
 
+    @staticmethod
+    def __get_open_repositories_from_search(data: dict[str, Any]) -> list[dict[str, Any]]:
+        if data["search"]["repos"] is None:
+            return []
+        return [repo["repo"] for repo in data["search"]["repos"]
+                if not (repo["repo"]["isDisabled"] or repo["repo"]["isLocked"])]
+
     @retries_github_rate_limit_exception_at_next_reset_once
-    def get_paginated_list_of_team_user_names(self, team_name: str, after_cursor: str | None,
-                                              page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+    def set_standards(self, repository_name: str, repository: dict[str, Any] | None = None):
+        """Enables issues and protects the main branch of a repository to the standards.
+
+        When the repository node from get_repositories_with_topic is given, only the settings it shows are not
+        compliant are written.
+        """
+        repo = self.github_client_core_api.get_repo(
+            f"{self.organisation_name}/{repository_name}", lazy=True)
+
+        if repository is None or not repository["hasIssuesEnabled"]:
+            repo.edit(has_issues=True)
+
+        if repository is None or not self.__has_standard_branch_protection(repository):
+            branch = repo.get_branch("main")
+            current_protection = branch.get_protection()
+            branch.edit_protection(
+                contexts=current_protection.required_status_checks.contexts if current_protection.required_status_checks else [],
+                strict=current_protection.required_status_checks.strict if current_protection.required_status_checks else False,
+                enforce_admins=True,
+                required_approving_review_count=1,
+                dismiss_stale_reviews=True,
+            )
 
+    def set_standards_on_non_compliant_repositories(self, repositories: list[dict[str, Any]],
+                                                    max_concurrent_writes: int = GITHUB_DEFAULT_MAX_CONCURRENT_WRITES) -> list[str]:
+        """Sets the standards on the repositories whose current settings are not compliant.
+
+        The repositories are the nodes from get_repositories_with_topic, which carry the issue and branch
+        protection settings, so compliant repositories cost no further requests. The rest are remediated up to
+        max_concurrent_writes at a time. A repository that cannot be remediated does not stop the others; a
+        ValueError naming every such repository is raised once the rest are done.
+
+        Returns:
+            list[str]: The names of the repositories that were remediated.
+        """
+        non_compliant_repositories = [repository for repository in repositories
+                                      if not self.is_standards_compliant(repository)]
         logging.info(
-            f"Getting paginated list of team user names. Page size {page_size}, after cursor {bool(after_cursor)}")
-        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
-            raise ValueError(
-                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
-        return self.github_client_gql_api.execute(gql("""
-        query($organisation_name: String!, $team_name: String!, $page_size: Int!, $after_cursor: String) {
-            organization(login: $organisation_name) {
-                team(slug: $team_name) {
-                    members(first: $page_size, after: $after_cursor) {
-                        edges {
-                            node {
-                                login
-                            }
-                        }
-                        pageInfo {
-                            hasNextPage
-                            endCursor
-                        }
-                    }
-                }
-            }
-        }
-        """), variable_values={
-            "organisation_name": self.organisation_name,
-            "team_name": team_name,
-            "page_size": page_size,
-            "after_cursor": after_cursor
-        })
+            f"Setting standards on {len(non_compliant_repositories)} of {len(repositories)} repositories")
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_repository_direct_users(self, repository_name: str) -> list:
-        users = self.github_client_core_api.get_repo(
-            f"{self.organisation_name}/{repository_name}").get_collaborators("direct") or []
-        return [member.login.lower() for member in users]
+        def remediate(repository: dict[str, Any]) -> bool:
+            try:
+                self.set_standards(repository["name"], repository)
+            except RateLimitExceededException:
+                raise
+            except GithubException as exc:
+                logging.error(
+                    f"Failed to set standards on {repository['name']}: {exc}")
+                return False
+            return True
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_repository_collaborators(self, repository_name: str) -> list:
-        users = self.github_client_core_api.get_repo(
-            f"{self.organisation_name}/{repository_name}").get_collaborators("outside") or []
-        return [member.login.lower() for member in users]
+        with ThreadPoolExecutor(max_workers=max_concurrent_writes) as executor:
+            remediated = list(executor.map(remediate, non_compliant_repositories))
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def set_standards(self, repository_name: str):
-        repo = self.github_client_core_api.get_repo(
-            f"{self.organisation_name}/{repository_name}")
-
-        repo.edit(has_issues=True)
-
-        branch = repo.get_branch("main")
-        current_protection = branch.get_protection()
-        branch.edit_protection(
-            contexts=current_protection.required_status_checks.contexts if current_protection.required_status_checks else [],
-            strict=current_protection.required_status_checks.strict if current_protection.required_status_checks else False,
-            enforce_admins=True,
-            required_approving_review_count=1,
-            dismiss_stale_reviews=True,
-        )
+        failed_repository_names = [repository["name"] for repository, succeeded
+                                   in zip(non_compliant_repositories, remediated) if not succeeded]
+        if failed_repository_names:
+            raise ValueError(
+                f"Could not set standards on {', '.join(failed_repository_names)}")
+        return [repository["name"] for repository in non_compliant_repositories]
+
+    @classmethod
+    def is_standards_compliant(cls, repository: dict[str, Any]) -> bool:
+        """Checks whether a repository node from get_repositories_with_topic has the settings set_standards writes."""
+        return bool(repository["hasIssuesEnabled"]) and cls.__has_standard_branch_protection(repository)
+
+    @staticmethod
+    def __has_standard_branch_protection(repository: dict[str, Any]) -> bool:
+        for rule in (repository.get("branchProtectionRules") or {}).get("edges") or []:
+            if rule and rule["node"]["pattern"] == "main":
+                return bool(rule["node"]["isAdminEnforced"]
+                            and rule["node"]["requiresApprovingReviews"]
+                            and (rule["node"]["requiredApprovingReviewCount"] or 0) >= 1
+                            and rule["node"]["dismissesStaleReviews"])
+        return False
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def get_paginated_list_of_repositories_per_topic(self, topic: str, after_cursor: str | None,
-                                                     page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+                                                     page_size: int = GITHUB_GQL_DEFAULT_PAGE_SIZE,
+                                                     fields: list[str] | None = None) -> dict[str, Any]:
         """
         Fetches a paginated list of repositories associated with a given GitHub topic/
 
@@ -675,6 +927,8 @@ class GithubService:
         - after_cursor (str | None): The pagination cursor to fetch results after a certain point. If None, fetches from the beginning.
         - page_size (int, optional): The number of repository results to return per page. Defaults to GITHUB_GQL_DEFAULT_PAGE_SIZE.
             Note that there's an upper limit, GITHUB_GQL_MAX_PAGE_SIZE, beyond which an exception will be raised.
+        - fields (list[str] | None, optional): The response paths, such as "search.repos.repo.name", to trim the query to.
+            Defaults to every field.
 
         Returns:
         - dict[str, Any]: A dictionary containing the repository data and pagination information.
@@ -693,61 +947,88 @@ class GithubService:
             raise ValueError(
                 f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
         the_query = f"org:{self.organisation_name}, archived:false, topic:{topic}"
-        query = gql("""
-            query($page_size: Int!, $after_cursor: String, $the_query: String!) {
-                search(
-                    type: REPOSITORY
-                    query: $the_query
-                    first: $page_size
-                    after: $after_cursor
-                ) {
-                repos: edges {
-                    repo: node {
-                        ... on Repository {
-                                name
-                                isDisabled
-                                isLocked
-                                hasIssuesEnabled
-                                repositoryTopics(first: 10) {
-                                    edges {
-                                        node {
-                                            topic {
-                                                name
-                                            }
-                                        }
-                                    }
-                                }
-                                collaborators(affiliation: DIRECT) {
-                                    totalCount
-                                }
-                            }
-                        }
-                    }
-                    pageInfo {
-                        hasNextPage
-                        endCursor
-                    }
-                }
-            }
-        """)
+        query = self.GRAPHQL_DOCUMENTS.get("repositories_per_topic", fields)
         variable_values = {"the_query": the_query, "page_size": page_size,
                            "after_cursor": after_cursor}
         return self.github_client_gql_api.execute(query, variable_values)
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def get_user_org_email_address(self, user_name) -> str | None:
-        data = self.github_client_gql_api.execute(gql("""
-            query($organisation_name: String!, $user_name: String!) {
-                user(login: $user_name) {
-                    organizationVerifiedDomainEmails(login: $organisation_name)
-                }
-            }
-        """), variable_values={"organisation_name": self.organisation_name, "user_name": user_name})
+        data = self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["user_org_email_address"],
+            variable_values={"organisation_name": self.organisation_name, "user_name": user_name})
 
         if data["user"]["organizationVerifiedDomainEmails"]:
             return data["user"]["organizationVerifiedDomainEmails"][0]
         return None
 
+    @retries_github_rate_limit_exception_at_next_reset_once
+    def get_user_org_email_addresses(self, user_names: list[str], users_per_query: int = GITHUB_GQL_USERS_PER_QUERY,
+                                     max_in_flight_queries: int = GITHUB_GQL_DEFAULT_MAX_IN_FLIGHT_QUERIES) -> dict[str, str | None]:
+        """Bulk version of get_user_org_email_address. Packs up to users_per_query aliased user lookups into
+        each GraphQL query and runs the queries concurrently.
+
+        Args:
+            user_names (list[str]): The logins to look up, duplicates are only looked up once.
+            users_per_query (int): The number of aliased user selections in each query.
+            max_in_flight_queries (int): The maximum number of queries sent at once.
+
+        Returns:
+            dict[str, str | None]: A map of login to organisation verified email address, or None when the
+                user has no verified email address or could not be resolved.
+        """
+        unique_user_names = list(dict.fromkeys(user_names))
+        logging.info(
+            f"Getting organisation email addresses for {len(unique_user_names)} users, {users_per_query} users per query")
+        chunks = [unique_user_names[index:index + users_per_query]
+                  for index in range(0, len(unique_user_names), users_per_query)]
+        email_addresses = {}
+        if chunks:
+            for chunk_email_addresses in asyncio.run(
+                    self.__get_user_org_email_addresses_async(chunks, max_in_flight_queries)):
+                email_addresses.update(chunk_email_addresses)
+        return email_addresses
+
+    async def __get_user_org_email_addresses_async(self, chunks: list[list[str]],
+                                                   max_in_flight_queries: int) -> list[dict[str, str | None]]:
+        in_flight_queries = asyncio.Semaphore(max_in_flight_queries)
+        async with self.github_client_gql_api as session:
+            return await asyncio.gather(*[
+                self.__get_chunk_of_user_org_email_addresses_async(
+                    session, chunk, in_flight_queries)
+                for chunk in chunks
+            ])
+
+    async def __get_chunk_of_user_org_email_addresses_async(self, session: AsyncClientSession, user_names: list[str],
+                                                            in_flight_queries: asyncio.Semaphore) -> dict[str, str | None]:
+        variable_definitions = "".join(
+            f", $user_{index}: String!" for index in range(len(user_names)))
+        selections = "".join(
+            f"user_{index}: user(login: $user_{index}) {{ organizationVerifiedDomainEmails(login: $organisation_name) }}\n"
+            for index in range(len(user_names)))
+        query = self.GRAPHQL_DOCUMENTS.get_for_source(
+            f"query($organisation_name: String!{variable_definitions}) {{\n{selections}}}")
+        variable_values = {"organisation_name": self.organisation_name} | {
+            f"user_{index}": user_name for index, user_name in enumerate(user_names)}
+
+        async with in_flight_queries:
+            try:
+                data = await session.execute(query, variable_values=variable_values)
+            except TransportQueryError as exception:
+                # Logins that no longer resolve to a user error individually but still return data for the rest
+                if not exception.data:
+                    raise
+                logging.warning(
+                    f"Some users could not be resolved: {exception.errors}")
+                data = exception.data
+
+        email_addresses = {}
+        for index, user_name in enumerate(user_names):
+            user = data.get(f"user_{index}")
+            email_addresses[user_name] = user["organizationVerifiedDomainEmails"][0] \
+                if user and user["organizationVerifiedDomainEmails"] else None
+        return email_addresses
+
     @retries_github_rate_limit_exception_at_next_reset_once
     def get_org_members_login_names(self) -> list[str]:
         logging.info("Getting Org Members Login Names")
@@ -775,9 +1056,15 @@ class GithubService:
         return 0
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def get_audit_log_active_users(self, users: list) -> list:
+    def get_audit_log_active_users(self, users: list, use_activity_index: bool = False) -> list:
         three_months_ago_date = datetime.now() - relativedelta(months=3)
 
+        if use_activity_index:
+            last_active_dates = self.get_audit_log_last_active_dates(
+                three_months_ago_date)
+            return [user["username"].lower() for user in users
+                    if user["username"].lower() in last_active_dates]
+
         active_users = []
         for user in users:
             audit_log_data = self._get_user_from_audit_log(
@@ -790,6 +1077,49 @@ class GithubService:
                     active_users.append(user["username"].lower())
         return active_users
 
+    def get_audit_log_last_active_dates(self, since_date: datetime, enterprise: bool = False) -> dict[str, datetime]:
+        """
+        Pages the organisation or enterprise audit log once from a date, keeping the latest event of each actor, so
+        dormancy checks of many users read from one scan instead of making one audit log query per user. The scan is
+        kept on the service and reused by later calls for the same or a later date.
+
+            :param since_date: The date to scan the audit log from.
+            :type since_date: datetime
+            :param enterprise: Scan the enterprise audit log rather than the organisation audit log.
+            :type enterprise: bool
+            :return: The date of the latest audit log event of each lower case actor login active since since_date.
+            :rtype: dict[str, datetime]
+        """
+        audit_log_url = f"https://api.github.com/enterprises/{self.enterprise_name}/audit-log" if enterprise \
+            else f"https://api.github.com/orgs/{self.organisation_name}/audit-log"
+        scanned_since_date, last_active_dates = self.__audit_log_last_active_dates.get(
+            audit_log_url, (None, {}))
+        if scanned_since_date is not None and scanned_since_date <= since_date:
+            return {actor: last_active_date for actor, last_active_date in last_active_dates.items()
+                    if last_active_date >= since_date}
+
+        logging.info(
+            f"Scanning audit log {audit_log_url} since {since_date.date()}")
+        last_active_dates = {}
+        url = f"{audit_log_url}?phrase=created%3A%3E%3D{since_date.date().isoformat()}&per_page=100"
+        while url:
+            response = self.github_client_rest_api.get(url, timeout=30)
+            if response.status_code != 200:
+                raise ValueError(
+                    f"Failed to scan audit log {audit_log_url}. Response status code: {response.status_code}")
+            for event in json.loads(response.content.decode("utf-8")):
+                actor = (event.get("actor") or "").lower()
+                last_active_date = datetime.fromtimestamp(
+                    event["@timestamp"] / 1000.0)
+                if actor and (actor not in last_active_dates or last_active_dates[actor] < last_active_date):
+                    last_active_dates[actor] = last_active_date
+            url = response.links.get("next", {}).get("url")
+
+        self.__audit_log_last_active_dates[audit_log_url] = (
+            since_date, last_active_dates)
+        return {actor: last_active_date for actor, last_active_date in last_active_dates.items()
+                if last_active_date >= since_date}
+
     def get_last_audit_log_activity_date_for_user(self, username: str) -> datetime | None:
         audit_activity = self.enterprise_audit_activity_for_user(username)
         if audit_activity:
@@ -797,22 +1127,31 @@ class GithubService:
         return None
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def check_dormant_users_audit_activity_since_date(self, users: list, since_date: datetime) -> list:
+    def check_dormant_users_audit_activity_since_date(self, users: list, since_date: datetime,
+                                                      use_activity_index: bool = False) -> list:
+        if use_activity_index:
+            last_active_dates = self.get_audit_log_last_active_dates(
+                since_date, enterprise=True)
+            return [user for user in users
+                    if self.__is_dormant_since_date(user, last_active_dates.get(user.lower()), since_date)]
         return [user for user in users if self.is_user_dormant_since_date(user, since_date)]
 
     def is_user_dormant_since_date(self, user: str, since_date: datetime) -> bool:
         audit_activity = self.enterprise_audit_activity_for_user(user)
-        if audit_activity:
-            last_active_date = datetime.fromtimestamp(
-                audit_activity[0]["@timestamp"] / 1000.0)
-            if last_active_date < since_date:
-                logging.info(
-                    f"User {user} last active date: {last_active_date}, adding to dormant users list")
-                return True
-        else:
+        last_active_date = datetime.fromtimestamp(
+            audit_activity[0]["@timestamp"] / 1000.0) if audit_activity else None
+        return self.__is_dormant_since_date(user, last_active_date, since_date)
+
+    @staticmethod
+    def __is_dormant_since_date(user: str, last_active_date: datetime | None, since_date: datetime) -> bool:
+        if last_active_date is None:
             logging.info(
                 f"User {user} has no audit activity, adding to dormant users list")
             return True
+        if last_active_date < since_date:
+            logging.info(
+                f"User {user} last active date: {last_active_date}, adding to dormant users list")
+            return True
         return False
 
     @retries_github_rate_limit_exception_at_next_reset_once
@@ -859,9 +1198,15 @@ class GithubService:
 
     def _identify_inactive_users(self, users: list[NamedUser.NamedUser], repositories: list[Repository],
                                  inactivity_months: int) -> list[NamedUser.NamedUser]:
+        cutoff_date = self.__get_inactivity_cutoff_date(inactivity_months)
+        repository_names = [repository.name for repository in repositories]
+        activity_index = self.get_commit_activity_index(
+            repository_names, cutoff_date)
+        email_addresses = self.__get_commit_author_email_addresses(users)
         users_to_remove = []
         for user in users:
-            if self._is_user_inactive(user, repositories, inactivity_months):
+            emails = [email_addresses[user.login]] if email_addresses.get(user.login) else []
+            if self._is_user_inactive(user, repository_names, activity_index, inactivity_months, emails):
                 logging.info(
                     f"User {user.login} is inactive for {inactivity_months} months")
                 users_to_remove.append(user)
@@ -877,33 +1222,101 @@ class GithubService:
         repositories = self.__get_repositories_from_team(team_id)
         return [repo for repo in repositories if repo.name.lower() not in repositories_to_ignore]
 
-    def _is_user_inactive(self, user: NamedUser.NamedUser, repositories: list[Repository],
-                          inactivity_months: int) -> bool:
-        cutoff_date = datetime.now() - timedelta(days=inactivity_months *
-                                                 30)  # Roughly calculate the cutoff date
+    @staticmethod
+    def __get_inactivity_cutoff_date(inactivity_months: int) -> datetime:
+        # Roughly calculate the cutoff date, in UTC to match the commit dates in the activity index
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=inactivity_months * 30)
 
-        for repo in repositories:
-            # Get the user's commits in the repo
-            try:
-                commits = repo.get_commits(author=user)
-            except Exception:
-                logging.error(
-                    f"An exception occurred while getting commits for user {user.login} in repo {repo.name}")
+    def __get_commit_author_email_addresses(self, users: list[NamedUser.NamedUser]) -> dict[str, str | None]:
+        # Commits made without a linked GitHub account are only attributable by the author email
+        if not users:
+            return {}
+        try:
+            return self.get_user_org_email_addresses([user.login for user in users])
+        except Exception:
+            logging.error(
+                "An exception occurred while getting organisation email addresses, matching commits by login only")
+            return {}
+
+    def _is_user_inactive(self, user: NamedUser.NamedUser, repository_names: list[str],
+                          activity_index: CommitActivityIndex, inactivity_months: int,
+                          emails: list[str] | None = None) -> bool:
+        last_commit_date = activity_index.last_commit_date(
+            repository_names, user.login, emails)
+        return last_commit_date is None or last_commit_date <= self.__get_inactivity_cutoff_date(inactivity_months)
+
+    def get_commit_activity_index(self, repository_names: list[str], since: datetime) -> CommitActivityIndex:
+        """
+        Extends the commit activity index with the default branch history since a date of each repository that
+        it does not already cover, and returns it. The index is kept on the service, so later calls for the same
+        repositories with the same or a later date, such as a shorter inactivity period, make no requests.
+
+            :param repository_names: The names of the repositories in the organisation to index.
+            :type repository_names: list[str]
+            :param since: The naive UTC date to index commits from.
+            :type since: datetime
+            :return: The commit activity index of the service.
+            :rtype: CommitActivityIndex
+        """
+        for repository_name in repository_names:
+            if self.commit_activity_index.covers(repository_name, since):
                 continue
-
-            # Check if any commit is later than the cutoff date
+            logging.info(
+                f"Indexing commits to {repository_name} since {since.date()}")
+            # Drop commits from an earlier, shorter window so they are not counted twice
+            self.commit_activity_index.last_commit_dates.pop(
+                repository_name, None)
             try:
-                for commit in commits:
-                    if commit.commit.author.date > cutoff_date:
-                        return False  # User has been active in this repo, so not considered inactive
+                for author in self.__get_default_branch_commit_authors(repository_name, since):
+                    self.commit_activity_index.add_commit(
+                        repository_name, author)
             except Exception:
                 logging.error(
-                    f"An exception occurred while getting commit date for user {user.login} in repo {repo.name}")
+                    f"An exception occurred while getting commits for repo {repository_name}")
                 continue
+            self.commit_activity_index.repositories_since[repository_name] = since
+        return self.commit_activity_index
 
-        return True  # User is inactive in all given repositories
+    def __get_default_branch_commit_authors(self, repository_name: str, since: datetime) -> list[dict[str, Any]]:
+        authors = []
+        has_next_page = True
+        after_cursor = None
+        while has_next_page:
+            data = self.get_paginated_list_of_default_branch_commit_authors(
+                repository_name, since, after_cursor)
+            default_branch = (data["repository"] or {}).get(
+                "defaultBranchRef") or {}
+            history = (default_branch.get("target") or {}).get("history")
+            if history is None:
+                break
+            authors.extend(commit["author"] for commit in history["nodes"])
+            has_next_page = history["pageInfo"]["hasNextPage"]
+            after_cursor = history["pageInfo"]["endCursor"]
+        return authors
+
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def get_paginated_list_of_default_branch_commit_authors(
+        self,
+        repository_name: str,
+        since: datetime,
+        after_cursor: str | None,
+        page_size: int = GITHUB_GQL_MAX_PAGE_SIZE,
+    ) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of default branch commit authors for {repository_name}. Page size {page_size}, after cursor {bool(after_cursor)}"
+        )
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["default_branch_commit_authors"],
+            variable_values={"organisation_name": self.organisation_name, "repository_name": repository_name,
+                             "since": since.strftime("%Y-%m-%dT%H:%M:%SZ"), "page_size": page_size,
+                             "after_cursor": after_cursor})
 
     @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
     def _get_paginated_organization_members_with_emails(self, after_cursor: str | None,
                                                         page_size: int = GITHUB_GQL_MAX_PAGE_SIZE) -> dict[str, Any]:
         logging.info(
@@ -913,22 +1326,7 @@ class GithubService:
             raise ValueError(
                 f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
 
-        query = gql("""
-            query($org: String!, $page_size: Int!, $after_cursor: String) {
-                organization(login: $org) {
-                    membersWithRole(first: $page_size, after: $after_cursor) {
-                        nodes {
-                            login
-                            organizationVerifiedDomainEmails(login: $org)
-                        }
-                        pageInfo {
-                            hasNextPage
-                            endCursor
-                        }
-                    }
-                }
-            }
-        """)
+        query = self.GRAPHQL_DOCUMENTS["organization_members_with_emails"]
 
         variable_values = {
             "org": self.organisation_name,
@@ -983,8 +1381,29 @@ class GithubService:
             self.enterprise_name).get_consumed_licenses()
         return licence.total_seats_purchased - licence.total_seats_consumed
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def update_team_repository_permission(self, team_name: str, repositories, permission: str):
+    def update_team_repository_permission(self, team_name: str, repositories: list[str | dict[str, str]], permission: str,
+                                          journal_path: str | None = None,
+                                          max_concurrent_writes: int = GITHUB_DEFAULT_MAX_CONCURRENT_WRITES) -> dict[str, str]:
+        """Sets the permission of a team on a list of repositories, writing only the permissions that differ.
+
+        The team's current repository permissions are read in one paged GraphQL query, and the repositories that
+        need a change are updated up to max_concurrent_writes at a time. A repository that cannot be updated does
+        not stop the others; a ValueError naming every such repository is raised once the rest are done.
+
+        When a journal file is given, the result for each repository is appended to it as a JSON line, and the
+        repositories already journalled as updated or unchanged for the same team and permission are skipped, so
+        an interrupted run can be resumed.
+
+        Args:
+            team_name (str): The slug of the team.
+            repositories (list[str | dict[str, str]]): The repository names, or objects with a name.
+            permission (str): The permission to set, e.g. read, write, maintain or admin.
+            journal_path (str | None): The JSON lines file the results are journalled in.
+            max_concurrent_writes (int): The number of permissions set at the same time.
+
+        Returns:
+            dict[str, str]: The result for each repository: updated, unchanged, skipped, not_found or failed.
+        """
         org = self.github_client_core_api.get_organization(
             self.organisation_name)
 
@@ -994,21 +1413,127 @@ class GithubService:
             raise ValueError(
                 f"Team '{team_name}' does not exist in organization '{self.organisation_name}'") from exc
 
-        for repo_name in repositories:
-            try:
-                repo = org.get_repo(repo_name)
-            except UnknownObjectException as exc:
-                raise ValueError(
-                    f"Repository '{repo_name}' does not exist in organization '{self.organisation_name}'") from exc
+        repo_names = list(dict.fromkeys(
+            repo["name"] if isinstance(repo, dict) else repo for repo in repositories))
+        journalled_repo_names = self.__read_permission_journal(
+            journal_path, team_name, permission) if journal_path else set()
+        current_permissions = self.get_team_repository_permissions(team_name)
+        wanted_permission = self.REPOSITORY_PERMISSIONS.get(
+            permission.lower())
+
+        results = {}
+        journal_lock = threading.Lock()
+
+        def record(repo_name: str, result: str) -> None:
+            results[repo_name] = result
+            if journal_path:
+                with journal_lock, open(journal_path, "a", encoding="utf-8") as journal_file:
+                    journal_file.write(json.dumps(
+                        {"team": team_name, "repository": repo_name, "permission": permission, "result": result}) + "\n")
+
+        repo_names_to_update = []
+        for repo_name in repo_names:
+            if repo_name in journalled_repo_names:
+                results[repo_name] = "skipped"
+            elif wanted_permission and current_permissions.get(repo_name) == wanted_permission:
+                record(repo_name, "unchanged")
+            else:
+                repo_names_to_update.append(repo_name)
+        logging.info(
+            f"Updating {team_name} team's permission to {permission} on {len(repo_names_to_update)} of {len(repo_names)} repositories")
 
-            logging.info(
-                f"Updating {team_name} team's permission to {permission} on {repo_name}")
-            team.set_repo_permission(repo, permission)
+        with ThreadPoolExecutor(max_workers=max_concurrent_writes) as executor:
+            for repo_name, result in zip(repo_names_to_update, executor.map(
+                    lambda repo_name: self.__set_team_repository_permission(team, repo_name, permission), repo_names_to_update)):
+                record(repo_name, result)
+
+        unsuccessful_repo_names = [repo_name for repo_name in repo_names
+                                   if results[repo_name] in ("not_found", "failed")]
+        if unsuccessful_repo_names:
+            raise ValueError(
+                f"Could not update {team_name} team's permission on {', '.join(unsuccessful_repo_names)} in organization '{self.organisation_name}'")
+        return {repo_name: results[repo_name] for repo_name in repo_names}
+
+    @retries_github_rate_limit_exception_at_next_reset_once
+    def __set_team_repository_permission(self, team: Team, repo_name: str, permission: str) -> str:
+        logging.info(
+            f"Updating {team.slug} team's permission to {permission} on {repo_name}")
+        # Team.update_team_repository only reports whether the PUT returned 204, so the PUT is sent through the
+        # team's requester to tell a missing repository from other failures. Naming the repository sends only the PUT.
+        status, headers, body = team._requester.requestJson(  # pylint: disable=W0212
+            "PUT", f"{team.organization.url}/teams/{team.slug}/repos/{self.organisation_name}/{quote(repo_name)}",
+            input={"permission": permission})
+        if status == 404:
+            logging.error(
+                f"Repository '{repo_name}' does not exist in organization '{self.organisation_name}'")
+            return "not_found"
+        if not 200 <= status < 300:
+            exception = Requester.createException(
+                status, headers, self.__parse_error_body(body))
+            if isinstance(exception, RateLimitExceededException):
+                raise exception
+            logging.error(
+                f"Failed to update {team.slug} team's permission on {repo_name}: {exception}")
+            return "failed"
+        return "updated"
+
+    @staticmethod
+    def __parse_error_body(body: str | None) -> dict[str, Any]:
+        try:
+            return json.loads(body) if body else {}
+        except ValueError:
+            return {"message": body}
+
+    @staticmethod
+    def __read_permission_journal(journal_path: str, team_name: str, permission: str) -> set[str]:
+        try:
+            with open(journal_path, encoding="utf-8") as journal_file:
+                entries = [json.loads(line) for line in journal_file if line.strip()]
+        except FileNotFoundError:
+            return set()
+        return {entry["repository"] for entry in entries
+                if entry["team"] == team_name and entry["permission"] == permission
+                and entry["result"] in ("updated", "unchanged")}
+
+    def get_team_repository_permissions(self, team_name: str) -> dict[str, str]:
+        """Gets the permission of a team on each of its repositories, e.g. {"repo1": "WRITE"}."""
+        permissions = {}
+        after_cursor = None
+        has_next_page = True
+        while has_next_page:
+            data = self.get_paginated_list_of_team_repository_permissions(
+                team_name, after_cursor)
+            if data["organization"]["team"] is None:
+                raise ValueError(
+                    f"Team '{team_name}' does not exist in organization '{self.organisation_name}'")
+            repositories = data["organization"]["team"]["repositories"]
+            for edge in repositories["edges"] or []:
+                permissions[edge["node"]["name"]] = edge["permission"]
+            has_next_page = repositories["pageInfo"]["hasNextPage"]
+            after_cursor = repositories["pageInfo"]["endCursor"]
+        return permissions
 
-    def flag_owner_permission_changes(self, since_date: str) -> list:
-        recent_changes = self.audit_log_member_changes(since_date)
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def get_paginated_list_of_team_repository_permissions(self, team_name: str, after_cursor: str | None,
+                                                          page_size: int = GITHUB_GQL_MAX_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of team repository permissions. Page size {page_size}, after cursor {bool(after_cursor)}")
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["team_repository_permissions"],
+            variable_values={
+                "organisation_name": self.organisation_name,
+                "team_name": team_name,
+                "page_size": page_size,
+                "after_cursor": after_cursor
+            })
+
+    def flag_owner_permission_changes(self, since_date: str, checkpoint_path: str | None = None) -> list:
         list_of_changes_to_flag = []
-        for change in recent_changes:
+        for change in self.iterate_audit_log_entries(self.AUDIT_LOG_MEMBER_CHANGE_ACTIONS, since_date, checkpoint_path):
             match change["action"]:
                 case "org.add_member" if change["permission"] == "ADMIN":
                     list_of_changes_to_flag.append(change)
@@ -1020,117 +1545,103 @@ class GithubService:
 
         return list_of_changes_to_flag
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def audit_log_member_changes(self, since_date: str) -> list:
-        logging.info(f"Getting audit log entries since {since_date}")
-        today = datetime.now()
-        query = """
-            query($organisation_name: String!, $since_date: String!, $cursor: String) {
-                organization(login: $organisation_name) {
-                    auditLog(
-                        first: 100
-                        after: $cursor
-                        query: $since_date
-                    ) {
-                        edges{
-                            node{
-                                ... on OrgAddMemberAuditEntry {
-                                    action
-                                    createdAt
-                                    actorLogin
-                                    operationType
-                                    permission
-                                    userLogin
-                                }
-                                ... on OrgUpdateMemberAuditEntry {
-                                    action
-                                    createdAt
-                                    actorLogin
-                                    operationType
-                                    permission
-                                    permissionWas
-                                    userLogin
-                                }
-                            }
-                        }
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                    }
-                }
-            }
-        """
-        variable_values = {
-            "organisation_name": self.organisation_name,
-            "since_date": f"action:org.add_member  action:org.update_member  created:{since_date}..{today.strftime('%Y-%m-%d')}",
-            "cursor": None
-        }
+    def audit_log_member_changes(self, since_date: str, checkpoint_path: str | None = None) -> list:
+        return list(self.iterate_audit_log_entries(self.AUDIT_LOG_MEMBER_CHANGE_ACTIONS, since_date, checkpoint_path))
 
-        all_entries = []
-        while True:
-            data = self.github_client_gql_api.execute(
-                gql(query), variable_values=variable_values)
-            all_entries.extend(
-                [entry["node"] for entry in data["organization"]["auditLog"]["edges"] if entry["node"]])
+    def check_for_audit_log_new_members(self, since_date: str, checkpoint_path: str | None = None) -> list:
+        return list(self.iterate_audit_log_entries(["org.add_member"], since_date, checkpoint_path))
 
-            if data["organization"]["auditLog"]["pageInfo"]["hasNextPage"]:
-                variable_values["cursor"] = data["organization"]["auditLog"]["pageInfo"]["endCursor"]
-            else:
-                break
+    def iterate_audit_log_entries(self, actions: list[str], since_date: str,
+                                  checkpoint_path: str | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Yields the organisation audit log member entries with the given actions page by page, newest first, so
+        callers can filter them in a single scan without holding the whole log in memory.
+
+        When a checkpoint file is given, the createdAt of the newest entry read is held once the scan completes.
+        It is saved by commit_audit_log_checkpoints, which the caller runs once it has acted on the entries, and
+        the next scan for the same actions then reads only the entries created after it.
+
+            :param actions: The audit log actions to read, such as org.add_member.
+            :type actions: list[str]
+            :param since_date: The date, in YYYY-MM-DD format, to read entries from when there is no newer checkpoint.
+            :type since_date: str
+            :param checkpoint_path: The JSON file the newest createdAt is kept in between runs.
+            :type checkpoint_path: str | None
+            :return: The OrgAddMemberAuditEntry and OrgUpdateMemberAuditEntry nodes.
+            :rtype: Iterator[dict[str, Any]]
+        """
+        checkpoint_key = f"{self.organisation_name} {' '.join(sorted(actions))}"
+        checkpoints = self.__read_audit_log_checkpoints(
+            checkpoint_path) if checkpoint_path else {}
+        checkpoint = checkpoints.get(checkpoint_key)
 
-        return all_entries
+        if checkpoint and checkpoint > since_date:
+            logging.info(
+                f"Getting audit log {' '.join(actions)} entries created after checkpoint {checkpoint}")
+            # The search qualifier has second precision, so entries at the checkpoint itself are skipped below
+            created_filter = f"created:>={checkpoint[:19]}"
+        else:
+            logging.info(
+                f"Getting audit log {' '.join(actions)} entries since {since_date}")
+            checkpoint = None
+            created_filter = f"created:>={since_date}"
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def check_for_audit_log_new_members(self, since_date: str) -> list:
-        logging.info(
-            f"Getting audit log entries for new members since {since_date}")
-        today = datetime.now()
-        query = """
-            query($organisation_name: String!, $since_date: String!, $cursor: String) {
-                organization(login: $organisation_name) {
-                    auditLog(
-                        first: 100
-                        after: $cursor
-                        query: $since_date
-                    ) {
-                        edges{
-                            node{
-                                ... on OrgAddMemberAuditEntry {
-                                    action
-                                    createdAt
-                                    actorLogin
-                                    userLogin
-                                }
-                            }
-                        }
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                    }
-                }
-            }
-        """
         variable_values = {
             "organisation_name": self.organisation_name,
-            "since_date": f"action:org.add_member created:{since_date}..{today.strftime('%Y-%m-%d')}",
+            "audit_log_query": " ".join([f"action:{action}" for action in actions] + [created_filter]),
             "cursor": None
         }
-
-        new_members = []
+        newest_created_at = checkpoint
         while True:
-            data = self.github_client_gql_api.execute(
-                gql(query), variable_values=variable_values)
-            new_members.extend(
-                [entry["node"] for entry in data["organization"]["auditLog"]["edges"] if entry["node"]])
-
-            if data["organization"]["auditLog"]["pageInfo"]["hasNextPage"]:
-                variable_values["cursor"] = data["organization"]["auditLog"]["pageInfo"]["endCursor"]
-            else:
+            data = self.__get_paginated_audit_log_entries(variable_values)
+            for edge in data["organization"]["auditLog"]["edges"]:
+                entry = edge["node"]
+                if not entry or (checkpoint and entry["createdAt"] <= checkpoint):
+                    continue
+                newest_created_at = max(
+                    newest_created_at or entry["createdAt"], entry["createdAt"])
+                yield entry
+
+            if not data["organization"]["auditLog"]["pageInfo"]["hasNextPage"]:
                 break
+            variable_values["cursor"] = data["organization"]["auditLog"]["pageInfo"]["endCursor"]
+
+        if checkpoint_path and newest_created_at:
+            self.__pending_audit_log_checkpoints.setdefault(
+                checkpoint_path, {})[checkpoint_key] = newest_created_at
+
+    def commit_audit_log_checkpoints(self) -> None:
+        """Saves the checkpoints of the audit log scans completed since the last commit, so that the entries they
+        read are not read again. Callers run this only after the entries have been acted on, such as alerted on."""
+        for checkpoint_path, pending_checkpoints in self.__pending_audit_log_checkpoints.items():
+            checkpoints = self.__read_audit_log_checkpoints(checkpoint_path)
+            checkpoints.update(pending_checkpoints)
+            self.__write_audit_log_checkpoints(checkpoint_path, checkpoints)
+        self.__pending_audit_log_checkpoints.clear()
+
+    @staticmethod
+    def __read_audit_log_checkpoints(checkpoint_path: str) -> dict[str, str]:
+        try:
+            with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def __write_audit_log_checkpoints(checkpoint_path: str, checkpoints: dict[str, str]) -> None:
+        with open(checkpoint_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoints, checkpoint_file)
 
-        return new_members
+    @retries_github_rate_limit_exception_at_next_reset_once
+    @adapts_graphql_page_size
+    def __get_paginated_audit_log_entries(self, variable_values: dict[str, Any],
+                                          page_size: int = GITHUB_GQL_MAX_PAGE_SIZE) -> dict[str, Any]:
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return self.github_client_gql_api.execute(
+            self.GRAPHQL_DOCUMENTS["audit_log_member_entries"],
+            variable_values={**variable_values, "page_size": page_size})
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def get_all_organisations_in_enterprise(self) -> list[Organization]:
@@ -1168,11 +1679,35 @@ class GithubService:
         self.github_client_rest_api.patch(
             "https://api.github.com/repos/ministryofjustice/operations-engineering/actions/variables/GHA_MINUTES_QUOTA_THRESHOLD", json.dumps(payload), headers=headers)
 
+        if self.__repository_variables is not None:
+            self.__repository_variables["GHA_MINUTES_QUOTA_THRESHOLD"] = str(new_threshold)
+
     @retries_github_rate_limit_exception_at_next_reset_once
+    def get_repository_variables(self) -> dict[str, str]:
+        """Returns the Actions variables of the operations-engineering repository by name. They are listed once,
+        a page of GITHUB_REST_MAX_VARIABLES_PAGE_SIZE at a time, and reused for the rest of the run."""
+        if self.__repository_variables is None:
+            logging.info(
+                f"Getting the Actions variables of {self.organisation_name}/operations-engineering")
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28"
+            }
+            variables = {}
+            url = f"https://api.github.com/repos/{self.organisation_name}/operations-engineering/actions/variables?per_page={self.GITHUB_REST_MAX_VARIABLES_PAGE_SIZE}"
+            while url:
+                response = self.github_client_rest_api.get(url, headers=headers, timeout=30)
+                if response.status_code != 200:
+                    raise ValueError(
+                        f"Failed to get the Actions variables of {self.organisation_name}/operations-engineering. Response status code: {response.status_code}")
+                variables.update({variable["name"]: variable["value"]
+                                  for variable in response.json()["variables"]})
+                url = response.links.get("next", {}).get("url")
+            self.__repository_variables = variables
+        return self.__repository_variables
+
     def _get_repository_variable(self, variable_name):
-        actions_variable = self.github_client_core_api.get_repo(
-            f'{self.organisation_name}/operations-engineering').get_variable(variable_name)
-        return actions_variable.value
+        return self.get_repository_variables()[variable_name]
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def reset_alerting_threshold_if_first_day_of_month(self):
@@ -1182,15 +1717,15 @@ class GithubService:
             self.modify_gha_minutes_quota_threshold(base_alerting_threshold)
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def calculate_total_minutes_used(self, organisations):
-        total = 0
-
-        for org in organisations:
-            billing_data = self.get_gha_minutes_used_for_organisation(org)
-            minutes_used = billing_data["total_minutes_used"]
-            total += minutes_used
+    def calculate_total_minutes_used(self, organisations,
+                                     max_concurrent_reads: int = GITHUB_DEFAULT_MAX_CONCURRENT_READS):
+        """Sums the Actions minutes used by each organisation, fetching the billing of up to max_concurrent_reads
+        organisations at a time."""
+        with ThreadPoolExecutor(max_workers=max_concurrent_reads) as executor:
+            billing_data = list(executor.map(
+                self.get_gha_minutes_used_for_organisation, organisations))
 
-        return total
+        return sum(billing["total_minutes_used"] for billing in billing_data)
 
     @retries_github_rate_limit_exception_at_next_reset_once
     def check_if_gha_minutes_quota_is_low(self):
@@ -1234,32 +1769,112 @@ class GithubService:
         return []
 
     @retries_github_rate_limit_exception_at_next_reset_once
-    def get_all_enterprise_members(self) -> list:
-        all_users = []
+    def get_all_enterprise_members(self, max_in_flight_queries: int = GITHUB_GQL_DEFAULT_MAX_IN_FLIGHT_QUERIES) -> list[str]:
+        """Gets the logins of every member of the organisations in the enterprise, each listed once.
+
+        Args:
+            max_in_flight_queries (int): The maximum number of queries sent at once.
+
+        Returns:
+            list[str]: The member logins, sorted.
+        """
+        return sorted(self.get_enterprise_member_organisations(max_in_flight_queries))
 
-        for org in self.organisations_in_enterprise:
-            all_users = all_users + [user.login for user in self.github_client_core_api.get_organization(org).get_members() if user.login not in all_users]
+    def get_enterprise_member_organisations(self,
+                                            max_in_flight_queries: int = GITHUB_GQL_DEFAULT_MAX_IN_FLIGHT_QUERIES) -> dict[str, list[str]]:
+        """Maps the login of every member of the organisations in the enterprise to the organisations they belong to.
 
-        return all_users
+        The membersWithRole of each organisation are paged over a single asynchronous GraphQL session, with the
+        organisations fetched concurrently and up to max_in_flight_queries pages requested at once.
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def calculate_repo_age(self, repo: str) -> list:
-        creation_date = self.github_client_core_api.get_repo(f"{self.organisation_name}/{repo}").created_at
+        Args:
+            max_in_flight_queries (int): The maximum number of queries sent at once.
 
-        age_in_days = (datetime.now(timezone.utc) - creation_date).days
+        Returns:
+            dict[str, list[str]]: The organisations of each member login.
+        """
+        logging.info(
+            f"Getting all members of the enterprise organisations {self.organisations_in_enterprise}")
+        member_logins_per_organisation = asyncio.run(
+            self.__get_enterprise_member_logins_async(max_in_flight_queries))
+
+        member_organisations = defaultdict(list)
+        for organisation, member_logins in zip(self.organisations_in_enterprise, member_logins_per_organisation):
+            for login in member_logins:
+                member_organisations[login].append(organisation)
+        return dict(member_organisations)
+
+    async def __get_enterprise_member_logins_async(self, max_in_flight_queries: int) -> list[set[str]]:
+        in_flight_queries = asyncio.Semaphore(max_in_flight_queries)
+        async with self.github_client_gql_api as session:
+            return await asyncio.gather(*[
+                self.__get_organisation_member_logins_async(
+                    session, organisation, in_flight_queries)
+                for organisation in self.organisations_in_enterprise
+            ])
+
+    async def __get_organisation_member_logins_async(self, session: AsyncClientSession, organisation: str,
+                                                     in_flight_queries: asyncio.Semaphore) -> set[str]:
+        member_logins = set()
+        after_cursor = None
+        has_next_page = True
+        while has_next_page:
+            async with in_flight_queries:
+                data = await self.get_paginated_list_of_organisation_member_logins_async(
+                    session, organisation, after_cursor)
+            members = data["organization"]["membersWithRole"]
+            member_logins.update(member["login"]
+                                 for member in members["nodes"] or [] if member)
+            has_next_page = members["pageInfo"]["hasNextPage"]
+            after_cursor = members["pageInfo"]["endCursor"]
+        return member_logins
+
+    @adapts_graphql_page_size
+    async def get_paginated_list_of_organisation_member_logins_async(self, session: AsyncClientSession,
+                                                                     organisation: str, after_cursor: str | None,
+                                                                     page_size: int = GITHUB_GQL_MAX_PAGE_SIZE) -> dict[str, Any]:
+        logging.info(
+            f"Getting paginated list of member logins of {organisation} asynchronously. Page size {page_size}, after cursor {bool(after_cursor)}")
+        if page_size > self.GITHUB_GQL_MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size of {page_size} is too large. Max page size {self.GITHUB_GQL_MAX_PAGE_SIZE}")
+        return await session.execute(
+            self.GRAPHQL_DOCUMENTS["organisation_member_logins"],
+            variable_values={"organisation_name": organisation, "page_size": page_size, "after_cursor": after_cursor})
 
-        return age_in_days
+    def get_repositories_with_topic(self, topic: str, fields: list[str] | None = None) -> list[dict[str, Any]]:
+        """Pages through every unarchived repository in the organisation with a topic.
 
-    @retries_github_rate_limit_exception_at_next_reset_once
-    def get_old_poc_repositories(self) -> list:
-        poc_repositories = [repo['repo']['name'] for repo in self.get_paginated_list_of_repositories_per_topic("poc", None)['search']['repos']]
+        Args:
+            topic (str): The GitHub topic.
+            fields (list[str] | None): The response paths to trim the topic search to, defaults to every field.
 
+        Returns:
+            list[dict[str, Any]]: The repository nodes of the topic search, including their createdAt.
+        """
+        repositories = []
+        after_cursor = None
+        has_next_page = True
+        while has_next_page:
+            data = self.get_paginated_list_of_repositories_per_topic(
+                topic, after_cursor, self.GITHUB_GQL_MAX_PAGE_SIZE, fields)
+            repositories.extend(repo["repo"]
+                                for repo in data["search"]["repos"] or [] if repo)
+            has_next_page = data["search"]["pageInfo"]["hasNextPage"]
+            after_cursor = data["search"]["pageInfo"]["endCursor"]
+        return repositories
+
+    def get_old_poc_repositories(self, age_threshold: int = 30) -> dict[str, int]:
+        """Gets the age in days of the repositories with the poc topic that are at least age_threshold days old.
+
+        The ages are taken from the createdAt of the topic search results, so no request is made per repository.
+        """
+        now = datetime.now(timezone.utc)
         old_poc_repositories = {}
-        age_threshold = 30
 
-        for repo in poc_repositories:
-            age = self.calculate_repo_age(repo)
+        for repo in self.get_repositories_with_topic("poc", self.REPOSITORY_AGE_FIELDS):
+            age = (now - datetime.fromisoformat(repo["createdAt"])).days
             if age >= age_threshold:
-                old_poc_repositories[repo] = age
+                old_poc_repositories[repo["name"]] = age
 
         return old_poc_repositories
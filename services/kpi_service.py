@@ -1,9 +1,10 @@
 import logging
 from typing import Dict
 
-import requests
 from requests import Response
 
+from clients import http_transport
+
 logger = logging.getLogger("myapp")
 logging.basicConfig()
 
@@ -22,7 +23,7 @@ class KpiService:
         self.__request_timeout = 10
 
     def __post(self, endpoint: str, data: Dict) -> Response:
-        return requests.post(
+        return http_transport.post(
             url=f"{self.__base_url}{endpoint}",
             headers=self.__request_headers,
             timeout=self.__request_timeout,
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from clients import http_transport
 
 
 class MetadataService:
@@ -20,7 +21,7 @@ class MetadataService:
         ]
 
     def get_existing_slack_users(self):
-        response = requests.get(
+        response = http_transport.get(
             f"{self.api_url}/slack_users", headers={"Authorization": f"Bearer {self.api_token}"}, timeout=60)
         if response.status_code == 200:
             return response.json()
@@ -88,7 +89,7 @@ class MetadataService:
         """
         payload = {"users": usernames_to_add}
 
-        response = requests.post(
+        response = http_transport.post(
             f"{self.api_url}/user/add",
             json=payload,
             timeout=60
@@ -1,11 +1,19 @@
 import logging
-import requests
 
-from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+from clients import http_transport
+
 # flake8: noqa
 
+POST_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[500, 502, 503, 504],
+    allowed_methods=["POST"],
+)
+
+
 class OperationsEngineeringReportsService:
     """Communicate with the operations-engineering-reports API. This service is used to send reports
     to the API, which will then be displayed on the reports page.
@@ -61,19 +69,10 @@ class OperationsEngineeringReportsService:
         url = f"{self.__reports_url}/{self.__endpoint}"
         self.logger.debug("Sending POST request to %s with data: %s items", url, len(data))
 
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["POST"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
+        session = http_transport.get_session(url, max_retries=POST_RETRY)
+        # The body is read, not streamed, so the connection goes back to the shared pool
         resp = session.post(url, headers=headers, json=data,
-                            timeout=180, stream=True).status_code
+                            timeout=180).status_code
         if resp != 200:
             self.logger.error("Failed POST request to %s. Received status: %s", url, resp)
         else:
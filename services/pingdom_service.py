@@ -1,4 +1,4 @@
-import requests
+from clients import http_transport
 
 
 class PingdomService:
@@ -11,7 +11,7 @@ class PingdomService:
 
     def get_checks(self):
         url = f"{self.base_url}/checks"
-        response = requests.get(url=url, headers=self.headers, timeout=60)
+        response = http_transport.get(url=url, headers=self.headers, timeout=60)
 
         if response.status_code == 200:
             return response.json()
@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+
+class StandInServer:
+    """A local HTTP server that answers every request through a handler after a fixed delay.
+
+    Used by the benchmarks to stand in for remote APIs, so that round-trip latency is
+    predictable and no network access is needed.
+
+    Example Usage:
+        with StandInServer(lambda method, path, body: (200, {"data": {}}), delay=0.05) as server:
+            requests.post(f"{server.url}/graphql", json={})
+    """
+
+    def __init__(self, handler: Callable[[str, str, dict[str, Any] | None], tuple[int, Any]], delay: float = 0.0):
+        self.handler = handler
+        self.delay = delay
+        self.request_count = 0
+        self.connection_count = 0
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self.__build_request_handler())
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _count(self, attribute: str) -> None:
+        with self.__lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def __build_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, which Nagle's algorithm delays on kept-alive connections
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server._count("connection_count")
+
+            def log_message(self, *_):
+                pass
+
+            def __respond(self):
+                server._count("request_count")
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                time.sleep(server.delay)
+                status, payload = server.handler(self.command, self.path, body)
+                content = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = __respond
+            do_POST = __respond
+            do_PUT = __respond
+            do_PATCH = __respond
+            do_DELETE = __respond
+
+        return RequestHandler
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from test.test_benchmarks.timing import timed_benchmark
+
+BIN_DIRECTORY = os.path.join(os.path.dirname(
+    __file__), os.pardir, os.pardir, "bin")
+BIN_MODULES = sorted(
+    file_name[:-3] for file_name in os.listdir(BIN_DIRECTORY)
+    if file_name.endswith(".py") and file_name != "__init__.py"
+)
+NON_GITHUB_BIN_MODULES = [
+    "alert_on_low_gandi_funds",
+    "auth0_delete_inactive_users",
+    "check_mta_sts",
+    "check_version_pinning",
+    "dns_delegations_metrics",
+    "sentry_usage_alert",
+]
+IMPORT_BUDGET_SECONDS = 2.0
+MEASURE_IMPORT = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import bin.{module}\n"
+    "print(json.dumps({{'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def measure_import(module: str) -> dict | None:
+    """Imports a bin module in a fresh interpreter, returning the import time and the modules it loaded, or None
+    when a dependency of the module is not installed."""
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_IMPORT.format(module=module)],
+        cwd=os.path.join(BIN_DIRECTORY, os.pardir),
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+    if result.returncode != 0:
+        if "ModuleNotFoundError" in result.stderr:
+            return None
+        raise AssertionError(f"Importing bin.{module} failed\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestBinStartupBenchmark(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.imports = {module: measure_import(module) for module in BIN_MODULES}
+
+    @timed_benchmark
+    def test_bin_entry_points_import_within_budget(self):
+        print("\nbin import times:")
+        for module, measurement in self.imports.items():
+            print(f"  {module:<40} " + (
+                f"{measurement['seconds'] * 1000:.0f}ms" if measurement else "skipped, dependency not installed"))
+        for module, measurement in self.imports.items():
+            if measurement:
+                with self.subTest(module=module):
+                    self.assertLess(
+                        measurement["seconds"], IMPORT_BUDGET_SECONDS)
+
+    def test_bin_entry_points_do_not_import_the_graphql_transport(self):
+        for module, measurement in self.imports.items():
+            if measurement:
+                with self.subTest(module=module):
+                    self.assertNotIn("aiohttp", measurement["modules"])
+                    self.assertNotIn(
+                        "gql.transport.aiohttp", measurement["modules"])
+
+    def test_non_github_bin_entry_points_do_not_import_github_clients(self):
+        for module in NON_GITHUB_BIN_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn("github", self.imports[module]["modules"])
+                self.assertNotIn("gql", self.imports[module]["modules"])
+
+
+if __name__ == "__main__":
+    unittest.main()
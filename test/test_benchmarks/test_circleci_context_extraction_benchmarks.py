@@ -0,0 +1,104 @@
+import time
+import unittest
+
+import yaml
+
+from services.circleci_service import (YAML_SAFE_LOADER, find_contexts,
+                                       load_configuration, scan_contexts)
+from test.test_benchmarks.timing import timed_benchmark
+
+JOBS = 400
+STEPS_PER_JOB = 12
+WORKFLOWS = 40
+CONTEXTS = [f"context-{index}" for index in range(25)]
+
+
+def build_compiled_configuration() -> str:
+    """A configuration shaped like CircleCI's compiled output: orbs and commands are expanded into long job
+    step lists, and workflows list every job with its contexts and filters."""
+    jobs = {
+        f"job-{job}": {
+            "docker": [{"image": "cimg/python:3.11", "auth": {"username": "$DOCKER_USER", "password": "$DOCKER_PASS"}}],
+            "resource_class": "medium",
+            "environment": {"JOB_INDEX": str(job), "PYTHONUNBUFFERED": "1"},
+            "steps": ["checkout"] + [
+                {"run": {
+                    "name": f"Step {step}",
+                    "command": "\n".join(f"echo step {step} line {line}" for line in range(8)),
+                    "no_output_timeout": "20m",
+                }} for step in range(STEPS_PER_JOB)
+            ],
+        } for job in range(JOBS)
+    }
+    workflows = {
+        f"workflow-{workflow}": {
+            "jobs": [
+                {f"job-{job}": {
+                    "context": [CONTEXTS[job % len(CONTEXTS)], CONTEXTS[(job + workflow) % len(CONTEXTS)]],
+                    "filters": {"branches": {"only": ["main"]}},
+                    "requires": [f"job-{job - 1}"] if job % 10 else [],
+                }} for job in range(workflow, JOBS, WORKFLOWS)
+            ]
+        } for workflow in range(WORKFLOWS)
+    }
+    return yaml.safe_dump({"version": 2, "jobs": jobs, "workflows": workflows}, sort_keys=False)
+
+
+def find_contexts_recursively(configuration) -> list[str]:
+    """The extractor this module replaced, kept as the baseline."""
+    contexts = []
+    if isinstance(configuration, dict):
+        for key, value in configuration.items():
+            if key == "context":
+                if isinstance(value, list):
+                    contexts.extend(value)
+                elif isinstance(value, str):
+                    contexts.append(value)
+            else:
+                contexts.extend(find_contexts_recursively(value))
+    elif isinstance(configuration, list):
+        for item in configuration:
+            contexts.extend(find_contexts_recursively(item))
+    return contexts
+
+
+def timed(function, *args) -> tuple[float, set[str]]:
+    start = time.process_time()
+    result = set(function(*args))
+    return time.process_time() - start, result
+
+
+class TestCircleciContextExtractionBenchmark(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.configuration = build_compiled_configuration()
+
+    def test_extraction_modes_find_the_same_contexts(self):
+        baseline_contexts = set(find_contexts_recursively(yaml.safe_load(self.configuration)))
+
+        self.assertEqual(baseline_contexts, set(CONTEXTS))
+        self.assertEqual(find_contexts(load_configuration(self.configuration)), baseline_contexts)
+        self.assertEqual(scan_contexts(self.configuration), baseline_contexts)
+
+    @timed_benchmark
+    def test_compare_extraction_modes(self):
+        baseline_time, baseline_contexts = timed(
+            lambda configuration: find_contexts_recursively(yaml.safe_load(configuration)), self.configuration)
+        loaded_time, loaded_contexts = timed(
+            lambda configuration: find_contexts(load_configuration(configuration)), self.configuration)
+        scanned_time, scanned_contexts = timed(
+            scan_contexts, self.configuration)
+
+        print(f"\nContexts of a {len(self.configuration) / 1024 / 1024:.1f}MB compiled configuration: "
+              f"safe_load and recursive walk {baseline_time * 1000:.0f}ms CPU, "
+              f"{YAML_SAFE_LOADER.__name__} and iterative walk {loaded_time * 1000:.0f}ms CPU, "
+              f"event scan {scanned_time * 1000:.0f}ms CPU")
+        self.assertEqual(loaded_contexts, baseline_contexts)
+        self.assertEqual(scanned_contexts, baseline_contexts)
+        if YAML_SAFE_LOADER is not yaml.SafeLoader:
+            self.assertLess(loaded_time, baseline_time / 2)
+            self.assertLess(scanned_time, baseline_time / 2)
+
+if __name__ == "__main__":
+    unittest.main()
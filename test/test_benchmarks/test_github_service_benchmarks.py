@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from gql import Client
+from gql.transport.aiohttp import AIOHTTPTransport
+
+from services.github_service import GithubService
+from test.test_benchmarks.stand_in_server import StandInServer
+from test.test_benchmarks.timing import timed_benchmark
+
+ORGANISATION_NAME = "moj-analytical-services"
+PAGES_PER_REPOSITORY_TYPE = 6
+PAGE_LATENCY_SECONDS = 0.05
+
+
+def search_pages_handler(_method, _path, body):
+    repo_type = body["variables"]["the_query"].split("is:")[-1]
+    page = int(body["variables"]["after_cursor"] or 0)
+    return 200, {
+        "data": {
+            "search": {
+                "repos": [{"repo": {"name": f"{repo_type}-{page}", "isLocked": False, "isDisabled": False}}],
+                "pageInfo": {
+                    "hasNextPage": page + 1 < PAGES_PER_REPOSITORY_TYPE,
+                    "endCursor": str(page + 1),
+                },
+            }
+        }
+    }
+
+
+@patch("github.Github.__new__", new=MagicMock)
+class TestFetchAllRepositoriesInOrgBenchmark(unittest.TestCase):
+
+    def __timed_fetch(self, github_service: GithubService, **kwargs) -> tuple[float, list]:
+        start = time.perf_counter()
+        repos = github_service.fetch_all_repositories_in_org(**kwargs)
+        return time.perf_counter() - start, repos
+
+    @staticmethod
+    def __get_github_service(server: StandInServer) -> GithubService:
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api = Client(
+            transport=AIOHTTPTransport(url=f"{server.url}/graphql"), execute_timeout=10)
+        return github_service
+
+    def test_concurrent_mode_requests_the_repository_types_together(self):
+        first_pages = threading.Barrier(3, timeout=5)
+
+        def handler(method, path, body):
+            # Only answers once the first page of every repository type is in flight
+            if body["variables"]["after_cursor"] is None:
+                first_pages.wait()
+            return search_pages_handler(method, path, body)
+
+        with StandInServer(handler) as server:
+            repos = self.__get_github_service(
+                server).fetch_all_repositories_in_org(concurrent=True)
+
+        self.assertEqual(len(repos), 3 * PAGES_PER_REPOSITORY_TYPE)
+        self.assertEqual(server.request_count, 3 * PAGES_PER_REPOSITORY_TYPE)
+
+    @timed_benchmark
+    def test_concurrent_mode_is_faster_than_sequential_mode(self):
+        with StandInServer(search_pages_handler, delay=PAGE_LATENCY_SECONDS) as server:
+            github_service = self.__get_github_service(server)
+
+            sequential_time, sequential_repos = self.__timed_fetch(
+                github_service)
+            concurrent_time, concurrent_repos = self.__timed_fetch(
+                github_service, concurrent=True)
+
+        print(
+            f"\nfetch_all_repositories_in_org: sequential {sequential_time:.3f}s, concurrent {concurrent_time:.3f}s")
+        self.assertEqual(sequential_repos, concurrent_repos)
+        self.assertEqual(len(concurrent_repos), 3 * PAGES_PER_REPOSITORY_TYPE)
+        self.assertLess(concurrent_time, sequential_time * 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from gql import gql
+
+from clients.github_graphql_documents import GITHUB_GRAPHQL_DOCUMENTS
+from clients.graphql_document_registry import GraphQLDocumentRegistry
+from test.test_benchmarks.timing import timed_benchmark
+
+PAGES = 500
+
+
+class TestGraphQLDocumentRegistryBenchmark(unittest.TestCase):
+
+    def test_registry_parses_once_for_every_page(self):
+        registry = GraphQLDocumentRegistry(
+            {"repositories_per_type": GITHUB_GRAPHQL_DOCUMENTS.sources["repositories_per_type"]})
+
+        with patch("clients.graphql_document_registry.gql", wraps=gql) as mock_gql:
+            documents = {id(registry.get("repositories_per_type")) for _ in range(PAGES)}
+
+        self.assertEqual(mock_gql.call_count, 1)
+        self.assertEqual(len(documents), 1)
+
+    @timed_benchmark
+    def test_registry_saves_the_parse_on_every_page(self):
+        source = GITHUB_GRAPHQL_DOCUMENTS.sources["repositories_per_type"]
+
+        start = time.process_time()
+        for _ in range(PAGES):
+            gql(source)
+        parse_per_page_time = time.process_time() - start
+
+        GITHUB_GRAPHQL_DOCUMENTS.get("repositories_per_type")
+        start = time.process_time()
+        for _ in range(PAGES):
+            GITHUB_GRAPHQL_DOCUMENTS.get("repositories_per_type")
+        registry_time = time.process_time() - start
+
+        print(
+            f"\n{PAGES} pages of repositories_per_type: parsing each page {parse_per_page_time * 1000:.1f}ms CPU, "
+            f"registry {registry_time * 1000:.1f}ms CPU, "
+            f"{(parse_per_page_time - registry_time) / PAGES * 1000000:.0f}us saved per page")
+        self.assertLess(registry_time, parse_per_page_time / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
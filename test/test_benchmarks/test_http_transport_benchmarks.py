@@ -0,0 +1,58 @@
+import time
+import unittest
+
+import requests
+
+from clients import http_transport
+from test.test_benchmarks.stand_in_server import StandInServer
+from test.test_benchmarks.timing import RUN_BENCHMARKS
+
+PAGES = 50
+PER_PAGE = 100
+PAGE_LATENCY_SECONDS = 0.001
+
+
+def users_pages_handler(_method, path, _body):
+    page = int(path.split("page=")[1].split("&")[0])
+    return 200, [{"user_id": f"{page}-{index}"} for index in range(PER_PAGE if page < PAGES - 1 else 1)]
+
+
+class TestHttpTransportBenchmark(unittest.TestCase):
+    """Pages through users the way Auth0Service._get_users does, once with a new connection for every request
+    and once through the pooled transport."""
+
+    def tearDown(self):
+        http_transport.close_sessions()
+
+    def __timed_get_users(self, server: StandInServer, get) -> tuple[float, int, int]:
+        connection_count = server.connection_count
+        start = time.perf_counter()
+        users = []
+        page = 0
+        while True:
+            page_of_users = get(
+                f"{server.url}/api/v2/users?page={page}&per_page={PER_PAGE}", timeout=10).json()
+            users.extend(page_of_users)
+            if len(page_of_users) < PER_PAGE:
+                break
+            page += 1
+        return time.perf_counter() - start, server.connection_count - connection_count, len(users)
+
+    def test_pooled_transport_reuses_connections(self):
+        with StandInServer(users_pages_handler, delay=PAGE_LATENCY_SECONDS) as server:
+            unpooled_time, unpooled_connections, unpooled_users = self.__timed_get_users(
+                server, requests.get)
+            pooled_time, pooled_connections, pooled_users = self.__timed_get_users(
+                server, http_transport.get)
+
+        if RUN_BENCHMARKS:
+            print(f"\n_get_users over {PAGES} pages: unpooled {unpooled_time:.3f}s with {unpooled_connections} connections, "
+                  f"pooled {pooled_time:.3f}s with {pooled_connections} connections")
+        self.assertEqual(unpooled_users, pooled_users)
+        self.assertEqual(unpooled_connections, PAGES)
+        # Without TLS a local connection is cheap, so the timings are reported rather than asserted
+        self.assertEqual(pooled_connections, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,16 @@ class TestAddUsersEveryoneGithubTeamMain(unittest.TestCase):
     def test_main_smoke_test(self):
         add_users_all_org_members_github_team.main()
 
+    @patch.dict(os.environ, {"ADMIN_GITHUB_TOKEN": "token", "GITHUB_ORGANIZATION_NAME": "ministryofjustice",
+                             "GITHUB_HTTP_CACHE_DIRECTORY": ".cache/github-http"})
+    @patch("bin.add_users_all_org_members_github_team.GithubService")
+    def test_main_uses_http_cache_directory(self, mock_github_service):
+        add_users_all_org_members_github_team.main()
+        mock_github_service.assert_called_once_with(
+            "token", "ministryofjustice", http_cache_directory=".cache/github-http")
+        mock_github_service.return_value.add_all_users_to_team.assert_called_once_with(
+            "all-org-members", dry_run=False)
+
 
 class TestAddUsersEveryoneGithubTeamGetEnvironmentVariables(unittest.TestCase):
     def test_raises_error_when_no_environment_variables_provided(self):
@@ -10,12 +10,14 @@ from bin import archive_repositories
 
 
 @patch("github.Github.__new__", new=MagicMock)
-@patch("gql.Client.__new__", new=MagicMock)
+@patch("gql.Client.__new__")
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 class TestAddUsersEveryoneGithubTeamMain(unittest.TestCase):
 
     @patch.dict(os.environ, {"ADMIN_GITHUB_TOKEN": "token", "GITHUB_ORGANIZATION_NAME": "ministryofjustice"})
-    def test_main_smoke_test(self):
+    def test_main_smoke_test(self, mock_github_client_gql_api):
+        mock_github_client_gql_api.return_value.execute.return_value = {
+            "organization": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}}}
         archive_repositories.main()
 
 
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from bin.check_for_new_github_owners import check_for_new_organisation_owners
+from config.constants import MINISTRY_OF_JUSTICE
+from services.slack_service import SlackService
+
+CHECKPOINT_KEY = f"{MINISTRY_OF_JUSTICE} org.add_member org.update_member"
+
+
+@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
+@patch("gql.Client.__new__")
+@patch("github.Github.__new__", new=MagicMock)
+class TestCheckForNewOrganisationOwners(unittest.TestCase):
+
+    def setUp(self):
+        self.checkpoint_directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(
+            self.checkpoint_directory.name, "audit_log_checkpoint.json")
+        with open(self.checkpoint_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({CHECKPOINT_KEY: "2023-12-01T00:00:00.000Z"}, checkpoint_file)
+        self.environment = patch.dict(os.environ, {
+            "ADMIN_GITHUB_TOKEN": "test_github_token",
+            "ADMIN_SLACK_TOKEN": "test_slack_token",
+            "AUDIT_LOG_CHECKPOINT_PATH": self.checkpoint_path
+        })
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.checkpoint_directory.cleanup()
+
+    @staticmethod
+    def __set_audit_log(mock_gql_client: MagicMock) -> None:
+        mock_gql_client.return_value.execute.return_value = {"organization": {"auditLog": {
+            "edges": [{"node": {"action": "org.add_member", "createdAt": "2023-12-07T10:00:00.000Z",
+                                "actorLogin": "actor", "userLogin": "new_owner", "permission": "ADMIN"}}],
+            "pageInfo": {"endCursor": None, "hasNextPage": False}
+        }}}
+
+    def __read_checkpoints(self) -> dict[str, str]:
+        with open(self.checkpoint_path, encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)
+
+    @patch.object(SlackService, "send_new_github_owners_alert")
+    def test_saves_the_checkpoint_after_alerting(self, mock_send_new_github_owners_alert, mock_gql_client):
+        self.__set_audit_log(mock_gql_client)
+
+        check_for_new_organisation_owners(7)
+
+        mock_send_new_github_owners_alert.assert_called_once()
+        self.assertEqual(self.__read_checkpoints(), {
+                         CHECKPOINT_KEY: "2023-12-07T10:00:00.000Z"})
+
+    @patch.object(SlackService, "send_new_github_owners_alert")
+    def test_does_not_save_the_checkpoint_when_alerting_fails(self, mock_send_new_github_owners_alert, mock_gql_client):
+        self.__set_audit_log(mock_gql_client)
+        mock_send_new_github_owners_alert.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            check_for_new_organisation_owners(7)
+
+        self.assertEqual(self.__read_checkpoints(), {
+                         CHECKPOINT_KEY: "2023-12-01T00:00:00.000Z"})
+
+
+if __name__ == "__main__":
+    unittest.main()
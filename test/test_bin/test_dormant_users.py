@@ -290,7 +290,8 @@ class TestRunStepOne(unittest.TestCase):
         mock_get_dormant_users.return_value = [user]
         mock_notify_service.check_for_undelivered_first_emails.return_value = [
             create_undelivered_email_user("some-email")]
-        mock_github_service.get_user_org_email_address.return_value = "some-email"
+        mock_github_service.get_user_org_email_addresses.return_value = {
+            "full-org-user": "some-email"}
 
         run_step_one(
             MINISTRY_OF_JUSTICE,
@@ -316,7 +317,7 @@ class TestRunStepOne(unittest.TestCase):
         mock_get_dormant_users.return_value = [user]
         mock_notify_service.check_for_undelivered_first_emails.return_value = [
             create_undelivered_email_user("some-email")]
-        mock_github_service.get_user_org_email_address.return_value = MISSING_EMAIL_ADDRESS
+        mock_github_service.get_user_org_email_addresses.return_value = {}
 
         run_step_one(
             MINISTRY_OF_JUSTICE,
@@ -342,7 +343,8 @@ class TestRunStepOne(unittest.TestCase):
         mock_get_dormant_users.return_value = [user]
         mock_notify_service.check_for_undelivered_first_emails.return_value = [
             create_undelivered_email_user("some-email")]
-        mock_github_service.get_user_org_email_address.return_value = "some-email"
+        mock_github_service.get_user_org_email_addresses.return_value = {
+            "full-org-user": "some-email"}
 
         run_step_one(
             MINISTRY_OF_JUSTICE,
@@ -368,7 +370,8 @@ class TestRunStepOne(unittest.TestCase):
         user = create_saved_json_file_user("full-org-user")
         mock_get_dormant_users.return_value = [user]
         mock_notify_service.check_for_undelivered_first_emails.return_value = []
-        mock_github_service.get_user_org_email_address.return_value = "some-email"
+        mock_github_service.get_user_org_email_addresses.return_value = {
+            "full-org-user": "some-email"}
 
         run_step_one(
             MINISTRY_OF_JUSTICE,
@@ -48,6 +48,13 @@ class TestParseArguments(unittest.TestCase):
             args = parse_arguments()
             self.assertEqual(args.team_name, "team_name")
             self.assertEqual(args.permission_level, "read")
+            self.assertIsNone(args.journal)
+
+    def test_parse_arguments_with_journal(self):
+        test_args = ["script_name", "team_name", "read", "--journal", "journal.jsonl"]
+        with patch("sys.argv", test_args):
+            args = parse_arguments()
+            self.assertEqual(args.journal, "journal.jsonl")
 
 
 @patch("services.github_service.GithubService.__new__")
@@ -61,7 +68,7 @@ class TestMain(unittest.TestCase):
         with patch("sys.argv", test_args):
             main()
             mock_github_service.return_value.update_team_repository_permission.assert_called_once_with(
-                "team_name", [{"name": "repo1"}, {"name": "repo2"}], "admin"
+                "team_name", [{"name": "repo1"}, {"name": "repo2"}], "admin", journal_path=None
             )
 
     @patch("builtins.open", new_callable=mock_open, read_data='[{"name": "repo1"}, {"name": "repo2"}]')
@@ -128,7 +128,7 @@ class TestSentryUsageAlertMain(unittest.TestCase):
         )
 
 
-@patch("requests.get", new=MagicMock)
+@patch("clients.http_transport.get", new=MagicMock)
 class TestGetEnvironmentVariables(unittest.TestCase):
     def test_raises_error_when_no_sentry_environment_variable_provided(self):
         self.assertRaises(ValueError, sentry_usage_alert.get_environment_variables)
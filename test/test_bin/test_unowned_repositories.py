@@ -3,7 +3,6 @@ from unittest.mock import patch, MagicMock
 from bin.unowned_repositories import (
     main,
     get_cli_arguments,
-    get_org_teams,
     get_unowned_repositories,
     send_slack_message
 )
@@ -43,128 +42,68 @@ class TestUnownedRepositories(unittest.TestCase):
         self.assertRaises(
             ValueError, get_cli_arguments)
 
-    @patch("services.github_service.GithubService")
-    def test_get_org_teams_no_teams_exist(self, mock_github_service):
-        mock_github_service.get_team_names.return_value = []
-        teams = get_org_teams(mock_github_service)
-        self.assertEqual(len(teams), 0)
-
-    @patch("services.github_service.GithubService")
-    def test_get_org_teams_ignore_teams(self, mock_github_service):
-        mock_github_service.get_team_names.return_value = ["all-org-members"]
-        teams = get_org_teams(mock_github_service)
-        self.assertEqual(len(teams), 0)
-
-        mock_github_service.get_team_names.return_value = [
-            "organisation-security-auditor"]
-        teams = get_org_teams(mock_github_service)
-        self.assertEqual(len(teams), 0)
-
-    @patch("services.github_service.GithubService")
-    def test_get_org_teams(self, mock_github_service):
-        mock_github_service.get_team_names.return_value = ["some-team"]
-        mock_github_service.get_team_repository_names.return_value = [
-            "some-repo"]
-        mock_github_service.get_team_user_names.return_value = ["some-user"]
-        expected_result = {
-            "name": "some-team",
-            "repositories": ["some-repo"],
-            "number_of_users": 1
+    @staticmethod
+    def __ownership(teams=None, outside_collaborators=0, direct_collaborators=0) -> dict:
+        return {
+            "teams": set(teams or []),
+            "outside_collaborators": outside_collaborators,
+            "direct_collaborators": direct_collaborators
         }
-        teams = get_org_teams(mock_github_service)
-        self.assertEqual(len(teams), 1)
-        self.assertEqual(teams[0], expected_result)
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_get_unowned_repositories_when_no_org_repositories_exist(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_org_repo_names.return_value = []
-        repos = get_unowned_repositories(mock_github_service)
-        self.assertEqual(len(repos), 0)
-        mock_github_service.get_repository_collaborators.assert_not_called()
+    def test_get_unowned_repositories_ignores_teams(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {}
+        get_unowned_repositories(mock_github_service)
+        mock_github_service.get_repository_ownership_index.assert_called_once_with(
+            ["organisation-security-auditor", "all-org-members"])
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_get_unowned_repositories_when_repo_has_a_collaborator(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_repository_collaborators.return_value = [
-            "some-collaborator"]
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
+    def test_get_unowned_repositories_when_no_org_repositories_exist(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {}
         repos = get_unowned_repositories(mock_github_service)
         self.assertEqual(len(repos), 0)
-        mock_github_service.get_repository_collaborators.assert_called()
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_get_unowned_repositories_when_repo_has_no_collaborators(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_repository_collaborators.return_value = []
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
-        repos = get_unowned_repositories(mock_github_service)
-        self.assertEqual(len(repos), 1)
-        mock_github_service.get_repository_collaborators.assert_called()
-
-    @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_get_unowned_repositories_when_no_matching_org_repository_exists_but_has_collaborators(self, mock_get_org_teams, mock_github_service):
-        team = {
-            "name": "some-team",
-            "repositories": ["some-repo"],
-            "number_of_users": 1
+    def test_get_unowned_repositories_when_repo_has_a_collaborator(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {
+            "org-repo": self.__ownership(outside_collaborators=1)
         }
-        mock_get_org_teams.return_value = [team]
-        mock_github_service.get_repository_collaborators.return_value = [
-            "some-user"]
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
         repos = get_unowned_repositories(mock_github_service)
         self.assertEqual(len(repos), 0)
-        mock_github_service.get_repository_collaborators.assert_called()
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_get_unowned_repositories_when_repo_has_a_team(self, mock_get_org_teams, mock_github_service):
-        team = {
-            "name": "some-team",
-            "repositories": ["org-repo"],
-            "number_of_users": 1
+    def test_get_unowned_repositories_when_repo_has_a_team(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {
+            "org-repo": self.__ownership(teams=["some-team"])
         }
-        mock_get_org_teams.return_value = [team]
-        mock_github_service.get_repository_collaborators.return_value = []
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
         repos = get_unowned_repositories(mock_github_service)
         self.assertEqual(len(repos), 0)
-        mock_github_service.get_repository_collaborators.assert_not_called()
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_repository_with_no_collaborators_and_no_direct_users(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_repository_collaborators.return_value = []
-        mock_github_service.get_repository_direct_users.return_value = []
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
+    def test_repository_with_no_collaborators_and_no_direct_users(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {
+            "org-repo": self.__ownership()
+        }
         repos = get_unowned_repositories(mock_github_service)
-        self.assertEqual(len(repos), 1)
+        self.assertEqual(repos, ["org-repo"])
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_repository_with_collaborators_but_no_direct_users(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_repository_collaborators.return_value = ["collaborator"]
-        mock_github_service.get_repository_direct_users.return_value = []
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
+    def test_repository_with_direct_users_but_no_collaborators(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {
+            "org-repo": self.__ownership(direct_collaborators=1)
+        }
         repos = get_unowned_repositories(mock_github_service)
         self.assertEqual(len(repos), 0)
 
     @patch("services.github_service.GithubService")
-    @patch("bin.unowned_repositories.get_org_teams")
-    def test_repository_with_direct_users_but_no_collaborators(self, mock_get_org_teams, mock_github_service):
-        mock_get_org_teams.return_value = []
-        mock_github_service.get_repository_collaborators.return_value = []
-        mock_github_service.get_repository_direct_users.return_value = ["direct-user"]
-        mock_github_service.get_org_repo_names.return_value = ["org-repo"]
+    def test_unowned_repositories_are_sorted(self, mock_github_service):
+        mock_github_service.get_repository_ownership_index.return_value = {
+            "repo-b": self.__ownership(),
+            "repo-c": self.__ownership(teams=["some-team"]),
+            "repo-a": self.__ownership(),
+        }
         repos = get_unowned_repositories(mock_github_service)
-        self.assertEqual(len(repos), 0)
+        self.assertEqual(repos, ["repo-a", "repo-b"])
 
     @patch("services.slack_service.SlackService")
     def test_send_slack_message(self, mock_slack_service):
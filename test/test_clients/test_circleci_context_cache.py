@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from clients.circleci_context_cache import CircleciContextCache
+
+TEST_CONFIGURATION = "jobs:\n  build:\n    context: context1\n"
+
+
+class TestCircleciContextCache(unittest.TestCase):
+
+    def test_returns_none_when_not_cached(self):
+        self.assertIsNone(CircleciContextCache().get(TEST_CONFIGURATION))
+
+    def test_extracts_each_configuration_once(self):
+        cache = CircleciContextCache()
+        extract = MagicMock(return_value={"context1"})
+
+        self.assertEqual(cache.get_or_extract(
+            TEST_CONFIGURATION, extract), {"context1"})
+        self.assertEqual(cache.get_or_extract(
+            TEST_CONFIGURATION, extract), {"context1"})
+
+        extract.assert_called_once_with(TEST_CONFIGURATION)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_keys_by_configuration_text(self):
+        cache = CircleciContextCache()
+        cache.set(TEST_CONFIGURATION, {"context1"})
+
+        self.assertIsNone(cache.get(TEST_CONFIGURATION + "\n"))
+
+
+class TestCircleciContextCacheOnDisk(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_directory.cleanup()
+
+    def test_reuses_entries_across_runs(self):
+        CircleciContextCache(self.cache_directory.name).set(
+            TEST_CONFIGURATION, {"context1", "context2"})
+        extract = MagicMock()
+
+        contexts = CircleciContextCache(
+            self.cache_directory.name).get_or_extract(TEST_CONFIGURATION, extract)
+
+        self.assertEqual(contexts, {"context1", "context2"})
+        extract.assert_not_called()
+
+    def test_ignores_corrupt_entries(self):
+        cache = CircleciContextCache(self.cache_directory.name)
+        with open(os.path.join(self.cache_directory.name, f"{cache.key(TEST_CONFIGURATION)}.json"), "w",
+                  encoding="utf-8") as file:
+            file.write("{")
+
+        self.assertIsNone(cache.get(TEST_CONFIGURATION))
+
+    def test_evicts_least_recently_used_entries_past_max_size(self):
+        cache = CircleciContextCache(self.cache_directory.name)
+        cache.set("old", {"context1"})
+        cache.set("new", {"context2"})
+        old_path = os.path.join(
+            self.cache_directory.name, f"{cache.key('old')}.json")
+        os.utime(old_path, (time.time() - 60, time.time() - 60))
+        entry_size = os.path.getsize(old_path)
+
+        CircleciContextCache(self.cache_directory.name,
+                             max_size_bytes=entry_size)
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertIsNotNone(CircleciContextCache(
+            self.cache_directory.name).get("new"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from requests import Response, Session
+
+from clients.conditional_request_cache import (
+    ConditionalRequestCache, ConditionalRequestCacheAdapter)
+
+TEST_URL = "https://api.github.com/orgs/ministryofjustice/members"
+
+
+def build_response(status_code: int, content: bytes = b"", headers: dict | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.reason = "OK" if status_code == 200 else "Not Modified"
+    response.headers.update(headers or {})
+    response._content = content  # pylint: disable=W0212
+    return response
+
+
+class TestConditionalRequestCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache = ConditionalRequestCache(
+            self.cache_directory.name, "test_token")
+
+    def tearDown(self):
+        self.cache_directory.cleanup()
+
+    def test_returns_none_when_not_cached(self):
+        self.assertIsNone(self.cache.get(TEST_URL))
+
+    def test_returns_stored_entry(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        entry = self.cache.get(TEST_URL)
+        self.assertEqual(entry["headers"]["ETag"], "test_etag")
+        self.assertEqual(entry["status_code"], 200)
+
+    def test_entries_are_scoped_to_token(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        other_token_cache = ConditionalRequestCache(
+            self.cache_directory.name, "other_token")
+        self.assertIsNone(other_token_cache.get(TEST_URL))
+
+    def test_does_not_store_token(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        for file_name in os.listdir(self.cache_directory.name):
+            with open(os.path.join(self.cache_directory.name, file_name), encoding="utf-8") as file:
+                self.assertNotIn("test_token", file.read())
+
+    def test_evicts_entries_older_than_max_age(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        old_time = time.time() - timedelta(days=8).total_seconds()
+        for file_name in os.listdir(self.cache_directory.name):
+            os.utime(os.path.join(self.cache_directory.name,
+                     file_name), (old_time, old_time))
+        self.cache.evict()
+        self.assertIsNone(self.cache.get(TEST_URL))
+
+    def test_evicts_least_recently_used_entries_over_max_size(self):
+        self.cache.max_size_bytes = 0
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        self.cache.evict()
+        self.assertEqual(os.listdir(self.cache_directory.name), [])
+
+    def test_evicts_least_recently_used_entries_when_a_write_passes_max_size(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        entry_size = sum(os.path.getsize(os.path.join(self.cache_directory.name, file_name))
+                         for file_name in os.listdir(self.cache_directory.name))
+        old_time = time.time() - timedelta(hours=1).total_seconds()
+        for file_name in os.listdir(self.cache_directory.name):
+            os.utime(os.path.join(self.cache_directory.name,
+                     file_name), (old_time, old_time))
+        self.cache.max_size_bytes = entry_size + entry_size // 2
+
+        self.cache.set(f"{TEST_URL}?page=2", build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+
+        self.assertIsNone(self.cache.get(TEST_URL))
+        self.assertIsNotNone(self.cache.get(f"{TEST_URL}?page=2"))
+
+    def test_does_not_evict_when_a_write_replaces_an_entry_within_max_size(self):
+        self.cache.set(TEST_URL, build_response(
+            200, b"[]", {"ETag": "test_etag"}))
+        entry_size = sum(os.path.getsize(os.path.join(self.cache_directory.name, file_name))
+                         for file_name in os.listdir(self.cache_directory.name))
+        self.cache.max_size_bytes = entry_size
+
+        with patch("clients.conditional_request_cache.evict_least_recently_used") as mock_evict:
+            self.cache.set(TEST_URL, build_response(
+                200, b"[]", {"ETag": "test_etag"}))
+        mock_evict.assert_not_called()
+        self.assertIsNotNone(self.cache.get(TEST_URL))
+
+
+@patch("requests.adapters.HTTPAdapter.send")
+class TestConditionalRequestCacheAdapter(unittest.TestCase):
+    def setUp(self):
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.session = Session()
+        self.session.mount("https://", ConditionalRequestCacheAdapter(
+            ConditionalRequestCache(self.cache_directory.name, "test_token")))
+
+    def tearDown(self):
+        self.cache_directory.cleanup()
+
+    def test_stores_response_with_etag_and_revalidates(self, mock_send):
+        mock_send.side_effect = [
+            build_response(200, b'["user1"]', {"ETag": "test_etag"}),
+            build_response(304, headers={"X-RateLimit-Remaining": "4999"}),
+        ]
+        self.session.get(TEST_URL)
+        response = self.session.get(TEST_URL)
+        self.assertEqual(
+            mock_send.call_args.args[0].headers["If-None-Match"], "test_etag")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), ["user1"])
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "4999")
+
+    def test_revalidates_with_last_modified(self, mock_send):
+        mock_send.side_effect = [
+            build_response(200, b"[]", {
+                           "Last-Modified": "Wed, 01 May 2024 00:00:00 GMT"}),
+            build_response(304),
+        ]
+        self.session.get(TEST_URL)
+        self.session.get(TEST_URL)
+        self.assertEqual(mock_send.call_args.args[0].headers["If-Modified-Since"],
+                         "Wed, 01 May 2024 00:00:00 GMT")
+
+    def test_replaces_entry_when_modified(self, mock_send):
+        mock_send.side_effect = [
+            build_response(200, b'["user1"]', {"ETag": "etag_1"}),
+            build_response(200, b'["user2"]', {"ETag": "etag_2"}),
+            build_response(304),
+        ]
+        self.session.get(TEST_URL)
+        self.assertEqual(self.session.get(TEST_URL).json(), ["user2"])
+        self.assertEqual(self.session.get(TEST_URL).json(), ["user2"])
+        self.assertEqual(
+            mock_send.call_args.args[0].headers["If-None-Match"], "etag_2")
+
+    def test_does_not_cache_responses_without_validators(self, mock_send):
+        mock_send.side_effect = [build_response(
+            200, b"[]"), build_response(200, b"[]")]
+        self.session.get(TEST_URL)
+        self.session.get(TEST_URL)
+        self.assertNotIn("If-None-Match", mock_send.call_args.args[0].headers)
+
+    def test_does_not_cache_other_methods(self, mock_send):
+        mock_send.return_value = build_response(
+            200, b"{}", {"ETag": "test_etag"})
+        self.session.patch(TEST_URL, json={})
+        self.session.patch(TEST_URL, json={})
+        self.assertNotIn("If-None-Match", mock_send.call_args.args[0].headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from clients.github_graphql_telemetry import (GraphQLPageSizeController,
+                                              GraphQLTelemetry)
+
+
+class TestGraphQLTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        self.telemetry = GraphQLTelemetry()
+
+    def test_records_rate_limit_cost_and_latency(self):
+        self.telemetry.record("test_query", 80, 1.5, {
+                              "cost": 1, "nodeCount": 80, "remaining": 4999})
+        self.telemetry.record("test_query", 100, 0.5, {
+                              "cost": 2, "nodeCount": 100, "remaining": 4997})
+        statistics = self.telemetry.statistics["test_query"]
+        self.assertEqual(statistics.queries, 2)
+        self.assertEqual(statistics.cost, 3)
+        self.assertEqual(statistics.node_count, 180)
+        self.assertEqual(statistics.total_seconds, 2)
+        self.assertEqual(statistics.max_seconds, 1.5)
+        self.assertEqual(statistics.page_size, 100)
+        self.assertEqual(statistics.remaining, 4997)
+
+    def test_records_queries_without_rate_limit(self):
+        self.telemetry.record("test_query", 80, 1, None)
+        self.assertEqual(self.telemetry.statistics["test_query"].queries, 1)
+        self.assertIsNone(self.telemetry.statistics["test_query"].remaining)
+
+    def test_records_failures(self):
+        self.telemetry.record_failure("test_query", 80, 120)
+        statistics = self.telemetry.statistics["test_query"]
+        self.assertEqual(statistics.failures, 1)
+        self.assertEqual(statistics.queries, 0)
+        self.assertEqual(statistics.max_seconds, 120)
+
+    def test_summary_has_a_row_per_query(self):
+        self.telemetry.record("query_b", 80, 1, {
+                              "cost": 1, "nodeCount": 80, "remaining": 4999})
+        self.telemetry.record_failure("query_a", 40, 2)
+        lines = self.telemetry.summary().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("query"))
+        self.assertEqual(lines[1].split(), [
+                         "query_a", "0", "1", "0", "0", "2.00", "2.00", "40", "-"])
+        self.assertEqual(lines[2].split(), [
+                         "query_b", "1", "0", "80", "1", "1.00", "1.00", "80", "4999"])
+
+    def test_logs_summary_only_when_queries_were_recorded(self):
+        with self.assertNoLogs(level="INFO"):
+            self.telemetry.log_summary()
+        self.telemetry.record("test_query", 80, 1, None)
+        with self.assertLogs(level="INFO") as logs:
+            self.telemetry.log_summary()
+        self.assertIn("test_query", logs.output[0])
+
+
+class TestGraphQLPageSizeController(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = GraphQLPageSizeController(100)
+
+    def test_starts_at_the_requested_page_size(self):
+        self.assertEqual(self.controller.page_size("test_query", 50, 80), 50)
+
+    def test_starts_at_the_default_page_size(self):
+        self.assertEqual(self.controller.page_size("test_query", None, 80), 80)
+
+    def test_leaves_oversized_page_sizes_for_the_query_to_reject(self):
+        self.assertEqual(self.controller.page_size(
+            "test_query", 101, 80), 101)
+
+    def test_halves_the_page_size_after_a_failure(self):
+        self.assertTrue(self.controller.shrink("test_query", 80))
+        self.assertEqual(self.controller.page_size("test_query", None, 80), 40)
+        self.assertEqual(self.controller.page_size("other_query", None, 80), 80)
+
+    def test_does_not_shrink_below_the_minimum_page_size(self):
+        self.assertTrue(self.controller.shrink("test_query", 15))
+        self.assertEqual(self.controller.page_size("test_query", None, 80), 10)
+        self.assertFalse(self.controller.shrink("test_query", 10))
+
+    def test_grows_the_page_size_after_cheap_pages(self):
+        self.controller.record_success("test_query", 80, 1, {"cost": 1})
+        self.assertEqual(self.controller.page_size(
+            "test_query", None, 80), 100)
+
+    def test_does_not_grow_past_the_requested_page_size(self):
+        self.controller.record_success("test_query", 50, 1, {"cost": 1})
+        self.assertEqual(self.controller.page_size("test_query", 50, 80), 50)
+
+    def test_does_not_grow_after_expensive_or_slow_pages(self):
+        self.controller.record_success("test_query", 40, 1, {"cost": 3})
+        self.assertEqual(self.controller.page_size("test_query", None, 80), 40)
+        self.controller.record_success("test_query", 40, 10, {"cost": 1})
+        self.assertEqual(self.controller.page_size("test_query", None, 80), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
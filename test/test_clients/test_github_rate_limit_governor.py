@@ -0,0 +1,138 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from freezegun import freeze_time
+from requests import Response
+
+from clients.github_rate_limit_governor import (RateLimitGovernor,
+                                                RateLimitGovernorAdapter)
+
+NOW = 1700000000
+
+
+def rate_limit_headers(remaining: int, limit: int = 5000, reset: int = NOW + 1000, resource: str = "core") -> dict:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def build_response(status_code: int, headers: dict | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+@freeze_time("2023-11-14 22:13:20")
+class TestRateLimitGovernor(unittest.TestCase):
+
+    def test_no_wait_when_budget_unknown(self):
+        self.assertEqual(RateLimitGovernor().seconds_until_budget("core"), 0)
+
+    def test_no_wait_when_budget_plentiful(self):
+        governor = RateLimitGovernor()
+        governor.update_from_headers(rate_limit_headers(4000))
+        self.assertEqual(governor.seconds_until_budget("core"), 0)
+
+    def test_paces_requests_when_budget_low(self):
+        governor = RateLimitGovernor(reserve=10)
+        governor.update_from_headers(rate_limit_headers(110))
+        self.assertEqual(governor.seconds_until_budget("core"), 10)
+
+    def test_waits_for_reset_when_budget_exhausted(self):
+        governor = RateLimitGovernor(reserve=10)
+        governor.update_from_headers(rate_limit_headers(10))
+        self.assertEqual(governor.seconds_until_budget(
+            "core"), 1000 + RateLimitGovernor.RESET_BUFFER_SECONDS)
+
+    def test_no_wait_after_reset(self):
+        governor = RateLimitGovernor()
+        governor.update_from_headers(rate_limit_headers(0, reset=NOW - 1))
+        self.assertEqual(governor.seconds_until_budget("core"), 0)
+
+    def test_resources_are_budgeted_separately(self):
+        governor = RateLimitGovernor()
+        governor.update_from_headers(rate_limit_headers(0, resource="search"))
+        self.assertEqual(governor.seconds_until_budget("core"), 0)
+        self.assertGreater(governor.seconds_until_budget("search"), 0)
+
+    def test_counts_requests_against_budget(self):
+        governor = RateLimitGovernor()
+        governor.update_from_headers(rate_limit_headers(100))
+        governor.seconds_until_budget("core")
+        self.assertEqual(governor.budgets["core"].remaining, 99)
+
+    def test_updates_from_graphql_rate_limit(self):
+        governor = RateLimitGovernor(reserve=10)
+        governor.update_from_graphql(
+            {"limit": 5000, "cost": 1, "remaining": 10, "resetAt": "2023-11-14T22:30:00Z"})
+        self.assertEqual(governor.seconds_until_budget(
+            "graphql"), 1000 + RateLimitGovernor.RESET_BUFFER_SECONDS)
+
+    def test_blocks_all_resources_after_secondary_rate_limit(self):
+        governor = RateLimitGovernor()
+        governor.block_for(30)
+        self.assertEqual(governor.seconds_until_budget("core"), 30)
+        self.assertEqual(governor.seconds_until_budget("graphql"), 30)
+
+    def test_secondary_rate_limit_delay_uses_retry_after(self):
+        self.assertEqual(RateLimitGovernor().secondary_rate_limit_delay(
+            403, {"Retry-After": "60"}), 60)
+
+    def test_secondary_rate_limit_delay_waits_for_reset_when_exhausted(self):
+        self.assertEqual(RateLimitGovernor().secondary_rate_limit_delay(
+            403, rate_limit_headers(0)), 1000 + RateLimitGovernor.RESET_BUFFER_SECONDS)
+
+    def test_secondary_rate_limit_delay_ignores_other_responses(self):
+        self.assertIsNone(
+            RateLimitGovernor().secondary_rate_limit_delay(200, {}))
+        self.assertIsNone(RateLimitGovernor().secondary_rate_limit_delay(
+            403, rate_limit_headers(100)))
+
+    def test_resource_for_url(self):
+        self.assertEqual(RateLimitGovernor.resource_for_url(
+            "https://api.github.com/graphql"), "graphql")
+        self.assertEqual(RateLimitGovernor.resource_for_url(
+            "https://api.github.com/search/repositories"), "search")
+        self.assertEqual(RateLimitGovernor.resource_for_url(
+            "https://api.github.com/orgs/ministryofjustice"), "core")
+
+
+@patch("clients.github_rate_limit_governor.time.sleep")
+class TestRateLimitGovernorAdapter(unittest.TestCase):
+
+    def test_records_budget_from_response(self, _mock_sleep):
+        governor = RateLimitGovernor()
+        inner_adapter = MagicMock()
+        inner_adapter.send.return_value = build_response(
+            200, rate_limit_headers(4000, reset=int(time.time()) + 1000))
+        RateLimitGovernorAdapter(governor, inner_adapter).send(
+            MagicMock(url="https://api.github.com/orgs/ministryofjustice"))
+        self.assertEqual(governor.budgets["core"].remaining, 4000)
+
+    def test_retries_after_secondary_rate_limit(self, mock_sleep):
+        inner_adapter = MagicMock()
+        inner_adapter.send.side_effect = [
+            build_response(403, {"Retry-After": "30"}), build_response(200)]
+        response = RateLimitGovernorAdapter(RateLimitGovernor(), inner_adapter).send(
+            MagicMock(url="https://api.github.com/orgs/ministryofjustice"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(inner_adapter.send.call_count, 2)
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 30, delta=1)
+
+    def test_returns_rejection_after_max_retries(self, _mock_sleep):
+        inner_adapter = MagicMock()
+        inner_adapter.send.return_value = build_response(
+            429, {"Retry-After": "1"})
+        response = RateLimitGovernorAdapter(RateLimitGovernor(), inner_adapter, max_rate_limit_retries=2).send(
+            MagicMock(url="https://api.github.com/orgs/ministryofjustice"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(inner_adapter.send.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from gql.transport.aiohttp import AIOHTTPTransport
+from gql.transport.exceptions import TransportServerError
+from graphql import ExecutionResult, parse, print_ast
+
+from clients.github_rate_limit_governor import RateLimitGovernor
+from clients.github_rate_limit_governor_transport import (
+    RateLimitGovernorTransport, with_rate_limit_selection)
+
+
+@patch("clients.github_rate_limit_governor.asyncio.sleep", new_callable=AsyncMock)
+class TestRateLimitGovernorTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.governor = RateLimitGovernor()
+        # Other tests patch AIOHTTPTransport.__new__, which leaves it unable to take constructor arguments
+        self.transport = RateLimitGovernorTransport.__new__(
+            RateLimitGovernorTransport)
+        self.transport.__init__(
+            self.governor, url="https://api.github.com/graphql")
+
+    def test_records_budget_from_rate_limit_selection(self, _mock_sleep):
+        result = ExecutionResult(data={"rateLimit": {
+            "limit": 5000, "cost": 1, "remaining": 4321, "resetAt": "2099-01-01T00:00:00Z"}})
+        with patch.object(AIOHTTPTransport, "execute", AsyncMock(return_value=result)):
+            asyncio.run(self.transport.execute(MagicMock()))
+        self.assertEqual(self.governor.budgets["graphql"].remaining, 4321)
+
+    def test_retries_after_secondary_rate_limit(self, mock_sleep):
+        self.transport.response_headers = {"Retry-After": "30"}
+        mock_execute = AsyncMock(side_effect=[TransportServerError(
+            "forbidden", 403), ExecutionResult(data={})])
+        with patch.object(AIOHTTPTransport, "execute", mock_execute):
+            asyncio.run(self.transport.execute(MagicMock()))
+        self.assertEqual(mock_execute.await_count, 2)
+        self.assertAlmostEqual(mock_sleep.await_args.args[0], 30, delta=1)
+
+    def test_raises_other_server_errors(self, _mock_sleep):
+        self.transport.response_headers = {}
+        with patch.object(AIOHTTPTransport, "execute", AsyncMock(side_effect=TransportServerError("error", 502))):
+            with self.assertRaises(TransportServerError):
+                asyncio.run(self.transport.execute(MagicMock()))
+
+    def test_adds_rate_limit_selection_to_queries(self, _mock_sleep):
+        mock_execute = AsyncMock(return_value=ExecutionResult(data={}))
+        with patch.object(AIOHTTPTransport, "execute", mock_execute):
+            asyncio.run(self.transport.execute(parse("{ viewer { login } }")))
+        self.assertIn("rateLimit", print_ast(mock_execute.await_args.args[0]))
+
+
+class TestWithRateLimitSelection(unittest.TestCase):
+
+    def test_adds_rate_limit_selection_to_queries(self):
+        document = parse("query($login: String!) { user(login: $login) { name } }")
+        selections = with_rate_limit_selection(
+            document).definitions[0].selection_set.selections
+        self.assertEqual([selection.name.value for selection in selections], [
+                         "user", "rateLimit"])
+        self.assertEqual(
+            [field.name.value for field in selections[1].selection_set.selections],
+            ["limit", "cost", "remaining", "resetAt", "nodeCount"])
+
+    def test_does_not_change_the_original_document(self):
+        document = parse("{ viewer { login } }")
+        with_rate_limit_selection(document)
+        self.assertNotIn("rateLimit", print_ast(document))
+
+    def test_does_not_add_rate_limit_selection_twice(self):
+        document = parse("{ viewer { login } rateLimit { cost } }")
+        self.assertEqual(print_ast(with_rate_limit_selection(document)), print_ast(document))
+
+    def test_builds_the_copy_once_per_document(self):
+        document = parse("{ viewer { login } }")
+        self.assertIs(with_rate_limit_selection(document),
+                      with_rate_limit_selection(document))
+
+    def test_does_not_add_rate_limit_selection_to_mutations(self):
+        document = parse(
+            "mutation { addStar(input: {starrableId: \"1\"}) { clientMutationId } }")
+        self.assertNotIn("rateLimit", print_ast(
+            with_rate_limit_selection(document)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from graphql import print_ast
+
+from clients.github_graphql_documents import GITHUB_GRAPHQL_DOCUMENTS
+from clients.graphql_document_registry import (GraphQLDocumentRegistry,
+                                               trim_selections)
+
+REPOSITORIES_QUERY = """
+    query($the_query: String!, $page_size: Int!, $after_cursor: String) {
+        search(type: REPOSITORY, query: $the_query, first: $page_size, after: $after_cursor) {
+            repos: edges {
+                repo: node {
+                    ... on Repository {
+                        name
+                        createdAt
+                        collaborators(affiliation: DIRECT) {
+                            totalCount
+                        }
+                    }
+                }
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+"""
+
+
+class TestGraphQLDocumentRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = GraphQLDocumentRegistry(
+            {"repositories": REPOSITORIES_QUERY})
+
+    def test_parses_each_query_once(self):
+        self.assertIs(self.registry.get("repositories"),
+                      self.registry["repositories"])
+
+    def test_raises_error_for_unknown_query(self):
+        self.assertRaises(KeyError, self.registry.get, "unknown")
+
+    def test_raises_error_for_invalid_query(self):
+        self.registry.register("invalid", "query { viewer { login }")
+        with self.assertRaises(ValueError) as context:
+            self.registry.get("invalid")
+        self.assertIn("invalid", str(context.exception))
+
+    def test_raises_error_for_document_without_operation(self):
+        self.registry.register(
+            "fragment", "fragment Login on User { login }")
+        self.assertRaises(ValueError, self.registry.get, "fragment")
+
+    def test_raises_error_when_registering_a_different_query_under_a_name(self):
+        self.registry.register("repositories", REPOSITORIES_QUERY)
+        self.assertRaises(ValueError, self.registry.register,
+                          "repositories", "query { viewer { login } }")
+
+    def test_caches_trimmed_queries(self):
+        fields = ["search.repos.repo.name", "search.pageInfo"]
+        trimmed = self.registry.get("repositories", fields)
+        self.assertIs(trimmed, self.registry.get(
+            "repositories", list(reversed(fields))))
+        self.assertIsNot(trimmed, self.registry["repositories"])
+
+    def test_parses_ad_hoc_queries_once_per_source(self):
+        source = "query { viewer { login } }"
+        self.assertIs(self.registry.get_for_source(source),
+                      self.registry.get_for_source(source))
+
+    def test_evicts_oldest_ad_hoc_queries(self):
+        self.registry.MAX_AD_HOC_DOCUMENTS = 1
+        first = self.registry.get_for_source("query { viewer { login } }")
+        self.registry.get_for_source("query { viewer { name } }")
+        self.assertIsNot(first, self.registry.get_for_source(
+            "query { viewer { login } }"))
+
+
+class TestTrimSelections(unittest.TestCase):
+
+    def setUp(self):
+        self.document = GraphQLDocumentRegistry(
+            {"repositories": REPOSITORIES_QUERY})["repositories"]
+
+    def test_keeps_only_fields_on_the_paths_to_needed_fields(self):
+        trimmed = print_ast(trim_selections(
+            self.document, ["search.repos.repo.name", "search.pageInfo"]))
+        self.assertIn("name", trimmed)
+        self.assertIn("hasNextPage", trimmed)
+        self.assertIn("... on Repository", trimmed)
+        self.assertNotIn("createdAt", trimmed)
+        self.assertNotIn("collaborators", trimmed)
+
+    def test_keeps_the_whole_selection_of_needed_fields(self):
+        trimmed = print_ast(trim_selections(
+            self.document, ["search.repos.repo.collaborators", "search.pageInfo.endCursor"]))
+        self.assertIn("totalCount", trimmed)
+        self.assertIn("endCursor", trimmed)
+        self.assertNotIn("hasNextPage", trimmed)
+
+    def test_removes_variables_that_are_no_longer_used(self):
+        document = GraphQLDocumentRegistry({"viewer": """
+            query($login: String!) {
+                viewer { login }
+                user(login: $login) { name }
+            }
+        """})["viewer"]
+        trimmed = print_ast(trim_selections(document, ["viewer.login"]))
+        self.assertNotIn("$login", trimmed)
+
+    def test_does_not_change_the_original_document(self):
+        original = print_ast(self.document)
+        trim_selections(self.document, ["search.pageInfo"])
+        self.assertEqual(original, print_ast(self.document))
+
+
+class TestGithubGraphQLDocuments(unittest.TestCase):
+
+    def test_all_queries_are_valid(self):
+        for name in GITHUB_GRAPHQL_DOCUMENTS.sources:
+            with self.subTest(name=name):
+                GITHUB_GRAPHQL_DOCUMENTS.get(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
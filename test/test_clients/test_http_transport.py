@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch
+
+from urllib3.util.retry import Retry
+
+from clients import http_transport
+
+TEST_URL = "https://api.example.com/api/v2/users?page=0"
+
+
+class TestHttpTransportGetSession(unittest.TestCase):
+    def tearDown(self):
+        http_transport.close_sessions()
+
+    def test_reuses_session_for_the_same_host(self):
+        self.assertIs(http_transport.get_session(TEST_URL),
+                      http_transport.get_session("https://api.example.com/other"))
+
+    def test_separates_sessions_by_host_and_scheme(self):
+        session = http_transport.get_session(TEST_URL)
+        self.assertIsNot(session, http_transport.get_session(
+            "https://other.example.com/"))
+        self.assertIsNot(session, http_transport.get_session(
+            "http://api.example.com/"))
+
+    def test_separates_sessions_by_pool_configuration(self):
+        retry = Retry(total=1)
+        session = http_transport.get_session(TEST_URL)
+        self.assertIsNot(session, http_transport.get_session(
+            TEST_URL, pool_size=20))
+        self.assertIsNot(session, http_transport.get_session(
+            TEST_URL, max_retries=retry))
+        self.assertIs(http_transport.get_session(TEST_URL, max_retries=retry),
+                      http_transport.get_session(TEST_URL, max_retries=retry))
+
+    def test_mounts_pooled_adapter_with_retry_policy(self):
+        adapter = http_transport.get_session(
+            TEST_URL, pool_size=20).get_adapter(TEST_URL)
+        self.assertEqual(adapter._pool_maxsize, 20)  # pylint: disable=W0212
+        self.assertIs(adapter.max_retries, http_transport.DEFAULT_RETRY)
+
+    def test_close_sessions_drops_pooled_sessions(self):
+        session = http_transport.get_session(TEST_URL)
+        http_transport.close_sessions()
+        self.assertIsNot(session, http_transport.get_session(TEST_URL))
+
+
+@patch("requests.Session.request")
+class TestHttpTransportRequests(unittest.TestCase):
+    def tearDown(self):
+        http_transport.close_sessions()
+
+    def test_get(self, mock_request):
+        http_transport.get(TEST_URL, timeout=10)
+        mock_request.assert_called_once_with(
+            "GET", TEST_URL, params=None, allow_redirects=True, timeout=10)
+
+    def test_post(self, mock_request):
+        http_transport.post(TEST_URL, json={}, timeout=10)
+        mock_request.assert_called_once_with(
+            "POST", TEST_URL, data=None, json={}, timeout=10)
+
+    def test_request(self, mock_request):
+        http_transport.request("DELETE", TEST_URL, timeout=10)
+        mock_request.assert_called_once_with("DELETE", TEST_URL, timeout=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
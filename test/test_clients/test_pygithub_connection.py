@@ -0,0 +1,20 @@
+import unittest
+from unittest.mock import MagicMock
+
+from clients.pygithub_connection import build_pygithub_connection_class
+
+
+class TestBuildPygithubConnectionClass(unittest.TestCase):
+    def test_mounts_adapter_on_connection_session(self):
+        adapter = MagicMock()
+        adapter_factory = MagicMock(return_value=adapter)
+        connection = build_pygithub_connection_class(
+            adapter_factory)("api.github.com", 443, retry=2, pool_size=5)
+        adapter_factory.assert_called_once_with(
+            max_retries=2, pool_connections=5, pool_maxsize=5)
+        self.assertIs(connection.session.get_adapter(
+            "https://api.github.com"), adapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
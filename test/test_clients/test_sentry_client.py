@@ -8,7 +8,7 @@ END_TIME = "2023-06-09T00:00:00Z"
 DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
 
-@patch("requests.get")
+@patch("clients.http_transport.get")
 class TestSentryClientGetOrganizationStats(unittest.TestCase):
 
     def test_returns_sum_quantity(self, mock_get: MagicMock):
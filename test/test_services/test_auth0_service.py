@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, Mock, patch
 import requests
 from dateutil.relativedelta import relativedelta
 
+from clients import http_transport
 from services.auth0_service import (RESPONSE_NO_CONTENT, RESPONSE_OKAY,
                                     Auth0Service)
 
@@ -26,7 +27,10 @@ class TestAuth0Service(unittest.TestCase):
         self.response = Mock()
         self.response.status_code = RESPONSE_OKAY
         self.response.json.return_value = {"access_token": "test_access_token"}
-        requests.post = MagicMock(return_value=self.response)
+        post_patcher = patch.object(
+            http_transport, "post", MagicMock(return_value=self.response))
+        post_patcher.start()
+        self.addCleanup(post_patcher.stop)
 
         self.auth0 = Auth0Service(
             client_secret=self.client_secret,
@@ -97,13 +101,13 @@ class TestAuth0Service(unittest.TestCase):
         self.assertEqual(response, err_response.status_code)
 
     def test_get_access_token(self):
-        requests.post = MagicMock(return_value=self.response)
+        http_transport.post.return_value = self.response
         access_token = self.auth0.get_access_token()
         self.assertEqual(access_token, "test_access_token")
 
     def test_get_access_token_fails(self):
         self.response.status_code = RESPONSE_NO_CONTENT
-        requests.post = MagicMock(return_value=self.response)
+        http_transport.post.return_value = self.response
         self.assertRaises(Exception, self.auth0.get_access_token)
 
     def test_get_users(self):
@@ -170,13 +174,13 @@ class TestAuth0Service(unittest.TestCase):
         users = self.auth0.get_active_users()
         self.assertEqual(users, self.active_users)
 
-    @patch.object(requests, 'request')
+    @patch.object(http_transport, 'request')
     def test_make_request(self, mock_requests):
         mock_requests.return_value = Mock(status_code=RESPONSE_OKAY)
         response = self.auth0._make_request("POST", "some-endpoint")
         self.assertEqual(RESPONSE_OKAY, response.status_code)
 
-    @patch.object(requests, 'request')
+    @patch.object(http_transport, 'request')
     def test_make_request_with_data(self, mock_requests):
         mock_requests.return_value = Mock(status_code=RESPONSE_OKAY)
         response = self.auth0._make_request(
@@ -1,10 +1,17 @@
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import yaml
-from services.circleci_service import CircleciService
+from services.circleci_service import (CircleciService, PipelineScanProgress,
+                                       find_contexts, load_configuration,
+                                       scan_contexts)
 
 
-@patch("requests.get")
+@patch("clients.http_transport.get")
 class TestCircleciService(unittest.TestCase):
     def setUp(self):
         self.token = "test_token"
@@ -37,6 +44,40 @@ class TestCircleciService(unittest.TestCase):
         pipelines = self.service.get_circleci_pipelines_for_repository(repo)
         self.assertEqual(pipelines, [])
 
+    def test_get_new_circleci_pipelines_for_repository_pages_until_the_newest_seen_pipeline(self, mock_get):
+        mock_get.side_effect = [
+            MagicMock(status_code=200, json=MagicMock(return_value={
+                "items": [{"id": "pipeline4", "created_at": "2024-01-04"}, {"id": "pipeline3", "created_at": "2024-01-03"}],
+                "next_page_token": "next_page"})),
+            MagicMock(status_code=200, json=MagicMock(return_value={
+                "items": [{"id": "pipeline2", "created_at": "2024-01-02"}, {"id": "pipeline1", "created_at": "2024-01-01"}],
+                "next_page_token": "last_page"})),
+        ]
+
+        pipelines = self.service.get_new_circleci_pipelines_for_repository(
+            "test_repo", {"id": "pipeline2", "created_at": "2024-01-02"})
+
+        self.assertEqual([pipeline["id"] for pipeline in pipelines], ["pipeline4", "pipeline3"])
+        url = f"https://circleci.com/api/v2/project/github/{self.github_org}/test_repo/pipeline?branch=main"
+        mock_get.assert_any_call(url, headers=self.service.headers, params={}, timeout=60)
+        mock_get.assert_any_call(url, headers=self.service.headers, params={'page-token': 'next_page'}, timeout=60)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_get_new_circleci_pipelines_for_repository_stops_at_max_pipelines(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value={
+            "items": [{"id": f"pipeline{index}", "created_at": f"2024-01-{index:02}"} for index in range(20, 0, -1)],
+            "next_page_token": "next_page"}))
+
+        pipelines = self.service.get_new_circleci_pipelines_for_repository("test_repo", max_pipelines=5)
+
+        self.assertEqual(len(pipelines), 5)
+        mock_get.assert_called_once()
+
+    def test_get_new_circleci_pipelines_for_repository_failure(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=404, text="Not Found")
+
+        self.assertEqual(self.service.get_new_circleci_pipelines_for_repository("test_repo"), [])
+
     def test_get_pipeline_configurations_from_pipeline_id_success(self, mock_get):
         pipeline_id = "test_pipeline_id"
         mock_response = MagicMock()
@@ -58,7 +99,12 @@ class TestCircleciService(unittest.TestCase):
         mock_get.return_value = mock_response
 
         config = self.service.get_pipeline_configurations_from_pipeline_id(pipeline_id)
-        self.assertEqual(config, {})
+        self.assertIsNone(config)
+
+    def test_get_contexts_from_pipeline_id_returns_none_when_the_configuration_cannot_be_fetched(self, _mock_get):
+        self.service.get_pipeline_configurations_from_pipeline_id = MagicMock(return_value=None)
+
+        self.assertIsNone(self.service.get_contexts_from_pipeline_id("pipeline1"))
 
     def test_find_all_contexts_from_configuration(self, _mock_get):
         configuration = {
@@ -198,6 +244,303 @@ class TestCircleciService(unittest.TestCase):
         self.service.get_pipeline_configurations_from_pipeline_id.assert_any_call("pipeline2")
         self.service.find_all_contexts_from_configuration.assert_any_call(yaml.safe_load("compiled_config_data1"))
 
+    def test_get_contexts_from_pipeline_id(self, _mock_get):
+        self.service.get_pipeline_configurations_from_pipeline_id = MagicMock(return_value={
+            "compiled": "jobs:\n  build:\n    context: context1\n",
+            "compiled-setup-config": "workflows:\n  setup:\n    jobs:\n      - setup:\n          context: [context2]\n"
+        })
+
+        self.assertEqual(self.service.get_contexts_from_pipeline_id("pipeline1"), {"context1", "context2"})
+
+    def test_get_contexts_from_pipeline_id_parses_each_configuration_once(self, _mock_get):
+        self.service.get_pipeline_configurations_from_pipeline_id = MagicMock(return_value={
+            "compiled": "jobs:\n  build:\n    context: context1\n", "compiled-setup-config": ""})
+
+        with patch("services.circleci_service.load_configuration", wraps=load_configuration) as mock_load_configuration:
+            self.service.get_contexts_from_pipeline_id("pipeline1")
+            self.assertEqual(self.service.get_contexts_from_pipeline_id("pipeline2"), {"context1"})
+
+        self.assertEqual(mock_load_configuration.call_count, 2)
+
+    def test_get_all_used_contexts_for_repositories(self, _mock_get):
+        self.service.get_circleci_pipelines_for_repository = MagicMock(side_effect=lambda repo: {
+            "repo1": [{"id": "pipeline1"}, {"id": "pipeline2"}],
+            "repo2": [],
+            "repo3": [{"id": "pipeline3"}]
+        }[repo])
+        self.service.get_contexts_from_pipeline_id = MagicMock(side_effect=lambda pipeline_id: {
+            "pipeline1": {"context1"},
+            "pipeline2": {"context1", "context2"},
+            "pipeline3": {"context3"}
+        }[pipeline_id])
+
+        all_used_contexts = self.service.get_all_used_contexts_for_repositories(
+            ["repo1", "repo2", "repo3"], max_concurrent_requests=2)
+
+        self.assertEqual(all_used_contexts, {"context1", "context2", "context3"})
+        self.assertEqual(self.service.get_contexts_from_pipeline_id.call_count, 3)
+
+    def test_get_all_used_contexts_for_repositories_raises_fetch_errors(self, _mock_get):
+        self.service.get_circleci_pipelines_for_repository = MagicMock(return_value=[{"id": "pipeline1"}])
+        self.service.get_contexts_from_pipeline_id = MagicMock(side_effect=TimeoutError)
+
+        self.assertRaises(TimeoutError, self.service.get_all_used_contexts_for_repositories, ["repo1"])
+
+    def test_get_all_used_contexts_for_repositories_keeps_requests_within_max_concurrent_requests(self, mock_get):
+        in_flight = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def get(url, **_kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            if url.endswith("/config"):
+                return MagicMock(status_code=200, json=MagicMock(return_value={
+                    "compiled": "jobs:\n  build:\n    context: context1\n", "compiled-setup-config": ""}))
+            repo = url.split("/")[-2]
+            return MagicMock(status_code=200, json=MagicMock(return_value={
+                "items": [{"id": f"{repo}_pipeline{index}"} for index in range(3)]}))
+
+        mock_get.side_effect = get
+
+        all_used_contexts = self.service.get_all_used_contexts_for_repositories(
+            [f"repo{index}" for index in range(6)], max_concurrent_requests=2)
+
+        self.assertEqual(all_used_contexts, {"context1"})
+        self.assertEqual(mock_get.call_count, 24)
+        self.assertLessEqual(in_flight["max"], 2)
+
+
+@patch("clients.http_transport.get")
+class TestIncrementalPipelineScan(unittest.TestCase):
+    def setUp(self):
+        self.state_directory = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.state_directory.name, "pipeline_scan_state.json")
+        self.service = CircleciService("test_token", "test_owner_id", "test_org")
+        self.pipelines = {
+            "repo1": [{"id": "pipeline1", "created_at": "2024-01-01", "vcs": {"revision": "revision1"}}],
+            "repo2": [{"id": "pipeline2", "created_at": "2024-01-02", "vcs": {"revision": "revision2"}}]
+        }
+        self.service.get_new_circleci_pipelines_for_repository = MagicMock(
+            side_effect=lambda repo, newest_seen: [pipeline for pipeline in self.pipelines[repo]
+                                                   if not newest_seen or pipeline["created_at"] > newest_seen["created_at"]])
+        self.service.get_contexts_from_pipeline_id = MagicMock(side_effect=lambda pipeline_id: {
+            "pipeline1": {"context1"},
+            "pipeline2": {"context2"},
+            "pipeline3": {"context3"}
+        }[pipeline_id])
+
+    def tearDown(self):
+        self.state_directory.cleanup()
+
+    def test_first_scan_saves_the_pipelines_seen(self, _mock_get):
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo1", "repo2"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context1", "context2"})
+        with open(self.state_path, encoding="utf-8") as state_file:
+            self.assertEqual(json.load(state_file), {
+                "repo1": [{"id": "pipeline1", "created_at": "2024-01-01", "revision": "revision1", "contexts": ["context1"]}],
+                "repo2": [{"id": "pipeline2", "created_at": "2024-01-02", "revision": "revision2", "contexts": ["context2"]}]
+            })
+
+    def test_next_scan_fetches_only_new_pipelines(self, _mock_get):
+        self.service.get_all_used_contexts_for_repositories(["repo1", "repo2"], state_path=self.state_path)
+        self.pipelines["repo1"].insert(0, {"id": "pipeline3", "created_at": "2024-01-03", "vcs": {"revision": "revision3"}})
+        self.service.get_contexts_from_pipeline_id.reset_mock()
+
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo1", "repo2"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context1", "context2", "context3"})
+        self.service.get_contexts_from_pipeline_id.assert_called_once_with("pipeline3")
+        self.service.get_new_circleci_pipelines_for_repository.assert_any_call(
+            "repo1", {"id": "pipeline1", "created_at": "2024-01-01", "revision": "revision1", "contexts": ["context1"]})
+
+    def test_keeps_only_the_newest_pipelines_of_each_repository(self, _mock_get):
+        self.service.PIPELINES_KEPT_PER_REPOSITORY = 1
+        self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+        self.pipelines["repo1"].insert(0, {"id": "pipeline3", "created_at": "2024-01-03", "vcs": {"revision": "revision3"}})
+
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context3"})
+
+    def test_drops_repositories_no_longer_scanned(self, _mock_get):
+        self.service.get_all_used_contexts_for_repositories(["repo1", "repo2"], state_path=self.state_path)
+
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo2"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context2"})
+        with open(self.state_path, encoding="utf-8") as state_file:
+            self.assertEqual(list(json.load(state_file)), ["repo2"])
+
+    def test_fetches_failed_pipelines_again_on_the_next_scan(self, _mock_get):
+        self.pipelines["repo1"] = [
+            {"id": "pipeline3", "created_at": "2024-01-03", "vcs": {"revision": "revision3"}},
+            {"id": "pipeline2", "created_at": "2024-01-02", "vcs": {"revision": "revision2"}},
+            {"id": "pipeline1", "created_at": "2024-01-01", "vcs": {"revision": "revision1"}},
+        ]
+        contexts = {"pipeline1": {"context1"}, "pipeline2": None, "pipeline3": {"context3"}}
+        self.service.get_contexts_from_pipeline_id.side_effect = lambda pipeline_id: contexts[pipeline_id]
+
+        first_scan_contexts = self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+
+        self.assertEqual(first_scan_contexts, {"context1", "context3"})
+        with open(self.state_path, encoding="utf-8") as state_file:
+            self.assertEqual([pipeline["id"] for pipeline in json.load(state_file)["repo1"]], ["pipeline1"])
+
+        contexts["pipeline2"] = {"context2"}
+        self.service.get_contexts_from_pipeline_id.reset_mock()
+        second_scan_contexts = self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+
+        self.assertEqual(second_scan_contexts, {"context1", "context2", "context3"})
+        self.service.get_new_circleci_pipelines_for_repository.assert_called_with(
+            "repo1", {"id": "pipeline1", "created_at": "2024-01-01", "revision": "revision1", "contexts": ["context1"]})
+        self.assertEqual(sorted(call.args[0] for call in self.service.get_contexts_from_pipeline_id.call_args_list),
+                         ["pipeline2", "pipeline3"])
+        with open(self.state_path, encoding="utf-8") as state_file:
+            self.assertEqual([pipeline["id"] for pipeline in json.load(state_file)["repo1"]],
+                             ["pipeline3", "pipeline2", "pipeline1"])
+
+    def test_reuses_the_contexts_of_a_kept_revision(self, _mock_get):
+        self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+        self.pipelines["repo1"].insert(0, {"id": "pipeline3", "created_at": "2024-01-03", "vcs": {"revision": "revision1"}})
+        self.service.get_contexts_from_pipeline_id.reset_mock()
+
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context1"})
+        self.service.get_contexts_from_pipeline_id.assert_not_called()
+
+    def test_reads_state_saved_without_revisions(self, _mock_get):
+        with open(self.state_path, "w", encoding="utf-8") as state_file:
+            json.dump({"repo1": [{"id": "pipeline1", "created_at": "2024-01-01", "contexts": ["context1"]}]}, state_file)
+
+        contexts = self.service.get_all_used_contexts_for_repositories(["repo1"], state_path=self.state_path)
+
+        self.assertEqual(contexts, {"context1"})
+        self.service.get_contexts_from_pipeline_id.assert_not_called()
+
+
+@patch("clients.http_transport.get")
+class TestPipelineRevisionDeduplication(unittest.TestCase):
+    def setUp(self):
+        self.service = CircleciService("test_token", "test_owner_id", "test_org")
+        self.pipelines = [
+            {"id": "pipeline5", "vcs": {"revision": "revision3"}},
+            {"id": "pipeline4", "vcs": {"revision": "revision3"}},
+            {"id": "pipeline3", "vcs": {"revision": "revision2"}},
+            {"id": "pipeline2", "vcs": {"revision": "revision1"}},
+            {"id": "pipeline1", "vcs": {"revision": "revision2"}},
+            {"id": "pipeline0"},
+        ]
+
+    def test_group_pipelines_by_revision(self, _mock_get):
+        revisions = self.service.group_pipelines_by_revision(self.pipelines)
+
+        self.assertEqual({revision: [pipeline["id"] for pipeline in pipelines] for revision, pipelines in revisions.items()}, {
+            "revision3": ["pipeline5", "pipeline4"],
+            "revision2": ["pipeline3", "pipeline1"],
+            "revision1": ["pipeline2"],
+            "pipeline0": ["pipeline0"]
+        })
+
+    def test_group_pipelines_by_revision_keeps_the_newest_revisions(self, _mock_get):
+        revisions = self.service.group_pipelines_by_revision(self.pipelines, max_revisions=2)
+
+        self.assertEqual(list(revisions), ["revision3", "revision2"])
+        self.assertEqual([pipeline["id"] for pipeline in revisions["revision2"]], ["pipeline3", "pipeline1"])
+
+    def test_fetches_one_configuration_per_revision(self, _mock_get):
+        self.service.get_circleci_pipelines_for_repository = MagicMock(return_value=self.pipelines)
+        self.service.get_contexts_from_pipeline_id = MagicMock(return_value={"context1"})
+
+        self.service.get_all_used_contexts_for_repositories(["repo1"])
+
+        self.assertEqual(sorted(call.args[0] for call in self.service.get_contexts_from_pipeline_id.call_args_list),
+                         ["pipeline0", "pipeline2", "pipeline3", "pipeline5"])
+
+    def test_fetches_only_the_newest_revisions_when_asked(self, _mock_get):
+        self.service.get_circleci_pipelines_for_repository = MagicMock(return_value=self.pipelines)
+        self.service.get_contexts_from_pipeline_id = MagicMock(return_value={"context1"})
+
+        self.service.get_all_used_contexts_for_repositories(["repo1"], max_revisions_per_repository=1)
+
+        self.service.get_contexts_from_pipeline_id.assert_called_once_with("pipeline5")
+
+
+class TestPipelineScanProgress(unittest.TestCase):
+
+    @patch("builtins.print")
+    def test_reports_progress_every_interval(self, mock_print):
+        progress = PipelineScanProgress(2)
+        progress.add_repository(3)
+        progress.add_configuration({"context1"})
+        mock_print.assert_not_called()
+        progress.add_configuration({"context2"})
+        mock_print.assert_called_once_with(
+            "Fetched 2 of 3 pipeline configurations from 1 repositories, 2 contexts found so far")
+        self.assertEqual(progress.contexts, {"context1", "context2"})
+
+
+class TestContextExtraction(unittest.TestCase):
+    CONFIGURATION = """
+version: 2.1
+jobs:
+  build:
+    docker:
+      - image: cimg/base:stable
+    steps:
+      - checkout
+      - run:
+          name: context
+          command: echo context
+workflows:
+  build_and_deploy:
+    jobs:
+      - build:
+          context: context1
+      - deploy:
+          context:
+            - context2
+            - context3
+          requires: [build]
+      - release:
+          context: [context4]
+      - ignored:
+          context: 42
+      - nested:
+          matrix:
+            parameters:
+              context: context5
+"""
+
+    def test_find_contexts(self):
+        self.assertEqual(find_contexts(load_configuration(self.CONFIGURATION)), {
+                         "context1", "context2", "context3", "context4", "context5"})
+
+    def test_scan_contexts_matches_find_contexts(self):
+        self.assertEqual(scan_contexts(self.CONFIGURATION), find_contexts(
+            load_configuration(self.CONFIGURATION)))
+
+    def test_scan_contexts_of_empty_configuration(self):
+        self.assertEqual(scan_contexts(""), set())
+        self.assertEqual(find_contexts(load_configuration("")), set())
+
+    @patch("clients.http_transport.get")
+    def test_service_scans_configuration_events_when_asked(self, _mock_get):
+        service = CircleciService("test_token", "test_owner_id", "test_org", scan_configuration_events=True)
+        service.get_pipeline_configurations_from_pipeline_id = MagicMock(return_value={
+            "compiled": self.CONFIGURATION, "compiled-setup-config": ""})
+
+        with patch("services.circleci_service.load_configuration") as mock_load_configuration:
+            contexts = service.get_contexts_from_pipeline_id("pipeline1")
+
+        self.assertEqual(contexts, {"context1", "context2", "context3", "context4", "context5"})
+        mock_load_configuration.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,7 +11,7 @@ class TestGandiService(unittest.TestCase):
         self.org_id = "example_org_id"
         self.gandi_service = GandiService(self.token, self.url_extension)
 
-    @patch('services.gandi_service.requests.get')
+    @patch('clients.http_transport.get')
     def test_get_current_account_balance_from_org_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = {'prepaid': {'amount': '100.00'}}
@@ -21,14 +21,14 @@ class TestGandiService(unittest.TestCase):
         balance = self.gandi_service.get_current_account_balance_from_org(self.org_id)
         self.assertEqual(balance, 100.00)
 
-    @patch('services.gandi_service.requests.get')
+    @patch('clients.http_transport.get')
     def test_get_current_account_balance_from_org_http_error(self, mock_get):
         mock_get.side_effect = requests.exceptions.HTTPError("Unauthorized")
 
         with self.assertRaises(requests.exceptions.HTTPError):
             self.gandi_service.get_current_account_balance_from_org(self.org_id)
 
-    @patch('services.gandi_service.requests.get')
+    @patch('clients.http_transport.get')
     def test_get_current_account_balance_from_org_type_error(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = {}
@@ -1,21 +1,27 @@
+import asyncio
+import json
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
-from unittest.mock import MagicMock, Mock, call, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 from freezegun import freeze_time
 from github import (Github, GithubException, RateLimitExceededException,
                     UnknownObjectException)
 from github.Branch import Branch
-from github.Commit import Commit
-from github.GitCommit import GitCommit
 from github.NamedUser import NamedUser
 from github.Organization import Organization
 from github.Repository import Repository
-from github.Variable import Variable
-from gql.transport.exceptions import TransportQueryError
+from github.Team import Team
+from gql.transport.exceptions import TransportQueryError, TransportServerError
 
+from clients.conditional_request_cache import ConditionalRequestCacheAdapter
+from clients.github_graphql_telemetry import GraphQLTelemetry
+from clients.github_rate_limit_governor import RateLimitGovernorAdapter
 from services.github_service import (
-    GithubService, retries_github_rate_limit_exception_at_next_reset_once)
+    CommitActivityIndex, GithubService,
+    retries_github_rate_limit_exception_at_next_reset_once)
 
 # pylint: disable=E1101
 
@@ -116,120 +122,143 @@ class TestGithubServiceInit(unittest.TestCase):
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
+@patch("services.github_service.Github", new=MagicMock())
+class TestGithubServiceConditionalRequestCache(unittest.TestCase):
+
+    def test_requests_are_governed_by_default(self):
+        github_service = GithubService("", ORGANISATION_NAME)
+        adapter = github_service.github_client_rest_api.get_adapter(
+            "https://api.github.com")
+        self.assertIsInstance(adapter, RateLimitGovernorAdapter)
+        self.assertIs(adapter.governor, github_service.rate_limit_governor)
+        self.assertNotIsInstance(
+            adapter.adapter, ConditionalRequestCacheAdapter)
+
+    def test_cache_is_mounted_on_rest_and_core_clients(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            github_service = GithubService(
+                "", ORGANISATION_NAME, http_cache_directory=cache_directory)
+            self.assertIsInstance(github_service.github_client_rest_api.get_adapter(
+                "https://api.github.com").adapter, ConditionalRequestCacheAdapter)
+            connection = github_service.github_client_core_api._Github__requester._Requester__connectionClass(
+                "api.github.com", 443)
+            adapter = connection.session.get_adapter("https://api.github.com")
+            self.assertIsInstance(adapter, RateLimitGovernorAdapter)
+            self.assertIsInstance(
+                adapter.adapter, ConditionalRequestCacheAdapter)
+
+
+@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
+@patch("gql.Client.__new__")
 @patch("github.Github.__new__")
 class TestGithubServiceArchiveInactiveRepositories(unittest.TestCase):
 
     # Default for archiving a repository
     # pylint: disable=R0917
-    def __get_repository(self, last_active_date: datetime, created_at_date: datetime, archived: bool = False, fork: bool = False, repo_name: str = None, has_commits: bool = True) -> Mock:
-        repository_to_consider_for_archiving = Mock(
-            Repository, archived=archived, fork=fork)
-        repository_to_consider_for_archiving.name = repo_name
-        repository_to_consider_for_archiving.created_at = created_at_date
-        repository_to_consider_for_archiving.get_commits.return_value = (
-            [Mock(Commit, commit=Mock(GitCommit, author=Mock(
-                NamedUser, date=last_active_date)))] if has_commits else None
-        )
-        return repository_to_consider_for_archiving
+    def __get_repository(self, last_active_date: datetime, created_at_date: datetime, archived: bool = False, fork: bool = False, repo_name: str = "test_repository", has_commits: bool = True) -> dict:
+        return {
+            "name": repo_name,
+            "isArchived": archived,
+            "isFork": fork,
+            "createdAt": created_at_date.isoformat() + "Z",
+            "defaultBranchRef": {"target": {"committedDate": last_active_date.isoformat() + "Z"}} if has_commits else None,
+        }
+
+    def __get_page(self, repositories: list[dict], has_next_page: bool = False) -> dict:
+        return {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": has_next_page, "endCursor": "test_cursor" if has_next_page else None},
+                    "nodes": repositories,
+                }
+            }
+        }
 
     def setUp(self):
         self.last_active_cutoff_date = datetime.now()
         self.before_cutoff = self.last_active_cutoff_date - timedelta(days=1)
         self.after_cutoff = self.last_active_cutoff_date + timedelta(days=1)
 
-    def test_no_archive_when_repo_is_archived(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.after_cutoff, created_at_date=self.after_cutoff, archived=True)
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
-        GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
-            self.last_active_cutoff_date, [])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_no_archive_when_repo_is_forked(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.after_cutoff, created_at_date=self.after_cutoff, fork=True)
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
-        GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
-            self.last_active_cutoff_date, [])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_no_archive_when_recently_active(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.after_cutoff, created_at_date=self.after_cutoff)
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
-        GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
-            self.last_active_cutoff_date, [])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_no_archive_when_recently_created(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.after_cutoff, created_at_date=self.after_cutoff)
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
+    def __archive(self, mock_github_client_core_api, mock_github_client_gql_api, repositories: list[dict], allow_list: list[str] = None) -> MagicMock:
+        mock_github_client_gql_api.return_value.execute.return_value = self.__get_page(
+            repositories)
         GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
-            self.last_active_cutoff_date, [])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_no_archive_when_on_allow_list(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.after_cutoff, created_at_date=self.after_cutoff, repo_name="allow_me")
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
-        GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(self.last_active_cutoff_date,
-                                                                               ["allow_me"])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_no_archive_when_repo_has_no_commits_and_created_after_cutoff(self, mock_github_client_core_api):
-        repo = self.__get_repository(
-            last_active_date=self.before_cutoff, created_at_date=self.after_cutoff, has_commits=False)
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            repo,
-            repo,
-            repo
-        ]
-        GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
-            self.last_active_cutoff_date, [])
-        self.assertEqual(repo.edit.called, False)
-
-    def test_archives_inactive_repositories(self, mock_github_client_core_api):
-        repo = self.__get_repository(self.before_cutoff, self.before_cutoff)
-        repo_on_allow_list = self.__get_repository(
-            self.before_cutoff, self.before_cutoff, repo_name="allow_this")
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            Mock(Repository, archived=False, fork=True),
-            repo,
-            Mock(Repository, archived=True, fork=True),
-            Mock(Repository, archived=False, fork=True),
-            repo,
-            Mock(Repository, archived=True, fork=True),
-            Mock(Repository, archived=True, fork=False),
-            repo_on_allow_list,
-            repo_on_allow_list,
+            self.last_active_cutoff_date, allow_list or [])
+        return mock_github_client_core_api.return_value.get_repo
+
+    def test_no_archive_when_repo_is_archived(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.before_cutoff, archived=True)])
+        mock_get_repo.assert_not_called()
+
+    def test_no_archive_when_repo_is_forked(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.before_cutoff, fork=True)])
+        mock_get_repo.assert_not_called()
+
+    def test_no_archive_when_recently_active(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.after_cutoff, created_at_date=self.before_cutoff)])
+        mock_get_repo.assert_not_called()
+
+    def test_no_archive_when_recently_created(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.after_cutoff)])
+        mock_get_repo.assert_not_called()
+
+    def test_no_archive_when_on_allow_list(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.before_cutoff, repo_name="allow_me")], ["allow_me"])
+        mock_get_repo.assert_not_called()
+
+    def test_no_archive_when_repo_has_no_commits_and_created_after_cutoff(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.after_cutoff, has_commits=False)])
+        mock_get_repo.assert_not_called()
+
+    def test_archives_repo_with_no_commits_created_before_cutoff(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_get_repo = self.__archive(mock_github_client_core_api, mock_github_client_gql_api, [self.__get_repository(
+            last_active_date=self.before_cutoff, created_at_date=self.before_cutoff, has_commits=False)])
+        mock_get_repo.assert_called_once_with(
+            f"{ORGANISATION_NAME}/test_repository", lazy=True)
+        mock_get_repo.return_value.edit.assert_called_once_with(archived=True)
+
+    def test_archives_inactive_repositories(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_github_client_gql_api.return_value.execute.side_effect = [
+            self.__get_page([
+                self.__get_repository(
+                    self.before_cutoff, self.before_cutoff, fork=True, repo_name="fork"),
+                self.__get_repository(
+                    self.before_cutoff, self.before_cutoff, repo_name="inactive_1"),
+                self.__get_repository(
+                    self.after_cutoff, self.before_cutoff, repo_name="active"),
+            ], has_next_page=True),
+            self.__get_page([
+                self.__get_repository(
+                    self.before_cutoff, self.before_cutoff, repo_name="inactive_2"),
+                self.__get_repository(
+                    self.before_cutoff, self.before_cutoff, repo_name="allow_this"),
+            ]),
         ]
 
         GithubService("", ORGANISATION_NAME).archive_all_inactive_repositories(
             self.last_active_cutoff_date, ["allow_this"])
 
-        repo.edit.assert_has_calls(
-            [call(archived=True), call(archived=True)])
+        mock_get_repo = mock_github_client_core_api.return_value.get_repo
+        mock_get_repo.assert_has_calls([
+            call(f"{ORGANISATION_NAME}/inactive_1", lazy=True),
+            call().edit(archived=True),
+            call(f"{ORGANISATION_NAME}/inactive_2", lazy=True),
+            call().edit(archived=True),
+        ])
+        self.assertEqual(mock_get_repo.call_count, 2)
+        self.assertEqual(mock_github_client_gql_api.return_value.execute.call_args.kwargs["variable_values"]["after_cursor"],
+                         "test_cursor")
+        mock_github_client_core_api.return_value.get_organization.return_value.get_repos.assert_not_called()
+
+    def test_get_paginated_list_of_repositories_with_last_commit_date_raises_for_large_page_size(self, _mock_github_client_core_api, _mock_github_client_gql_api):
+        self.assertRaises(ValueError, GithubService("", ORGANISATION_NAME).get_paginated_list_of_repositories_with_last_commit_date,
+                          None, 101)
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
@@ -280,8 +309,8 @@ class TestGithubServiceGetOutsideCollaborators(unittest.TestCase):
 @patch("github.Github.__new__")
 class TestGithubServiceAddAllUsersToTeam(unittest.TestCase):
 
-    def __create_user(self, name: str) -> Mock:
-        return Mock(NamedUser, name=name)
+    def __create_user(self, login: str) -> Mock:
+        return Mock(NamedUser, login=login)
 
     def test_adds_users_not_currently_in_team(self, mock_github_client_core_api, mock_github_client_gql_api):
         user_1 = self.__create_user("user_1")
@@ -302,8 +331,8 @@ class TestGithubServiceAddAllUsersToTeam(unittest.TestCase):
 
         github_service = GithubService("", ORGANISATION_NAME)
         github_service.add_all_users_to_team("test_team_name")
-        mock_team.assert_has_calls(
-            [call.add_membership(user_3), call.add_membership(user_4)])
+        mock_team.add_membership.assert_has_calls(
+            [call(user_3), call(user_4)], any_order=True)
 
     def test_adds_no_users_when_all_user_already_exist(self, mock_github_client_core_api, mock_github_client_gql_api):
         user_1 = self.__create_user("user_1")
@@ -331,6 +360,53 @@ class TestGithubServiceAddAllUsersToTeam(unittest.TestCase):
         self.assertRaises(
             ConnectionError, github_service.add_all_users_to_team, "test_team_name")
 
+    def test_matches_existing_team_members_by_login(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_github_client_gql_api.return_value.execute.return_value = {
+            "organization": {"team": {"databaseId": 1}}}
+        mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
+            self.__create_user("User_1"), self.__create_user("user_2")
+        ]
+        mock_team = mock_github_client_core_api.return_value.get_organization().get_team()
+        mock_team.get_members.return_value = [
+            self.__create_user("user_1")]
+
+        added_users = GithubService("", ORGANISATION_NAME).add_all_users_to_team(
+            "test_team_name")
+
+        self.assertEqual(added_users, ["user_2"])
+        mock_team.add_membership.assert_called_once()
+        mock_team.get_members.assert_called_once()
+
+    def test_dry_run_reports_planned_additions_without_adding(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_github_client_gql_api.return_value.execute.return_value = {
+            "organization": {"team": {"databaseId": 1}}}
+        mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
+            self.__create_user("user_1"), self.__create_user("user_2")
+        ]
+        mock_team = mock_github_client_core_api.return_value.get_organization().get_team()
+        mock_team.get_members.return_value = []
+
+        with self.assertLogs(level="INFO") as logs:
+            planned_users = GithubService("", ORGANISATION_NAME).add_all_users_to_team(
+                "test_team_name", dry_run=True)
+
+        self.assertEqual(planned_users, ["user_1", "user_2"])
+        self.assertIn(
+            "INFO:root:Dry run: would add user user_2 to team test_team_name", logs.output)
+        mock_team.add_membership.assert_not_called()
+
+    def test_raises_exception_when_adding_a_user_fails(self, mock_github_client_core_api, mock_github_client_gql_api):
+        mock_github_client_gql_api.return_value.execute.return_value = {
+            "organization": {"team": {"databaseId": 1}}}
+        mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
+            self.__create_user("user_1")]
+        mock_team = mock_github_client_core_api.return_value.get_organization().get_team()
+        mock_team.get_members.return_value = []
+        mock_team.add_membership.side_effect = ConnectionError
+
+        self.assertRaises(ConnectionError, GithubService("", ORGANISATION_NAME).add_all_users_to_team,
+                          "test_team_name")
+
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__")
@@ -346,22 +422,6 @@ class TestGithubServiceGetTeamIdFromTeamName(unittest.TestCase):
         ])
 
 
-@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
-@patch("gql.Client.__new__", new=MagicMock)
-@patch("github.Github.__new__", new=MagicMock)
-class TestGithubServiceGetPaginatedListOfOrgRepositoryNames(unittest.TestCase):
-    def test_calls_downstream_services(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_paginated_list_of_org_repository_names(
-            "test_after_cursor")
-        github_service.github_client_gql_api.execute.assert_called_once()
-
-    def test_throws_value_error_when_page_size_greater_than_limit(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-        self.assertRaises(
-            ValueError, github_service.get_paginated_list_of_org_repository_names, "test_after_cursor", 101)
-
-
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__", new=MagicMock)
@@ -401,113 +461,110 @@ class TestGithubServiceGetPaginatedListOfTeamNames(unittest.TestCase):
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__", new=MagicMock)
-class TestGithubServiceGetPaginatedListOfTeamRepositories(unittest.TestCase):
-    def test_calls_downstream_services(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_paginated_list_of_team_repositories(
-            "test_team_name", "test_after_cursor")
+class TestGithubServiceAdaptsGraphQLPageSize(unittest.TestCase):
+
+    def __get_github_service(self) -> GithubService:
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.graphql_telemetry = GraphQLTelemetry()
+        return github_service
+
+    @staticmethod
+    def __page_sizes(mock_execute: MagicMock) -> list[int]:
+        return [call.kwargs["variable_values"]["page_size"] for call in mock_execute.call_args_list]
+
+    def test_records_rate_limit_cost_of_each_page(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.return_value = {
+            "rateLimit": {"cost": 1, "nodeCount": 80, "remaining": 4999}}
+        github_service.get_paginated_list_of_team_names(None)
+        statistics = github_service.graphql_telemetry.statistics[
+            "get_paginated_list_of_team_names"]
+        self.assertEqual(statistics.queries, 1)
+        self.assertEqual(statistics.cost, 1)
+        self.assertEqual(statistics.remaining, 4999)
+
+    def test_resends_a_timed_out_page_at_a_smaller_page_size(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.side_effect = [
+            TimeoutError(), {"rateLimit": {"cost": 1}}]
+        github_service.get_paginated_list_of_team_names(None)
+        self.assertEqual(self.__page_sizes(
+            github_service.github_client_gql_api.execute), [80, 40])
+        self.assertEqual(github_service.graphql_telemetry.statistics[
+            "get_paginated_list_of_team_names"].failures, 1)
+
+    def test_resends_a_page_after_a_bad_gateway_error(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.side_effect = [
+            TransportServerError("bad gateway", 502), {}]
+        github_service.get_paginated_list_of_team_names(None, 50)
+        self.assertEqual(self.__page_sizes(
+            github_service.github_client_gql_api.execute), [50, 25])
+
+    def test_resends_a_timed_out_audit_log_page_at_a_smaller_page_size(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.side_effect = [
+            TimeoutError(), {"organization": {"auditLog": {
+                "edges": [], "pageInfo": {"hasNextPage": False, "endCursor": None}}}}]
+        github_service.check_for_audit_log_new_members("2023-12-01")
+        self.assertEqual(self.__page_sizes(
+            github_service.github_client_gql_api.execute), [100, 50])
+        self.assertEqual(github_service.graphql_telemetry.statistics[
+            "__get_paginated_audit_log_entries"].failures, 1)
+
+    def test_grows_the_page_size_after_cheap_pages(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.return_value = {
+            "rateLimit": {"cost": 1}}
+        github_service.get_paginated_list_of_team_names(None)
+        github_service.get_paginated_list_of_team_names("test_after_cursor")
+        self.assertEqual(self.__page_sizes(
+            github_service.github_client_gql_api.execute), [80, 100])
+
+    def test_raises_other_server_errors(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.side_effect = TransportServerError(
+            "forbidden", 403)
+        self.assertRaises(
+            TransportServerError, github_service.get_paginated_list_of_team_names, None)
         github_service.github_client_gql_api.execute.assert_called_once()
 
-    def test_throws_value_error_when_page_size_greater_than_limit(self):
-        github_service = GithubService("", ORGANISATION_NAME)
+    def test_raises_timeouts_at_the_minimum_page_size(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_gql_api.execute.side_effect = TimeoutError()
         self.assertRaises(
-            ValueError, github_service.get_paginated_list_of_team_repositories, "test_team_name", "test_after_cursor",
-            101)
+            TimeoutError, github_service.get_paginated_list_of_team_names, None, 20)
+        self.assertEqual(self.__page_sizes(
+            github_service.github_client_gql_api.execute), [20, 10])
+
+    def test_adapts_asynchronous_queries(self):
+        github_service = self.__get_github_service()
+        session = MagicMock()
+        session.execute = AsyncMock(
+            side_effect=[TimeoutError(), {"rateLimit": {"cost": 1}}])
+        asyncio.run(github_service.get_paginated_list_of_repository_outside_collaborators_async(
+            session, "test_repo", None))
+        self.assertEqual(
+            [call.kwargs["variable_values"]["page_size"] for call in session.execute.call_args_list], [100, 50])
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__", new=MagicMock)
-class TestGithubServiceGetPaginatedListOfUserNames(unittest.TestCase):
+class TestGithubServiceGetPaginatedListOfTeamRepositories(unittest.TestCase):
     def test_calls_downstream_services(self):
         github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_paginated_list_of_team_user_names(
+        github_service.get_paginated_list_of_team_repositories(
             "test_team_name", "test_after_cursor")
         github_service.github_client_gql_api.execute.assert_called_once()
 
     def test_throws_value_error_when_page_size_greater_than_limit(self):
         github_service = GithubService("", ORGANISATION_NAME)
         self.assertRaises(
-            ValueError, github_service.get_paginated_list_of_team_user_names, "test_team_name", "test_after_cursor",
+            ValueError, github_service.get_paginated_list_of_team_repositories, "test_team_name", "test_after_cursor",
             101)
 
 
-@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
-@patch("gql.Client.__new__", new=MagicMock)
-@patch("github.Github.__new__")
-class TestGithubServiceGetRepositoryCollaborators(unittest.TestCase):
-
-    def test_returns_direct_users(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo().get_collaborators.return_value = [
-            Mock(NamedUser),
-            Mock(NamedUser),
-        ]
-        response = GithubService(
-            "", ORGANISATION_NAME).get_repository_collaborators("some-repo")
-        self.assertEqual(2, len(response))
-
-    def test_calls_downstream_services(self, _mock_github_client_core_api):
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_repository_collaborators("test_repository")
-        github_service.github_client_core_api.get_repo.assert_has_calls([
-            call(TEST_REPOSITORY),
-            call().get_collaborators('outside'),
-            call().get_collaborators().__bool__(),
-            call().get_collaborators().__iter__()
-        ])
-
-    def test_returns_empty_list_when_direct_users_returns_none(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo(
-        ).get_collaborators.return_value = None
-        self.assertEqual([], GithubService(
-            "", ORGANISATION_NAME).get_repository_collaborators("test_repository"))
-
-    def test_returns_exception_when_direct_users_returns_exception(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo(
-        ).get_collaborators.side_effect = ConnectionError
-        github_service = GithubService("", ORGANISATION_NAME)
-        self.assertRaises(
-            ConnectionError, github_service.get_repository_collaborators, "test_repository")
-
-
-@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
-@patch("gql.Client.__new__", new=MagicMock)
-@patch("github.Github.__new__")
-class TestGithubServiceGetRepositoryDirectUsers(unittest.TestCase):
-
-    def test_returns_direct_users(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo().get_collaborators.return_value = [
-            Mock(NamedUser),
-            Mock(NamedUser),
-        ]
-        response = GithubService(
-            "", ORGANISATION_NAME).get_repository_direct_users("some-repo")
-        self.assertEqual(2, len(response))
-
-    def test_calls_downstream_services(self, _mock_github_client_core_api):
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_repository_direct_users("test_repository")
-        github_service.github_client_core_api.get_repo.assert_has_calls([
-            call(TEST_REPOSITORY),
-            call().get_collaborators('direct'),
-            call().get_collaborators().__bool__(),
-            call().get_collaborators().__iter__()
-        ])
-
-    def test_returns_empty_list_when_direct_users_returns_none(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo(
-        ).get_collaborators.return_value = None
-        self.assertEqual([], GithubService(
-            "", ORGANISATION_NAME).get_repository_direct_users("test_repository"))
-
-    def test_returns_exception_when_direct_users_returns_exception(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo(
-        ).get_collaborators.side_effect = ConnectionError
-        github_service = GithubService("", ORGANISATION_NAME)
-        self.assertRaises(
-            ConnectionError, github_service.get_repository_direct_users, "test_repository")
-
-
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__")
 @patch("github.Github.__new__", new=MagicMock)
@@ -629,45 +686,75 @@ class TestGithubServiceGetTeamNames(unittest.TestCase):
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__", new=MagicMock)
-class TestGithubServiceGetTeamUserNames(unittest.TestCase):
+class TestGithubServiceGetRepositoryOwnershipIndex(unittest.TestCase):
     def setUp(self):
-        self.return_data = {
+        self.repositories_data = {
             "organization": {
-                "team": {
-                    "members": {
-                        "edges": [
-                            {
-                                "node": {
-                                    "login": "test_person",
-                                },
-                            },
-                        ],
-                        "pageInfo": {
-                            "hasNextPage": False,
-                            "endCursor": "test_end_cursor",
-                        },
-                    }
+                "repositories": {
+                    "pageInfo": {"endCursor": None, "hasNextPage": False},
+                    "nodes": [
+                        {"name": "repo_1", "isDisabled": False,
+                         "directCollaborators": {"totalCount": 1}, "outsideCollaborators": {"totalCount": 2}},
+                        {"name": "repo_2", "isDisabled": False,
+                         "directCollaborators": {"totalCount": 0}, "outsideCollaborators": {"totalCount": 0}},
+                        {"name": "disabled_repo", "isDisabled": True,
+                         "directCollaborators": {"totalCount": 0}, "outsideCollaborators": {"totalCount": 0}},
+                    ]
+                }
+            }
+        }
+        self.teams_data = {
+            "organization": {
+                "teams": {
+                    "pageInfo": {"endCursor": None, "hasNextPage": False},
+                    "nodes": [
+                        {"slug": "team_1", "members": {"totalCount": 2},
+                         "repositories": {"pageInfo": {"endCursor": "team_1_cursor", "hasNextPage": False},
+                                          "nodes": [{"name": "repo_1"}, {"name": "archived_repo"}]}},
+                        {"slug": "empty_team", "members": {"totalCount": 0},
+                         "repositories": {"pageInfo": {"endCursor": None, "hasNextPage": False},
+                                          "nodes": [{"name": "repo_2"}]}},
+                        {"slug": "all-org-members", "members": {"totalCount": 10},
+                         "repositories": {"pageInfo": {"endCursor": None, "hasNextPage": False},
+                                          "nodes": [{"name": "repo_2"}]}},
+                    ]
                 }
             }
         }
 
-    def test_returns_correct_data(self):
+    def __github_service(self) -> GithubService:
         github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_paginated_list_of_team_user_names = MagicMock(
-            return_value=self.return_data
-        )
-        repos = github_service.get_team_user_names("some-team")
-        self.assertEqual(len(repos), 1)
-        self.assertEqual(repos[0], "test_person")
+        github_service.get_paginated_list_of_repositories_and_collaborator_counts = MagicMock(
+            return_value=self.repositories_data)
+        github_service.get_paginated_list_of_teams_with_repositories_and_member_counts = MagicMock(
+            return_value=self.teams_data)
+        github_service.get_team_repository_names = MagicMock(return_value=["repo_2"])
+        return github_service
 
-    def test_nothing_to_return(self):
+    def test_returns_ownership_for_open_repositories(self):
+        ownership_index = self.__github_service().get_repository_ownership_index(["all-org-members"])
+        self.assertEqual(ownership_index, {
+            "repo_1": {"teams": {"team_1"}, "direct_collaborators": 1, "outside_collaborators": 2},
+            "repo_2": {"teams": set(), "direct_collaborators": 0, "outside_collaborators": 0},
+        })
+
+    def test_counts_all_teams_when_none_ignored(self):
+        ownership_index = self.__github_service().get_repository_ownership_index()
+        self.assertEqual(ownership_index["repo_2"]["teams"], {"all-org-members"})
+
+    def test_fetches_remaining_team_repositories(self):
+        self.teams_data["organization"]["teams"]["nodes"][0]["repositories"]["pageInfo"]["hasNextPage"] = True
+        github_service = self.__github_service()
+        ownership_index = github_service.get_repository_ownership_index(["all-org-members"])
+        github_service.get_team_repository_names.assert_called_once_with("team_1", "team_1_cursor")
+        self.assertEqual(ownership_index["repo_2"]["teams"], {"team_1"})
+
+    def test_paginated_query_throws_value_error_when_page_size_greater_than_limit(self):
         github_service = GithubService("", ORGANISATION_NAME)
-        self.return_data["organization"]["team"]["members"]["edges"] = None
-        github_service.get_paginated_list_of_team_user_names = MagicMock(
-            return_value=self.return_data
-        )
-        repos = github_service.get_team_user_names("some-team")
-        self.assertEqual(len(repos), 0)
+        self.assertRaises(
+            ValueError, github_service.get_paginated_list_of_teams_with_repositories_and_member_counts, None, 101)
+        self.assertRaises(
+            ValueError, github_service.get_paginated_list_of_repositories_and_collaborator_counts, None, 101)
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
@@ -772,60 +859,6 @@ class TestGithubServiceGetPaginatedCircleCIConfigCheck(unittest.TestCase):
         self.assertEqual(result, {})
 
 
-@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
-@patch("gql.Client.__new__", new=MagicMock)
-@patch("github.Github.__new__", new=MagicMock)
-class TestGithubServiceGetOrgRepoNames(unittest.TestCase):
-    def setUp(self):
-        self.return_data = {
-            "organization": {
-                "repositories": {
-                    "edges": [
-                        {
-                            "node": {
-                                "name": "test_repository",
-                                "isDisabled": False,
-                            },
-                        },
-                    ],
-                    "pageInfo": {
-                        "hasNextPage": False,
-                        "endCursor": "test_end_cursor",
-                    },
-                }
-            }
-        }
-
-    def test_returns_correct_data(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.get_paginated_list_of_org_repository_names = MagicMock(
-            return_value=self.return_data
-        )
-        repos = github_service.get_org_repo_names()
-        self.assertEqual(len(repos), 1)
-        self.assertEqual(repos[0], "test_repository")
-
-    def test_returns_invalid_repository_type(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-
-        self.return_data["organization"]["repositories"]["edges"][0]["node"]["isDisabled"] = True
-        github_service.get_paginated_list_of_org_repository_names = MagicMock(
-            return_value=self.return_data
-        )
-        repos = github_service.get_org_repo_names()
-        self.assertEqual(len(repos), 0)
-        self.return_data["organization"]["repositories"]["edges"][0]["node"]["isDisabled"] = False
-
-    def test_nothing_to_return(self):
-        github_service = GithubService("", ORGANISATION_NAME)
-        self.return_data["organization"]["repositories"]["edges"] = None
-        github_service.get_paginated_list_of_org_repository_names = MagicMock(
-            return_value=self.return_data
-        )
-        repos = github_service.get_org_repo_names()
-        self.assertEqual(len(repos), 0)
-
-
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__", new=MagicMock)
@@ -909,17 +942,34 @@ class TestGithubServiceGetStaleOutsideCollaborators(unittest.TestCase):
         self.assertEqual(len(stale_outside_collaborators), 2)
         self.assertEqual(set(stale_outside_collaborators), set(["outside_collab_3", "outside_collab_4"]))
 
-    def test_outside_collaborators_has_next_page_raises_error(self):
+    def test_outside_collaborators_has_next_page_fetches_remaining_collaborators(self):
         github_service = GithubService("", ORGANISATION_NAME)
-        self.return_data["organization"]["repositories"]["nodes"][1]["collaborators"]["pageInfo"]["hasNextPage"] = True
+        self.return_data["organization"]["repositories"]["nodes"][1]["collaborators"]["pageInfo"] = {
+            "hasNextPage": True, "endCursor": "collaborators_end_cursor"}
         github_service.get_paginated_list_of_unlocked_unarchived_repos_and_their_first_100_outside_collaborators = MagicMock(
             return_value=self.return_data
         )
         github_service.get_outside_collaborators_login_names = MagicMock(
-            return_value=self.all_outside_collaborators
+            return_value=self.all_outside_collaborators + ["outside_collab_5"]
         )
-        with self.assertRaises(ValueError):
-            github_service.get_stale_outside_collaborators()
+        github_service.get_paginated_list_of_repository_outside_collaborators_async = AsyncMock(side_effect=[
+            {"repository": {"collaborators": {
+                "pageInfo": {"hasNextPage": True, "endCursor": "next_cursor"},
+                "edges": [{"node": {"login": "Outside_Collab_4"}}]}}},
+            {"repository": {"collaborators": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "edges": [{"node": {"login": "outside_collab_1"}}]}}},
+        ])
+        github_service.github_client_gql_api = MagicMock()
+
+        stale_outside_collaborators = github_service.get_stale_outside_collaborators()
+
+        self.assertEqual(stale_outside_collaborators, ["outside_collab_5"])
+        session = github_service.github_client_gql_api.__aenter__.return_value
+        github_service.get_paginated_list_of_repository_outside_collaborators_async.assert_has_awaits([
+            call(session, "repository_2", "collaborators_end_cursor"),
+            call(session, "repository_2", "next_cursor"),
+        ])
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
@@ -983,6 +1033,48 @@ class TestGithubServiceFetchAllRepositories(unittest.TestCase):
         repos = github_service.fetch_all_repositories_in_org()
         self.assertEqual(len(repos), 0)
 
+    def test_concurrent_mode_returns_same_data_as_sequential_mode(self):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.get_paginated_list_of_repositories_per_type = MagicMock(
+            return_value=self.return_data
+        )
+        github_service.get_paginated_list_of_repositories_per_type_async = AsyncMock(
+            return_value=self.return_data
+        )
+        self.assertEqual(
+            github_service.fetch_all_repositories_in_org(concurrent=True),
+            github_service.fetch_all_repositories_in_org()
+        )
+
+    def test_concurrent_mode_keeps_repository_type_order(self):
+        github_service = GithubService("", ORGANISATION_NAME)
+
+        async def get_page(_session, repo_type, after_cursor):
+            has_next_page = after_cursor is None
+            return {
+                "search": {
+                    "repos": [{"repo": {"name": f"{repo_type}_{after_cursor}", "isLocked": False, "isDisabled": False}}],
+                    "pageInfo": {"hasNextPage": has_next_page, "endCursor": "next"},
+                }
+            }
+
+        github_service.get_paginated_list_of_repositories_per_type_async = get_page
+        repos = github_service.fetch_all_repositories_in_org(concurrent=True)
+        self.assertEqual([repo["name"] for repo in repos], [
+            "public_None", "public_next",
+            "private_None", "private_next",
+            "internal_None", "internal_next",
+        ])
+
+    def test_concurrent_mode_ignores_locked_repo(self):
+        github_service = GithubService("", ORGANISATION_NAME)
+        self.return_data["search"]["repos"][0]["repo"]["isLocked"] = True
+        github_service.get_paginated_list_of_repositories_per_type_async = AsyncMock(
+            return_value=self.return_data
+        )
+        repos = github_service.fetch_all_repositories_in_org(concurrent=True)
+        self.assertEqual(len(repos), 0)
+
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
@@ -1104,6 +1196,46 @@ class TestGithubServiceGetUserOrgEmailAddress(unittest.TestCase):
         self.assertEqual(response, None)
 
 
+@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
+@patch("gql.Client.__new__")
+@patch("github.Github.__new__", new=MagicMock)
+class TestGithubServiceGetUserOrgEmailAddresses(unittest.TestCase):
+    def test_returns_email_map(self, mock_gql_client):
+        mock_gql_client.return_value.__aenter__.return_value.execute = AsyncMock(return_value={
+            "user_0": {"organizationVerifiedDomainEmails": ["user1@test.com"]},
+            "user_1": {"organizationVerifiedDomainEmails": []},
+        })
+        github_service = GithubService("", ORGANISATION_NAME)
+        response = github_service.get_user_org_email_addresses(["user1", "user2"])
+        self.assertEqual(response, {"user1": "user1@test.com", "user2": None})
+
+    def test_packs_users_into_aliased_queries(self, mock_gql_client):
+        mock_execute = AsyncMock(side_effect=lambda _query, variable_values: {
+            key: {"organizationVerifiedDomainEmails": [f"{value}@test.com"]}
+            for key, value in variable_values.items() if key.startswith("user_")
+        })
+        mock_gql_client.return_value.__aenter__.return_value.execute = mock_execute
+        github_service = GithubService("", ORGANISATION_NAME)
+        response = github_service.get_user_org_email_addresses(
+            ["user1", "user2", "user3", "user1"], users_per_query=2)
+        self.assertEqual(mock_execute.await_count, 2)
+        self.assertEqual(response, {
+            "user1": "user1@test.com", "user2": "user2@test.com", "user3": "user3@test.com"})
+
+    def test_returns_none_for_unresolved_users(self, mock_gql_client):
+        mock_gql_client.return_value.__aenter__.return_value.execute = AsyncMock(side_effect=TransportQueryError(
+            "Could not resolve to a User", errors=[{"message": "Could not resolve to a User"}],
+            data={"user_0": None, "user_1": {"organizationVerifiedDomainEmails": ["user2@test.com"]}}))
+        github_service = GithubService("", ORGANISATION_NAME)
+        response = github_service.get_user_org_email_addresses(["user1", "user2"])
+        self.assertEqual(response, {"user1": None, "user2": "user2@test.com"})
+
+    def test_returns_empty_map_when_no_users(self, mock_gql_client):
+        github_service = GithubService("", ORGANISATION_NAME)
+        self.assertEqual(github_service.get_user_org_email_addresses([]), {})
+        mock_gql_client.return_value.__aenter__.assert_not_called()
+
+
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__")
@@ -1285,6 +1417,105 @@ class TestGithubServiceGetAuditLogActiveUsers(unittest.TestCase):
         self.assertEqual(1, len(response))
 
 
+@patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
+@patch("gql.Client.__new__", new=MagicMock)
+@patch("github.Github.__new__", new=MagicMock)
+class TestGithubServiceGetAuditLogLastActiveDates(unittest.TestCase):
+
+    def setUp(self):
+        self.since_date = datetime.now() - timedelta(days=90)
+
+    def __get_github_service(self) -> GithubService:
+        github_service = GithubService(
+            "", ORGANISATION_NAME, enterprise_name=ENTERPRISE_NAME)
+        github_service.github_client_rest_api = MagicMock()
+        return github_service
+
+    def __audit_log_page(self, events: list[tuple[str, datetime]], next_url: str | None = None) -> Mock:
+        return Mock(status_code=200, links={"next": {"url": next_url}} if next_url else {},
+                    content=json.dumps([{"actor": actor, "@timestamp": date.timestamp() * 1000.0}
+                                        for actor, date in events]).encode("utf-8"))
+
+    def test_keeps_latest_event_per_actor_across_pages(self):
+        github_service = self.__get_github_service()
+        latest = datetime.now() - timedelta(days=1)
+        earlier = datetime.now() - timedelta(days=10)
+        github_service.github_client_rest_api.get.side_effect = [
+            self.__audit_log_page(
+                [("User1", latest), ("user2", earlier)], next_url="next_page_url"),
+            self.__audit_log_page([("user1", earlier), ("user2", latest)]),
+        ]
+
+        last_active_dates = github_service.get_audit_log_last_active_dates(
+            self.since_date)
+
+        self.assertEqual(last_active_dates, {"user1": latest, "user2": latest})
+        github_service.github_client_rest_api.get.assert_has_calls([
+            call(f"https://api.github.com/orgs/{ORGANISATION_NAME}/audit-log?phrase=created%3A%3E%3D{self.since_date.date().isoformat()}&per_page=100",
+                 timeout=30),
+            call("next_page_url", timeout=30),
+        ])
+
+    def test_reuses_scan_for_later_dates(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_rest_api.get.side_effect = [
+            self.__audit_log_page(
+                [("user1", datetime.now() - timedelta(days=60))]),
+            self.__audit_log_page([]),
+        ]
+
+        github_service.get_audit_log_last_active_dates(self.since_date)
+        self.assertEqual(github_service.get_audit_log_last_active_dates(
+            datetime.now() - timedelta(days=30)), {})
+        self.assertEqual(
+            1, github_service.github_client_rest_api.get.call_count)
+
+        github_service.get_audit_log_last_active_dates(
+            self.since_date - timedelta(days=1))
+        self.assertEqual(
+            2, github_service.github_client_rest_api.get.call_count)
+
+    def test_scans_enterprise_audit_log(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_rest_api.get.return_value = self.__audit_log_page([
+        ])
+        github_service.get_audit_log_last_active_dates(
+            self.since_date, enterprise=True)
+        self.assertTrue(github_service.github_client_rest_api.get.call_args.args[0].startswith(
+            f"https://api.github.com/enterprises/{ENTERPRISE_NAME}/audit-log?"))
+
+    def test_raises_when_response_is_not_okay(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_rest_api.get.return_value = Mock(
+            status_code=403)
+        self.assertRaises(
+            ValueError, github_service.get_audit_log_last_active_dates, self.since_date)
+
+    def test_get_audit_log_active_users_reads_from_one_scan(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_rest_api.get.return_value = self.__audit_log_page(
+            [("active-user", datetime.now() - timedelta(days=1))])
+
+        active_users = github_service.get_audit_log_active_users(
+            [{"username": "Active-User"}, {"username": "dormant-user"}], use_activity_index=True)
+
+        self.assertEqual(active_users, ["active-user"])
+        self.assertEqual(
+            1, github_service.github_client_rest_api.get.call_count)
+
+    def test_check_dormant_users_audit_activity_since_date_reads_from_one_scan(self):
+        github_service = self.__get_github_service()
+        github_service.github_client_rest_api.get.return_value = self.__audit_log_page(
+            [("active-user", datetime.now() - timedelta(days=1))])
+
+        dormant_users = github_service.check_dormant_users_audit_activity_since_date(
+            ["active-user", "dormant-user"], self.since_date, use_activity_index=True)
+
+        self.assertEqual(dormant_users, ["dormant-user"])
+        self.assertEqual(
+            1, github_service.github_client_rest_api.get.call_count)
+
+
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__")
@@ -1371,9 +1602,38 @@ class TestReportOnInactiveUsers(unittest.TestCase):
 
         self.inactivity_months = 18
 
-    def test_identify_inactive_users_in_a_team(self, _mock_github_client_core_api):
+    def __history_page(self, authors: list[tuple[str, datetime]], has_next_page: bool = False) -> dict:
+        return {
+            "repository": {
+                "defaultBranchRef": {
+                    "target": {
+                        "history": {
+                            "pageInfo": {"hasNextPage": has_next_page, "endCursor": "test_cursor" if has_next_page else None},
+                            "nodes": [
+                                {"author": {"date": date.isoformat() + "Z", "email": f"{login}@example.com",
+                                            "user": {"login": login}}}
+                                for login, date in authors
+                            ],
+                        }
+                    }
+                }
+            }
+        }
 
+    def __get_github_service(self, *history_pages: dict) -> GithubService:
         github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api = MagicMock()
+        github_service.github_client_gql_api.execute.side_effect = list(
+            history_pages)
+        github_service.get_team_id_from_team_name = Mock(
+            return_value=self.team.id)
+        github_service.get_user_org_email_addresses = Mock(return_value={})
+        return github_service
+
+    def test_identify_inactive_users_in_a_team(self, _mock_github_client_core_api):
+
+        github_service = self.__get_github_service(
+            self.__history_page([]), self.__history_page([]))
         github_service._get_repositories_managed_by_team = Mock(
             return_value=self.repositories)
         github_service._get_unignored_users_from_team = Mock(
@@ -1386,11 +1646,12 @@ class TestReportOnInactiveUsers(unittest.TestCase):
         self.assertEqual("user1", inactive_users[0].login)
 
     def test_identify_no_inactive_users_in_a_team(self, _mock_github_client_core_api):
-        self.commit = Mock()
-        self.commit.commit.author.date = datetime.now()
-        self.repository1.get_commits.return_value = [self.commit]
-
-        github_service = GithubService("", ORGANISATION_NAME)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        github_service = self.__get_github_service(
+            self.__history_page([("user1", now)], has_next_page=True),
+            self.__history_page([("user2", now)]),
+            self.__history_page([]),
+        )
         github_service._get_repositories_managed_by_team = Mock(
             return_value=self.repositories)
         github_service._get_unignored_users_from_team = Mock(
@@ -1400,11 +1661,16 @@ class TestReportOnInactiveUsers(unittest.TestCase):
             self.team.id, self.ignored_users, self.ignored_repositories, self.inactivity_months)
 
         self.assertEqual(0, len(inactive_users))
+        self.assertEqual(
+            3, github_service.github_client_gql_api.execute.call_count)
 
     def test_identify_inactive_users(self, _mock_github_client_core_api):
 
         github_service = GithubService("", ORGANISATION_NAME)
 
+        github_service.get_commit_activity_index = Mock(
+            return_value=CommitActivityIndex())
+        github_service.get_user_org_email_addresses = Mock(return_value={})
         github_service._is_user_inactive = Mock(return_value=True)
 
         inactive_users = github_service._identify_inactive_users(
@@ -1413,6 +1679,39 @@ class TestReportOnInactiveUsers(unittest.TestCase):
         self.assertEqual(2, len(inactive_users))
         self.assertEqual("user1", inactive_users[0].login)
 
+    def test_identify_inactive_users_matches_commits_by_org_email(self, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        activity_index = CommitActivityIndex()
+        activity_index.add_commit("repo1", {"date": datetime.now(timezone.utc).isoformat(),
+                                            "email": "User1@Example.com", "user": None})
+        github_service.get_commit_activity_index = Mock(
+            return_value=activity_index)
+        github_service.get_user_org_email_addresses = Mock(
+            return_value={"user1": "user1@example.com", "user2": None})
+
+        inactive_users = github_service._identify_inactive_users(
+            self.users, self.repositories, self.inactivity_months)
+
+        github_service.get_user_org_email_addresses.assert_called_once_with(
+            ["user1", "user2"])
+        self.assertEqual([self.user2], inactive_users)
+
+    def test_identify_inactive_users_matches_by_login_when_email_lookup_fails(self, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        activity_index = CommitActivityIndex()
+        activity_index.add_commit("repo1", {"date": datetime.now(timezone.utc).isoformat(),
+                                            "email": "user1@example.com", "user": {"login": "user2"}})
+        github_service.get_commit_activity_index = Mock(
+            return_value=activity_index)
+        github_service.get_user_org_email_addresses = Mock(
+            side_effect=Exception("test"))
+
+        with self.assertLogs(level="ERROR"):
+            inactive_users = github_service._identify_inactive_users(
+                self.users, self.repositories, self.inactivity_months)
+
+        self.assertEqual([self.user1], inactive_users)
+
     def test_get_users_from_team_found(self, mock_github_client_core_api):
 
         mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
@@ -1435,60 +1734,85 @@ class TestReportOnInactiveUsers(unittest.TestCase):
         self.assertEqual(1, len(result))
 
     def test_user_is_inactive(self, _mock_github_client_core_api):
+        last_commit_date = datetime.now(timezone.utc).replace(
+            tzinfo=None) - timedelta(days=self.inactivity_months * 30 + 1)
+        github_service = self.__get_github_service(
+            self.__history_page([("user1", last_commit_date)]))
 
-        self.commit = Mock()
-        self.commit.commit.author.date = datetime.now(
-        ) - timedelta(days=self.inactivity_months * 30)
-
-        self.repository1.get_commits.return_value = [self.commit]
-
-        github_service = GithubService("", ORGANISATION_NAME)
-
+        activity_index = github_service.get_commit_activity_index(
+            ["repo1"], last_commit_date - timedelta(days=1))
         result = github_service._is_user_inactive(
-            self.user1, self.repositories, self.inactivity_months)
+            self.user1, ["repo1"], activity_index, self.inactivity_months)
 
         self.assertEqual(True, result)
 
     def test_user_is_active(self, _mock_github_client_core_api):
+        github_service = self.__get_github_service(
+            self.__history_page([("USER1", datetime.now(timezone.utc).replace(tzinfo=None))]))
 
-        self.commit = Mock()
-        self.commit.commit.author.date = datetime.now()
-
-        self.repository1.get_commits.return_value = [self.commit]
-
-        github_service = GithubService("", ORGANISATION_NAME)
-
+        activity_index = github_service.get_commit_activity_index(
+            ["repo1"], datetime.now() - timedelta(days=1))
         result = github_service._is_user_inactive(
-            self.user1, self.repositories, self.inactivity_months)
+            self.user1, ["repo1"], activity_index, self.inactivity_months)
 
         self.assertEqual(False, result)
 
-    def test_user_is_inactive_no_commits(self, mock_github_client_core_api):
+    def test_user_is_inactive_when_only_active_in_other_repositories(self, _mock_github_client_core_api):
+        github_service = self.__get_github_service(
+            self.__history_page([("user1", datetime.now(timezone.utc).replace(tzinfo=None))]))
 
-        mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
-            self.user1, self.user2
-        ]
-        mock_team = mock_github_client_core_api.return_value.get_organization().get_team()
-        mock_team.get_members.return_value = [
-            self.user1, self.user2
-        ]
-        mock_github_client_core_api.return_value.get_user.side_effect = [
-            self.user1, self.user2
-        ]
-        mock_github_client_core_api.return_value.get_organization().get_repos.return_value = [
-            self.repository1, self.repository2
-        ]
-        mock_github_client_core_api.return_value.get_organization().Repository.get_commits.side_effect = [
-            GithubException(status=500, data="test", headers={})
-        ]
+        activity_index = github_service.get_commit_activity_index(
+            ["repo1"], datetime.now() - timedelta(days=1))
+        result = github_service._is_user_inactive(
+            self.user1, ["repo2"], activity_index, self.inactivity_months)
+
+        self.assertEqual(True, result)
 
+    def test_user_is_inactive_no_commits(self, _mock_github_client_core_api):
         github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api = MagicMock()
+        github_service.github_client_gql_api.execute.side_effect = [
+            Exception("test")]
 
         with self.assertLogs(level='ERROR') as cm:
-            github_service._is_user_inactive(
-                self.user1, self.repositories, self.inactivity_months)
+            activity_index = github_service.get_commit_activity_index(
+                ["repo1"], datetime.now())
             self.assertEqual(
-                "ERROR:root:An exception occurred while getting commit date for user user1 in repo repo1", cm.output[0])
+                "ERROR:root:An exception occurred while getting commits for repo repo1", cm.output[0])
+        self.assertTrue(github_service._is_user_inactive(
+            self.user1, ["repo1"], activity_index, self.inactivity_months))
+        self.assertFalse(activity_index.covers("repo1", datetime.now()))
+
+    def test_commit_activity_index_is_reused_for_later_cutoff_dates(self, _mock_github_client_core_api):
+        github_service = self.__get_github_service(
+            self.__history_page([]), self.__history_page([]))
+        since = datetime.now()
+
+        github_service.get_commit_activity_index(["repo1"], since)
+        github_service.get_commit_activity_index(
+            ["repo1"], since + timedelta(days=30))
+        self.assertEqual(
+            1, github_service.github_client_gql_api.execute.call_count)
+
+        github_service.get_commit_activity_index(
+            ["repo1"], since - timedelta(days=30))
+        self.assertEqual(
+            2, github_service.github_client_gql_api.execute.call_count)
+        self.assertEqual(github_service.github_client_gql_api.execute.call_args.kwargs["variable_values"]["since"],
+                         (since - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+
+    def test_commit_activity_index_matches_author_email(self, _mock_github_client_core_api):
+        activity_index = CommitActivityIndex()
+        activity_index.add_commit(
+            "repo1", {"date": "2024-01-01T12:00:00+01:00", "email": "User1@Example.com", "user": None})
+
+        self.assertIsNone(activity_index.last_commit_date(["repo1"], "user1"))
+        self.assertEqual(datetime(2024, 1, 1, 11), activity_index.last_commit_date(
+            ["repo1"], "user1", ["user1@example.com"]))
+
+    def test_get_paginated_list_of_default_branch_commit_authors_raises_for_large_page_size(self, _mock_github_client_core_api):
+        self.assertRaises(ValueError, GithubService("", ORGANISATION_NAME).get_paginated_list_of_default_branch_commit_authors,
+                          "repo1", datetime.now(), None, 101)
 
     def test_get_all_repositories_managed_by_team(self, mock_github_client_core_api):
         mock_github_client_core_api.return_value.get_organization().get_team().get_repos.return_value = [
@@ -1554,32 +1878,182 @@ class TestSetStandards(unittest.TestCase):
                                                        required_approving_review_count=1,
                                                        dismiss_stale_reviews=True, )
 
+    @staticmethod
+    def __repository(name: str, has_issues_enabled: bool = True, protected: bool = True) -> dict:
+        return {
+            "name": name,
+            "hasIssuesEnabled": has_issues_enabled,
+            "branchProtectionRules": {"edges": [{"node": {
+                "pattern": "main",
+                "isAdminEnforced": protected,
+                "requiresApprovingReviews": True,
+                "requiredApprovingReviewCount": 1,
+                "dismissesStaleReviews": True,
+            }}]}
+        }
+
+    def test_set_standards_only_writes_non_compliant_settings(self, mock_github_client_core_api: MagicMock):
+        mock_repo = MagicMock(Repository)
+        mock_github_client_core_api.return_value.get_repo.return_value = mock_repo
+
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.set_standards(
+            "test_repository", self.__repository("test_repository", has_issues_enabled=False))
+
+        mock_repo.edit.assert_called_once_with(has_issues=True)
+        mock_repo.get_branch.assert_not_called()
+
+    def test_is_standards_compliant(self, _mock_github_client_core_api: MagicMock):
+        self.assertTrue(GithubService.is_standards_compliant(
+            self.__repository("repo")))
+        self.assertFalse(GithubService.is_standards_compliant(
+            self.__repository("repo", has_issues_enabled=False)))
+        self.assertFalse(GithubService.is_standards_compliant(
+            self.__repository("repo", protected=False)))
+        self.assertFalse(GithubService.is_standards_compliant(
+            {"name": "repo", "hasIssuesEnabled": True, "branchProtectionRules": {"edges": []}}))
+
+    def test_set_standards_on_non_compliant_repositories_skips_compliant_repositories(self, mock_github_client_core_api: MagicMock):
+        mock_repo = MagicMock(Repository)
+        mock_github_client_core_api.return_value.get_repo.return_value = mock_repo
+
+        github_service = GithubService("", ORGANISATION_NAME)
+        remediated = github_service.set_standards_on_non_compliant_repositories([
+            self.__repository("compliant"),
+            self.__repository("unprotected", protected=False),
+        ])
+
+        self.assertEqual(["unprotected"], remediated)
+        mock_github_client_core_api.return_value.get_repo.assert_called_once_with(
+            f"{ORGANISATION_NAME}/unprotected", lazy=True)
+        mock_repo.edit.assert_not_called()
+        mock_repo.get_branch.assert_called_once_with("main")
+
+    def test_set_standards_on_non_compliant_repositories_raises_error_after_remediating_the_others(self, mock_github_client_core_api: MagicMock):
+        mock_repo = MagicMock(Repository)
+        mock_repo.edit.side_effect = [
+            GithubException(404, "Not Found"), None]
+        mock_github_client_core_api.return_value.get_repo.return_value = mock_repo
+
+        github_service = GithubService("", ORGANISATION_NAME)
+        with self.assertRaises(ValueError):
+            github_service.set_standards_on_non_compliant_repositories([
+                self.__repository("repo1", has_issues_enabled=False),
+                self.__repository("repo2", has_issues_enabled=False),
+            ], max_concurrent_writes=1)
+
+        self.assertEqual(2, mock_repo.edit.call_count)
+
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
 @patch("github.Github.__new__")
 class TestGithubServiceUpdateTeamRepositoryPermission(unittest.TestCase):
 
+    def setUp(self):
+        self.journal_directory = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(
+            self.journal_directory.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.journal_directory.cleanup()
+
+    def __get_github_service(self, current_permissions: dict[str, str]) -> GithubService:
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api.execute.return_value = {"organization": {"team": {"repositories": {
+            "edges": [{"permission": permission, "node": {"name": name}} for name, permission in current_permissions.items()],
+            "pageInfo": {"hasNextPage": False, "endCursor": None}
+        }}}}
+        return github_service
+
+    def __read_journal(self) -> list[dict]:
+        with open(self.journal_path, encoding="utf-8") as journal_file:
+            return [json.loads(line) for line in journal_file]
+
+    @staticmethod
+    def __mock_team(mock_organisation: MagicMock, statuses: dict[str, tuple] | None = None) -> MagicMock:
+        """Returns the requester of a team whose PUTs answer with the status given for the repository, or 204."""
+        requester = MagicMock()
+        requester.requestJson.side_effect = lambda _verb, url, input=None: (statuses or {}).get(
+            url.rsplit("/", 1)[1], (204, {}, None))
+        mock_organisation.get_team_by_slug.return_value = Team(requester, {}, {
+            "slug": "dev-team",
+            "organization": {"url": f"https://api.github.com/orgs/{ORGANISATION_NAME}", "login": ORGANISATION_NAME}
+        }, completed=True)
+        return requester
+
+    @staticmethod
+    def __put_repo_names(requester: MagicMock) -> list[str]:
+        return sorted(call_args.args[1].rsplit("/", 1)[1] for call_args in requester.requestJson.call_args_list)
+
     def test_updates_team_repository_permission(self, mock_github_client_core_api):
-        mock_team = MagicMock()
-        mock_repo1 = MagicMock()
-        mock_repo2 = MagicMock()
         mock_org = MagicMock()
-        mock_org.get_team_by_slug.return_value = mock_team
-        mock_org.get_repo.side_effect = [mock_repo1, mock_repo2]
+        requester = self.__mock_team(mock_org)
         mock_github_client_core_api.return_value.get_organization.return_value = mock_org
 
-        repositories = ["repo1", "repo2"]
-        github_service = GithubService("", ORGANISATION_NAME)
-        github_service.update_team_repository_permission(
-            "dev-team", repositories, "write")
+        github_service = self.__get_github_service({})
+        results = github_service.update_team_repository_permission(
+            "dev-team", ["repo1", "repo2"], "write")
 
         mock_github_client_core_api.return_value.get_organization.assert_called_once_with(
             ORGANISATION_NAME)
         mock_org.get_team_by_slug.assert_called_once_with("dev-team")
-        mock_org.get_repo.assert_has_calls([call("repo1"), call("repo2")])
-        mock_team.set_repo_permission.assert_has_calls(
-            [call(mock_repo1, "write"), call(mock_repo2, "write")])
+        self.assertEqual(["repo1", "repo2"], self.__put_repo_names(requester))
+        mock_github_client_core_api.return_value.get_repo.assert_not_called()
+        self.assertEqual({"repo1": "updated", "repo2": "updated"}, results)
+
+    def test_updates_team_repository_permission_with_a_single_put(self, mock_github_client_core_api):
+        requester = self.__mock_team(
+            mock_github_client_core_api.return_value.get_organization.return_value)
+
+        results = self.__get_github_service({}).update_team_repository_permission(
+            "dev-team", ["repo1"], "push")
+
+        self.assertEqual({"repo1": "updated"}, results)
+        mock_github_client_core_api.return_value.get_repo.assert_not_called()
+        self.assertEqual(requester.mock_calls, [call.requestJson(
+            "PUT", f"https://api.github.com/orgs/{ORGANISATION_NAME}/teams/dev-team/repos/{ORGANISATION_NAME}/repo1",
+            input={"permission": "push"})])
+
+    def test_reports_failed_when_the_update_is_not_accepted(self, mock_github_client_core_api):
+        self.__mock_team(mock_github_client_core_api.return_value.get_organization.return_value, {
+            "repo1": (422, {}, '{"message": "Validation Failed"}')})
+
+        with self.assertRaises(ValueError):
+            self.__get_github_service({}).update_team_repository_permission(
+                "dev-team", ["repo1"], "write", journal_path=self.journal_path)
+
+        self.assertEqual([{"team": "dev-team", "repository": "repo1", "permission": "write", "result": "failed"}],
+                         self.__read_journal())
+
+    def test_raises_rate_limit_errors_from_the_update(self, mock_github_client_core_api):
+        self.__mock_team(mock_github_client_core_api.return_value.get_organization.return_value, {
+            "repo1": (403, {}, '{"message": "API rate limit exceeded for user ID 1."}')})
+        mock_github_client_core_api.return_value.get_rate_limit.return_value.core.reset = datetime.now()
+
+        with self.assertRaises(RateLimitExceededException):
+            self.__get_github_service({}).update_team_repository_permission(
+                "dev-team", ["repo1"], "write")
+
+    def test_accepts_repository_objects_with_names(self, mock_github_client_core_api):
+        requester = self.__mock_team(
+            mock_github_client_core_api.return_value.get_organization.return_value)
+
+        results = self.__get_github_service({}).update_team_repository_permission(
+            "dev-team", [{"name": "repo1"}], "write")
+
+        self.assertEqual({"repo1": "updated"}, results)
+        self.assertEqual(["repo1"], self.__put_repo_names(requester))
+
+    def test_does_not_rewrite_permissions_that_are_already_set(self, mock_github_client_core_api):
+        requester = self.__mock_team(
+            mock_github_client_core_api.return_value.get_organization.return_value)
+
+        results = self.__get_github_service({"repo1": "WRITE", "repo2": "READ"}).update_team_repository_permission(
+            "dev-team", ["repo1", "repo2"], "write")
+
+        self.assertEqual({"repo1": "unchanged", "repo2": "updated"}, results)
+        self.assertEqual(["repo2"], self.__put_repo_names(requester))
 
     def test_raises_error_for_nonexistent_team(self, mock_github_client_core_api):
         mock_org = MagicMock()
@@ -1592,18 +2066,65 @@ class TestGithubServiceUpdateTeamRepositoryPermission(unittest.TestCase):
             github_service.update_team_repository_permission(
                 "unknown-team", ["repo1"], "write")
 
-    def test_raises_error_for_nonexistent_repository(self, mock_github_client_core_api):
-        mock_team = MagicMock()
-        mock_org = MagicMock()
-        mock_org.get_team_by_slug.return_value = mock_team
-        mock_org.get_repo.side_effect = UnknownObjectException(
-            404, "Repository not found")
-        mock_github_client_core_api.return_value.get_organization.return_value = mock_org
+    def test_raises_error_for_nonexistent_repository_after_updating_the_others(self, mock_github_client_core_api):
+        requester = self.__mock_team(mock_github_client_core_api.return_value.get_organization.return_value, {
+            "unknown-repo": (404, {}, '{"message": "Not Found"}')})
 
+        github_service = self.__get_github_service({})
+        with self.assertRaises(ValueError) as context:
+            github_service.update_team_repository_permission(
+                "dev-team", ["unknown-repo", "repo1"], "write", journal_path=self.journal_path)
+
+        self.assertIn("unknown-repo", str(context.exception))
+        self.assertEqual(["repo1", "unknown-repo"], self.__put_repo_names(requester))
+        self.assertEqual(
+            {"unknown-repo": "not_found", "repo1": "updated"},
+            {entry["repository"]: entry["result"] for entry in self.__read_journal()})
+
+    def test_journals_results_and_skips_them_when_resumed(self, mock_github_client_core_api):
+        requester = self.__mock_team(
+            mock_github_client_core_api.return_value.get_organization.return_value)
+        github_service = self.__get_github_service({"repo1": "WRITE"})
+
+        github_service.update_team_repository_permission(
+            "dev-team", ["repo1", "repo2"], "write", journal_path=self.journal_path)
+        results = github_service.update_team_repository_permission(
+            "dev-team", ["repo1", "repo2", "repo3"], "write", journal_path=self.journal_path)
+
+        self.assertEqual(
+            {"repo1": "skipped", "repo2": "skipped", "repo3": "updated"}, results)
+        self.assertEqual(["repo2", "repo3"], self.__put_repo_names(requester))
+        self.assertEqual(
+            [{"team": "dev-team", "repository": "repo1", "permission": "write", "result": "unchanged"},
+             {"team": "dev-team", "repository": "repo2",
+                 "permission": "write", "result": "updated"},
+             {"team": "dev-team", "repository": "repo3", "permission": "write", "result": "updated"}],
+            self.__read_journal())
+
+    def test_does_not_skip_journalled_results_for_another_permission(self, mock_github_client_core_api):
+        requester = self.__mock_team(
+            mock_github_client_core_api.return_value.get_organization.return_value)
+        github_service = self.__get_github_service({})
+
+        github_service.update_team_repository_permission(
+            "dev-team", ["repo1"], "write", journal_path=self.journal_path)
+        results = github_service.update_team_repository_permission(
+            "dev-team", ["repo1"], "admin", journal_path=self.journal_path)
+
+        self.assertEqual({"repo1": "updated"}, results)
+        self.assertEqual(["repo1", "repo1"], self.__put_repo_names(requester))
+
+    def test_get_team_repository_permissions_raises_error_for_nonexistent_team(self, _mock_github_client_core_api):
         github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api.execute.return_value = {
+            "organization": {"team": None}}
         with self.assertRaises(ValueError):
-            github_service.update_team_repository_permission(
-                "dev-team", ["unknown-repo"], "write")
+            github_service.get_team_repository_permissions("unknown-team")
+
+    def test_get_paginated_list_of_team_repository_permissions_throws_value_error_when_page_size_greater_than_limit(self, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        self.assertRaises(
+            ValueError, github_service.get_paginated_list_of_team_repository_permissions, "dev-team", None, 101)
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
@@ -1619,8 +2140,8 @@ class TestNewOwnerDetected(unittest.TestCase):
             {'action': 'org.add_member', 'createdAt': '2023-12-06T10:33:07.832Z', 'actorLogin': 'johnsmith',
              'operationType': 'CREATE', 'permission': 'ADMIN', 'userLogin': 'janedoe'}
         ]
-        github_service.audit_log_member_changes = Mock(
-            return_value=mock_audit_log)
+        github_service.iterate_audit_log_entries = Mock(
+            return_value=iter(mock_audit_log))
 
         result = github_service.flag_owner_permission_changes("2023-12-01")
 
@@ -1688,6 +2209,80 @@ class TestNewOwnerDetected(unittest.TestCase):
         self.assertEqual(result[1]['actorLogin'], 'user2')
         self.assertEqual(result[1]['userLogin'], 'new_member2')
 
+    def __audit_log_page(self, created_ats: list[str], end_cursor: str | None = None) -> dict:
+        return {
+            "organization": {
+                "auditLog": {
+                    "edges": [{"node": {"action": "org.add_member", "createdAt": created_at, "actorLogin": "user1",
+                                        "userLogin": f"new_member_{created_at}"}} for created_at in created_ats] + [{"node": {}}],
+                    "pageInfo": {"endCursor": end_cursor, "hasNextPage": end_cursor is not None}
+                }
+            }
+        }
+
+    def test_iterate_audit_log_entries_yields_entries_page_by_page(self, _mock_github_client_gql):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api.execute.side_effect = [
+            self.__audit_log_page(["2023-12-07T10:00:00.000Z"], "cursor_1"),
+            self.__audit_log_page(["2023-12-06T10:00:00.000Z"]),
+        ]
+
+        entries = github_service.iterate_audit_log_entries(
+            ["org.add_member", "org.update_member"], "2023-12-01")
+
+        self.assertEqual(next(entries)["createdAt"], "2023-12-07T10:00:00.000Z")
+        self.assertEqual(
+            github_service.github_client_gql_api.execute.call_count, 1)
+        self.assertEqual([entry["createdAt"] for entry in entries], [
+                         "2023-12-06T10:00:00.000Z"])
+        self.assertEqual(github_service.github_client_gql_api.execute.call_args.kwargs["variable_values"],
+                         {"organisation_name": ORGANISATION_NAME, "cursor": "cursor_1", "page_size": 100,
+                          "audit_log_query": "action:org.add_member action:org.update_member created:>=2023-12-01"})
+
+    def test_iterate_audit_log_entries_reads_only_entries_after_checkpoint(self, _mock_github_client_gql):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api.execute.side_effect = [
+            self.__audit_log_page(["2023-12-07T10:00:00.000Z"]),
+            self.__audit_log_page(
+                ["2023-12-08T09:00:00.000Z", "2023-12-07T10:00:00.000Z"]),
+        ]
+
+        with tempfile.TemporaryDirectory() as checkpoint_directory:
+            checkpoint_path = f"{checkpoint_directory}/audit_log_checkpoint.json"
+            first_run = github_service.check_for_audit_log_new_members(
+                "2023-12-01", checkpoint_path)
+            github_service.commit_audit_log_checkpoints()
+            second_run = github_service.check_for_audit_log_new_members(
+                "2023-12-01", checkpoint_path)
+            github_service.commit_audit_log_checkpoints()
+            with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+                checkpoints = json.load(checkpoint_file)
+
+        self.assertEqual([entry["createdAt"] for entry in first_run], [
+                         "2023-12-07T10:00:00.000Z"])
+        self.assertEqual([entry["createdAt"] for entry in second_run], [
+                         "2023-12-08T09:00:00.000Z"])
+        self.assertEqual(github_service.github_client_gql_api.execute.call_args.kwargs["variable_values"]["audit_log_query"],
+                         "action:org.add_member created:>=2023-12-07T10:00:00")
+        self.assertEqual(checkpoints, {
+                         f"{ORGANISATION_NAME} org.add_member": "2023-12-08T09:00:00.000Z"})
+
+    def test_iterate_audit_log_entries_saves_the_checkpoint_only_when_committed(self, _mock_github_client_gql):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_gql_api.execute.return_value = self.__audit_log_page(
+            ["2023-12-07T10:00:00.000Z"])
+
+        with tempfile.TemporaryDirectory() as checkpoint_directory:
+            checkpoint_path = f"{checkpoint_directory}/audit_log_checkpoint.json"
+            github_service.check_for_audit_log_new_members(
+                "2023-12-01", checkpoint_path)
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+            github_service.commit_audit_log_checkpoints()
+            with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+                self.assertEqual(json.load(checkpoint_file), {
+                                 f"{ORGANISATION_NAME} org.add_member": "2023-12-07T10:00:00.000Z"})
+
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
@@ -1728,14 +2323,57 @@ class TestGHAMinutesQuotaOperations(unittest.TestCase):
             ]
         )
 
-    def test_get_repository_variable(self, _mock_github_client_rest_api, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo().get_variable.return_value = Mock(
-            Variable, name="GHA_MINUTES_QUOTA_THRESHOLD", value="70")
+    def test_get_repository_variable(self, mock_github_client_rest_api, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_rest_api = mock_github_client_rest_api
+        mock_github_client_rest_api.get.return_value = Mock(status_code=200, links={}, json=Mock(return_value={
+            "total_count": 2,
+            "variables": [{"name": "GHA_MINUTES_QUOTA_THRESHOLD", "value": "70"},
+                          {"name": "GHA_MINUTES_QUOTA_TOTAL", "value": "50000"}]
+        }))
 
-        response = GithubService(
-            "", ORGANISATION_NAME)._get_repository_variable(variable_name="GHA_MINUTES_QUOTA_THRESHOLD")
+        self.assertEqual('70', github_service._get_repository_variable(
+            variable_name="GHA_MINUTES_QUOTA_THRESHOLD"))
+        self.assertEqual('50000', github_service._get_repository_variable(
+            variable_name="GHA_MINUTES_QUOTA_TOTAL"))
+
+        mock_github_client_rest_api.get.assert_called_once_with(
+            f"https://api.github.com/repos/{ORGANISATION_NAME}/operations-engineering/actions/variables?per_page=30",
+            headers={'Accept': 'application/vnd.github+json', 'X-GitHub-Api-Version': '2022-11-28'}, timeout=30)
+
+    def test_get_repository_variables_follows_pages(self, mock_github_client_rest_api, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_rest_api = mock_github_client_rest_api
+        mock_github_client_rest_api.get.side_effect = [
+            Mock(status_code=200, links={"next": {"url": "https://api.github.com/next"}}, json=Mock(return_value={
+                "variables": [{"name": "GHA_MINUTES_QUOTA_THRESHOLD", "value": "70"}]})),
+            Mock(status_code=200, links={}, json=Mock(return_value={
+                "variables": [{"name": "GHA_MINUTES_QUOTA_TOTAL", "value": "50000"}]})),
+        ]
+
+        self.assertEqual(github_service.get_repository_variables(), {
+            "GHA_MINUTES_QUOTA_THRESHOLD": "70", "GHA_MINUTES_QUOTA_TOTAL": "50000"})
+        self.assertEqual(mock_github_client_rest_api.get.call_count, 2)
+
+    def test_get_repository_variables_raises_error_when_the_request_fails(self, mock_github_client_rest_api, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_rest_api = mock_github_client_rest_api
+        mock_github_client_rest_api.get.return_value = Mock(status_code=404)
+
+        self.assertRaises(ValueError, github_service.get_repository_variables)
+
+    def test_modify_gha_minutes_quota_threshold_updates_the_repository_variables(self, mock_github_client_rest_api, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.github_client_rest_api = mock_github_client_rest_api
+        mock_github_client_rest_api.get.return_value = Mock(status_code=200, links={}, json=Mock(return_value={
+            "variables": [{"name": "GHA_MINUTES_QUOTA_THRESHOLD", "value": "70"}]}))
+        github_service.get_repository_variables()
+
+        github_service.modify_gha_minutes_quota_threshold(80)
 
-        self.assertEqual('70', response)
+        self.assertEqual('80', github_service._get_repository_variable(
+            "GHA_MINUTES_QUOTA_THRESHOLD"))
+        mock_github_client_rest_api.get.assert_called_once()
 
     @freeze_time("2021-02-01")
     @patch.object(GithubService, "_get_repository_variable")
@@ -1784,6 +2422,18 @@ class TestGHAMinutesQuotaOperations(unittest.TestCase):
         self.assertEqual(
             github_service.calculate_total_minutes_used(["org1", "org2"]), 20)
 
+    @patch.object(GithubService, "get_gha_minutes_used_for_organisation")
+    def test_calculate_total_minutes_used_fetches_every_organisation(self, mock_get_gha_minutes_used_for_organisation, _mock_github_client_rest_api, _mock_github_client_core_api):
+        github_service = GithubService("", ORGANISATION_NAME)
+        minutes_used = {"org1": 10, "org2": 20, "org3": 30}
+        mock_get_gha_minutes_used_for_organisation.side_effect = lambda organisation: {
+            "total_minutes_used": minutes_used[organisation]}
+
+        self.assertEqual(github_service.calculate_total_minutes_used(
+            ["org1", "org2", "org3"], max_concurrent_reads=2), 60)
+        mock_get_gha_minutes_used_for_organisation.assert_has_calls(
+            [call("org1"), call("org2"), call("org3")], any_order=True)
+
     @patch.object(GithubService, "_get_repository_variable")
     @patch.object(GithubService, "reset_alerting_threshold_if_first_day_of_month")
     @patch.object(GithubService, "calculate_total_minutes_used")
@@ -1867,16 +2517,58 @@ class TestGithubServicePATRetrieval(unittest.TestCase):
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
 @patch("gql.Client.__new__", new=MagicMock)
-@patch("github.Github.__new__")
+@patch("github.Github.__new__", new=MagicMock)
 class TestGithubServiceGetAllEnterpriseMembers(unittest.TestCase):
 
-    def test_get_all_enterprise_members(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_organization().get_members.return_value = [
-            Mock(NamedUser),
-            Mock(NamedUser),
-        ]
-        response = GithubService("", ORGANISATION_NAME).get_all_enterprise_members()
-        self.assertEqual(2, len(response))
+    def __get_github_service(self, pages_per_organisation: dict[str, list[dict]]) -> GithubService:
+        github_service = GithubService("", ORGANISATION_NAME)
+        github_service.organisations_in_enterprise = list(
+            pages_per_organisation)
+        github_service.get_paginated_list_of_organisation_member_logins_async = AsyncMock(
+            side_effect=lambda _session, organisation, after_cursor: pages_per_organisation[organisation][int(after_cursor or 0)])
+        return github_service
+
+    @staticmethod
+    def __members_page(logins: list[str], end_cursor: str | None = None) -> dict:
+        return {"organization": {"membersWithRole": {
+            "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+            "nodes": [{"login": login} for login in logins]
+        }}}
+
+    def test_get_all_enterprise_members(self):
+        github_service = self.__get_github_service({
+            "org-1": [self.__members_page(["user-1", "user-2"], "1"), self.__members_page(["user-3"])],
+            "org-2": [self.__members_page(["user-2", "user-4"])],
+        })
+        response = github_service.get_all_enterprise_members()
+        self.assertEqual(["user-1", "user-2", "user-3", "user-4"], response)
+
+    def test_get_enterprise_member_organisations(self):
+        github_service = self.__get_github_service({
+            "org-1": [self.__members_page(["user-1", "user-2"])],
+            "org-2": [self.__members_page(["user-2"])],
+        })
+        response = github_service.get_enterprise_member_organisations()
+        self.assertEqual(
+            {"user-1": ["org-1"], "user-2": ["org-1", "org-2"]}, response)
+
+    def test_follows_member_pages(self):
+        github_service = self.__get_github_service({
+            "org-1": [self.__members_page(["user-1"], "1"), self.__members_page(["user-2"])],
+        })
+        github_service.get_all_enterprise_members()
+        self.assertEqual(
+            ["org-1", "org-1"],
+            [call.args[1] for call in github_service.get_paginated_list_of_organisation_member_logins_async.call_args_list])
+        self.assertEqual(
+            "1", github_service.get_paginated_list_of_organisation_member_logins_async.call_args_list[1].args[2])
+
+    def test_returns_empty_list_when_organisations_have_no_members(self):
+        github_service = self.__get_github_service({
+            "org-1": [{"organization": {"membersWithRole": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": None}}}],
+        })
+        self.assertEqual([], github_service.get_all_enterprise_members())
 
 
 @patch("gql.transport.aiohttp.AIOHTTPTransport.__new__", new=MagicMock)
@@ -1885,22 +2577,31 @@ class TestGithubServiceGetAllEnterpriseMembers(unittest.TestCase):
 class TestGetOldPOCRepositories(unittest.TestCase):
 
     @freeze_time("2024-10-24")
-    def test_calculate_repo_age(self, mock_github_client_core_api):
-        mock_github_client_core_api.return_value.get_repo().created_at = datetime.fromisoformat("2024-10-04 00:00:00+00:00")
+    @patch.object(GithubService, "get_paginated_list_of_repositories_per_topic")
+    def test_get_old_poc_repositories_if_exist(self, mock_get_paginated_list_of_repositories_per_topic, mock_github_client_core_api):
+        mock_get_paginated_list_of_repositories_per_topic.return_value = {'search': {'repos': [{'repo': {'name': 'operations-engineering-metadata-poc', 'createdAt': '2024-09-24T00:00:00Z', 'isDisabled': False, 'isLocked': False, 'hasIssuesEnabled': True, 'repositoryTopics': {'edges': [{'node': {'topic': {'name': 'operations-engineering'}}}, {'node': {'topic': {'name': 'poc'}}}]}, 'collaborators': {'totalCount': 0}}}, {'repo': {'name': 'operations-engineering-unit-test-generator-poc', 'createdAt': '2024-09-24T00:00:00Z', 'isDisabled': False, 'isLocked': False, 'hasIssuesEnabled': True, 'repositoryTopics': {'edges': [{'node': {'topic': {'name': 'operations-engineering'}}}, {'node': {'topic': {'name': 'poc'}}}]}, 'collaborators': {'totalCount': 0}}},], 'pageInfo': {'hasNextPage': False, 'endCursor': 'Y3Vyc29yOjQ='}}}
 
-        response = GithubService("", ORGANISATION_NAME).calculate_repo_age("repo1")
+        response = GithubService("", ORGANISATION_NAME).get_old_poc_repositories()
 
-        self.assertEqual(20, response)
+        self.assertEqual({"operations-engineering-metadata-poc": 30, "operations-engineering-unit-test-generator-poc": 30}, response)
+        mock_github_client_core_api.return_value.get_repo.assert_not_called()
 
-    @patch.object(GithubService, "calculate_repo_age")
+    @freeze_time("2024-10-24")
     @patch.object(GithubService, "get_paginated_list_of_repositories_per_topic")
-    def test_get_old_poc_repositories_if_exist(self, mock_get_paginated_list_of_repositories_per_topic, mock_calculate_repo_age, _mock_github_client_core_api):
-        mock_get_paginated_list_of_repositories_per_topic.return_value = {'search': {'repos': [{'repo': {'name': 'operations-engineering-metadata-poc', 'isDisabled': False, 'isLocked': False, 'hasIssuesEnabled': True, 'repositoryTopics': {'edges': [{'node': {'topic': {'name': 'operations-engineering'}}}, {'node': {'topic': {'name': 'poc'}}}]}, 'collaborators': {'totalCount': 0}}}, {'repo': {'name': 'operations-engineering-unit-test-generator-poc', 'isDisabled': False, 'isLocked': False, 'hasIssuesEnabled': True, 'repositoryTopics': {'edges': [{'node': {'topic': {'name': 'operations-engineering'}}}, {'node': {'topic': {'name': 'poc'}}}]}, 'collaborators': {'totalCount': 0}}},], 'pageInfo': {'hasNextPage': False, 'endCursor': 'Y3Vyc29yOjQ='}}}
-        mock_calculate_repo_age.return_value = 30
+    def test_get_old_poc_repositories_pages_through_all_results(self, mock_get_paginated_list_of_repositories_per_topic, _mock_github_client_core_api):
+        mock_get_paginated_list_of_repositories_per_topic.side_effect = [
+            {'search': {'repos': [{'repo': {'name': 'old-poc-1', 'createdAt': '2024-01-01T00:00:00Z'}}, {'repo': {'name': 'new-poc', 'createdAt': '2024-10-20T00:00:00Z'}}],
+                        'pageInfo': {'hasNextPage': True, 'endCursor': 'cursor_1'}}},
+            {'search': {'repos': [{'repo': {'name': 'old-poc-2', 'createdAt': '2024-09-01T00:00:00Z'}}],
+                        'pageInfo': {'hasNextPage': False, 'endCursor': 'cursor_2'}}},
+        ]
 
         response = GithubService("", ORGANISATION_NAME).get_old_poc_repositories()
 
-        self.assertEqual({"operations-engineering-metadata-poc": 30, "operations-engineering-unit-test-generator-poc": 30}, response)
+        self.assertEqual({"old-poc-1": 297, "old-poc-2": 53}, response)
+        mock_get_paginated_list_of_repositories_per_topic.assert_has_calls([
+            call("poc", None, 100, GithubService.REPOSITORY_AGE_FIELDS),
+            call("poc", "cursor_1", 100, GithubService.REPOSITORY_AGE_FIELDS)])
 
     @patch.object(GithubService, "get_paginated_list_of_repositories_per_topic")
     def test_get_old_poc_repositories_if_not_exist(self, mock_get_paginated_list_of_repositories_per_topic, _mock_github_client_core_api):
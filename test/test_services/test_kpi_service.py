@@ -7,7 +7,7 @@ TEST_API_KEY = "test_api_key"
 TEST_BASE_URL = "test_base_url"
 
 
-@patch("services.kpi_service.requests")
+@patch("services.kpi_service.http_transport")
 class TestKPIServiceTrackNumberOfRepositoriesWithStandardsLabel(unittest.TestCase):
     def test_api_called(self, mock_requests: MagicMock):
         KpiService(
@@ -29,7 +29,7 @@ class TestKPIServiceTrackNumberOfRepositoriesWithStandardsLabel(unittest.TestCas
         )
 
 
-@patch("services.kpi_service.requests")
+@patch("services.kpi_service.http_transport")
 class TestKPIServiceTrackSentryTransactionsUsedForDay(unittest.TestCase):
     def test_api_called(self, mock_requests: MagicMock):
         KpiService(TEST_BASE_URL, TEST_API_KEY).track_sentry_transactions_used_for_day(
@@ -54,7 +54,7 @@ class TestKPIServiceTrackSentryTransactionsUsedForDay(unittest.TestCase):
         )
 
 
-@patch("services.kpi_service.requests")
+@patch("services.kpi_service.http_transport")
 class TestKPIServiceTrackSentryErrorsUsedForDay(unittest.TestCase):
     def test_api_called(self, mock_requests: MagicMock):
         KpiService(TEST_BASE_URL, TEST_API_KEY).track_sentry_errors_used_for_day(1)
@@ -77,7 +77,7 @@ class TestKPIServiceTrackSentryErrorsUsedForDay(unittest.TestCase):
         )
 
 
-@patch("services.kpi_service.requests")
+@patch("services.kpi_service.http_transport")
 class TestKPIServiceTrackSentryReplaysUsedForDay(unittest.TestCase):
     def test_api_called(self, mock_requests: MagicMock):
         KpiService(TEST_BASE_URL, TEST_API_KEY).track_sentry_replays_used_for_day(1)
@@ -100,7 +100,7 @@ class TestKPIServiceTrackSentryReplaysUsedForDay(unittest.TestCase):
         )
 
 
-@patch("services.kpi_service.requests")
+@patch("services.kpi_service.http_transport")
 class TestKPIServiceTrackEnterpriceGithubActionQuotaUsage(unittest.TestCase):
     def test_api_called(self, mock_requests: MagicMock):
         KpiService(TEST_BASE_URL, TEST_API_KEY).track_enterprise_github_actions_quota_usage(1)
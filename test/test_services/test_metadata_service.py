@@ -31,7 +31,7 @@ class TestMetaDataService(unittest.TestCase):
         self.assertEqual(result, expected_combined)
 
 
-@patch('requests.post')
+@patch('clients.http_transport.post')
 class TestMetadataService(unittest.TestCase):
 
     def setUp(self):
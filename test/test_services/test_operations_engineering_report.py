@@ -1,13 +1,13 @@
 import unittest
 from unittest import mock
 
-from services.operations_engineering_reports import \
-    OperationsEngineeringReportsService
+from services.operations_engineering_reports import (
+    POST_RETRY, OperationsEngineeringReportsService)
 
 
 class TestOperationsEngineeringReportsService(unittest.TestCase):
 
-    @mock.patch('services.operations_engineering_reports.requests.Session')
+    @mock.patch('services.operations_engineering_reports.http_transport.get_session')
     def test_override_repository_standards_reports_success(self, mock_session):
         # Mock the response object and its status_code attribute
         mock_response = mock.Mock()
@@ -30,8 +30,9 @@ class TestOperationsEngineeringReportsService(unittest.TestCase):
         service.override_repository_standards_reports(test_data)
 
         # Assertions
-        # Ensure that the Session object is created once
-        mock_session.assert_called_once()
+        # Ensure that the pooled session for the API is used once
+        mock_session.assert_called_once_with(
+            'https://example.com/reports', max_retries=POST_RETRY)
         mock_session.return_value.post.assert_called_once_with(
             'https://example.com/reports',
             headers={
@@ -40,11 +41,10 @@ class TestOperationsEngineeringReportsService(unittest.TestCase):
                 "User-Agent": "reports-service-layer",
             },
             json=test_data,
-            timeout=180,
-            stream=True
+            timeout=180
         )
 
-    @mock.patch('services.operations_engineering_reports.requests.Session')
+    @mock.patch('services.operations_engineering_reports.http_transport.get_session')
     def test_override_repository_standards_reports_failure(self, mock_session):
         # Mock the response object and its status_code attribute
         mock_response = mock.Mock()
@@ -68,7 +68,7 @@ class TestOperationsEngineeringReportsService(unittest.TestCase):
             service.override_repository_standards_reports(test_data)
 
         # Assertions
-        # Ensure that the Session object is created once
+        # Ensure that the pooled session for the API is used once
         mock_session.assert_called_once()
         mock_session.return_value.post.assert_called_once()
 